@@ -0,0 +1,495 @@
+#!/usr/bin/env python3
+"""
+Resident analysis server for rename-files.py and analyze-project.py.
+
+Keeps both modules loaded (compiled regexes, abbreviation trie, analysis
+memo, history, gitignore templates) and answers JSON-RPC 2.0 requests over
+a Unix domain socket, one JSON object per line. The client falls back to
+running the call in-process when no server is listening.
+
+Usage:
+    python3 analysis-server.py serve                  # Run the server (foreground)
+    python3 analysis-server.py stop                   # Ask a running server to exit
+    python3 analysis-server.py call analyze_file '{"path": "~/Downloads/a b.pdf"}'
+    python3 analysis-server.py call list_suggestions '{"directory": "~/Downloads", "new_only": true}'
+    python3 analysis-server.py call analyze_project '{"project_dir": "."}'
+    python3 analysis-server.py benchmark [directory]  # Cold CLI vs warm server latency
+
+Methods: analyze_file, list_suggestions, analyze_project, ping, shutdown.
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+import time
+from pathlib import Path
+
+# Server, fallback and benchmark modules (importlib, inspect, selectors,
+# statistics, subprocess) are imported where used so the client stays light
+
+
+SCRIPT_DIR = Path(__file__).parent
+RENAME_FILES_SCRIPT = SCRIPT_DIR / "rename-files.py"
+ANALYZE_PROJECT_SCRIPT = SCRIPT_DIR.parent.parent / "gitignore" / "scripts" / "analyze-project.py"
+
+# Default socket; override with --socket
+SOCKET_PATH = Path.home() / ".claude" / "analysis-server.sock"
+
+# Server exits after this long without a request
+IDLE_TIMEOUT_SECONDS = 1800
+
+# Client gives up on a connected server after this long
+CLIENT_TIMEOUT_SECONDS = 300
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SERVER_ERROR = -32000
+
+
+class RPCError(Exception):
+	"""An error returned by the server, or raised by a method."""
+
+	def __init__(self, code: int, message: str):
+		super().__init__(message)
+		self.code = code
+
+
+def _load_module(name: str, path: Path):
+	"""Import a hyphenated script as a module (registered so --jobs workers can unpickle it)."""
+	import importlib.util
+
+	spec = importlib.util.spec_from_file_location(name, path)
+	module = importlib.util.module_from_spec(spec)
+	sys.modules[name] = module
+	spec.loader.exec_module(module)
+	return module
+
+
+def _stat_key(*paths: Path) -> tuple:
+	"""(mtime_ns, size) of each path, or None if missing."""
+	key = []
+	for path in paths:
+		try:
+			st = os.stat(path)
+			key.append((st.st_mtime_ns, st.st_size))
+		except OSError:
+			key.append(None)
+	return tuple(key)
+
+
+class Analyzer:
+	"""
+	The loaded modules plus warm state, revalidated by stat on each call.
+
+	History is reloaded only when the history file or journal changes, the
+	abbreviation dictionary (and with it the analysis memo) only when the
+	user dictionary changes. analyze-project.py revalidates its template bundle itself.
+	"""
+
+	def __init__(self):
+		self._rename_files = None
+		self._analyze_project = None
+		self._history_key = None
+		self._history = None
+		self._index = None
+		self._abbreviations_key = None
+
+	@property
+	def rename_files(self):
+		if self._rename_files is None:
+			rf = _load_module("rename_files", RENAME_FILES_SCRIPT)
+			self._abbreviations_key = _stat_key(rf.USER_ABBREVIATIONS_FILE)
+			self._load_history_uncached = rf.load_history
+			self._history_index_uncached = rf.history_index
+			rf.load_history = self._load_history
+			rf.history_index = self._history_index
+			self._rename_files = rf
+		return self._rename_files
+
+	@property
+	def analyze_project_module(self):
+		if self._analyze_project is None:
+			self._analyze_project = _load_module("analyze_project", ANALYZE_PROJECT_SCRIPT)
+		return self._analyze_project
+
+	def _load_history(self) -> dict:
+		rf = self._rename_files
+		key = _stat_key(rf.HISTORY_FILE, rf.HISTORY_JOURNAL)
+		if key != self._history_key:
+			self._history = self._load_history_uncached()
+			self._index = None
+			self._history_key = key
+		return self._history
+
+	def _history_index(self, history: dict) -> set:
+		if history is not self._history:
+			return self._history_index_uncached(history)
+		if self._index is None:
+			self._index = self._history_index_uncached(history)
+		return self._index
+
+	def _refresh_abbreviations(self) -> None:
+		rf = self.rename_files
+		key = _stat_key(rf.USER_ABBREVIATIONS_FILE)
+		if key != self._abbreviations_key:
+			rf.ABBREVIATIONS, rf.ABBREVIATION_TRIE = rf.load_abbreviations()
+			rf.ANALYSIS_CACHE.clear()
+			self._abbreviations_key = key
+
+	def analyze_file(self, path: str, content_date=None):
+		self._refresh_abbreviations()
+		return self.rename_files.analyze_file(Path(path).expanduser(), content_date)
+
+	def list_suggestions(self, directory: str, recursive=False, new_only=False, jobs=1, use_dir_cache=True, duplicates=False):
+		self._refresh_abbreviations()
+		directory = Path(directory).expanduser()
+		if not directory.is_dir():
+			raise RPCError(INVALID_PARAMS, f"Not a directory: {directory}")
+		return self.rename_files.list_suggestions(directory, recursive, new_only, jobs, use_dir_cache, duplicates)
+
+	def analyze_project(self, project_dir: str):
+		project_dir = Path(project_dir).expanduser().resolve()
+		if not project_dir.is_dir():
+			raise RPCError(INVALID_PARAMS, f"Not a directory: {project_dir}")
+		return self.analyze_project_module.analyze_project(project_dir)
+
+	def ping(self):
+		return {"pid": os.getpid()}
+
+
+METHODS = {"analyze_file", "list_suggestions", "analyze_project", "ping"}
+
+
+def dispatch(analyzer: Analyzer, method: str, params) -> object:
+	"""Run one method with named (object) or positional (array) params."""
+	import inspect
+
+	if method not in METHODS:
+		raise RPCError(METHOD_NOT_FOUND, f"Unknown method: {method}")
+	fn = getattr(analyzer, method)
+	args, kwargs = ([], params) if isinstance(params, dict) else (params or [], {})
+	try:
+		inspect.signature(fn).bind(*args, **kwargs)
+	except TypeError as e:
+		raise RPCError(INVALID_PARAMS, str(e))
+	return fn(*args, **kwargs)
+
+
+def _response(request_id, result=None, error: RPCError = None) -> bytes:
+	message = {"jsonrpc": "2.0", "id": request_id}
+	if error is not None:
+		message["error"] = {"code": error.code, "message": str(error)}
+	else:
+		message["result"] = result
+	return json.dumps(message).encode() + b"\n"
+
+
+def handle_line(analyzer: Analyzer, line: bytes) -> tuple[bytes, bool]:
+	"""Answer one request line; returns (response, shutdown requested)."""
+	try:
+		request = json.loads(line)
+	except ValueError as e:
+		return _response(None, error=RPCError(PARSE_ERROR, f"Parse error: {e}")), False
+	if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+		return _response(None, error=RPCError(INVALID_REQUEST, "Invalid request")), False
+
+	request_id = request.get("id")
+	if request["method"] == "shutdown":
+		return _response(request_id, {"status": "stopping"}), True
+	try:
+		result = dispatch(analyzer, request["method"], request.get("params"))
+	except RPCError as e:
+		return _response(request_id, error=e), False
+	except Exception as e:
+		return _response(request_id, error=RPCError(SERVER_ERROR, f"{type(e).__name__}: {e}")), False
+	return _response(request_id, result), False
+
+
+def serve(socket_path: Path, idle_timeout: float = IDLE_TIMEOUT_SECONDS) -> None:
+	"""
+	Serve requests until shutdown or idle_timeout seconds without a request.
+
+	Connections are multiplexed on one thread with selectors, so an idle
+	client never blocks another, while requests still run one at a time
+	(the analysis modules keep global state). Each connection may send
+	any number of request lines.
+	"""
+	import selectors
+
+	socket_path.parent.mkdir(parents=True, exist_ok=True)
+	if socket_path.exists():
+		running = _connect(socket_path)
+		if running is not None:
+			running.close()
+			print(json.dumps({"error": f"Server already running on {socket_path}"}))
+			sys.exit(1)
+		# Stale socket from a server that died
+		socket_path.unlink()
+
+	analyzer = Analyzer()
+	# Load both modules up front so the first request is warm
+	analyzer.rename_files
+	analyzer.analyze_project_module
+
+	listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+	old_umask = os.umask(0o177)
+	try:
+		listener.bind(str(socket_path))
+	finally:
+		os.umask(old_umask)
+	listener.listen(16)
+	listener.setblocking(False)
+	print(json.dumps({"status": "listening", "socket": str(socket_path), "pid": os.getpid()}), flush=True)
+
+	selector = selectors.DefaultSelector()
+	selector.register(listener, selectors.EVENT_READ)
+	buffers = {}
+
+	def close(conn):
+		selector.unregister(conn)
+		buffers.pop(conn, None)
+		conn.close()
+
+	try:
+		stop = False
+		while not stop:
+			events = selector.select(idle_timeout)
+			if not events:
+				break
+			for key, _ in events:
+				if key.fileobj is listener:
+					try:
+						conn, _ = listener.accept()
+					except BlockingIOError:
+						continue
+					conn.setblocking(False)
+					selector.register(conn, selectors.EVENT_READ)
+					buffers[conn] = b""
+					continue
+
+				conn = key.fileobj
+				try:
+					data = conn.recv(65536)
+				except BlockingIOError:
+					continue
+				except OSError:
+					data = b""
+				if not data:
+					close(conn)
+					continue
+
+				lines = (buffers[conn] + data).split(b"\n")
+				buffers[conn] = lines.pop()
+				for line in lines:
+					if not line.strip():
+						continue
+					response, stop = handle_line(analyzer, line)
+					try:
+						conn.setblocking(True)
+						conn.sendall(response)
+						conn.setblocking(False)
+					except OSError:
+						close(conn)
+						break
+					if stop:
+						break
+				if stop:
+					break
+	finally:
+		for conn in list(buffers):
+			close(conn)
+		selector.close()
+		listener.close()
+		try:
+			socket_path.unlink()
+		except OSError:
+			pass
+
+
+def _connect(socket_path: Path):
+	"""Connect to the server, or return None if none is listening."""
+	sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+	try:
+		sock.connect(str(socket_path))
+	except OSError:
+		sock.close()
+		return None
+	sock.settimeout(CLIENT_TIMEOUT_SECONDS)
+	return sock
+
+
+class Client:
+	"""Thin JSON-RPC client; runs calls in-process when no server is listening."""
+
+	def __init__(self, socket_path: Path = SOCKET_PATH):
+		self.socket_path = socket_path
+		self.sock = _connect(socket_path)
+		self.reader = self.sock.makefile("rb") if self.sock is not None else None
+		self.local = None
+		self.next_id = 0
+
+	@property
+	def connected(self) -> bool:
+		return self.sock is not None
+
+	def call(self, method: str, params=None):
+		"""Call method and return its result, raising RPCError on failure."""
+		if self.sock is None:
+			if self.local is None:
+				self.local = Analyzer()
+			return dispatch(self.local, method, params)
+
+		self.next_id += 1
+		request = {"jsonrpc": "2.0", "id": self.next_id, "method": method, "params": params or {}}
+		self.sock.sendall(json.dumps(request).encode() + b"\n")
+		line = self.reader.readline()
+		if not line:
+			raise RPCError(SERVER_ERROR, "Server closed the connection")
+		response = json.loads(line)
+		if "error" in response:
+			raise RPCError(response["error"]["code"], response["error"]["message"])
+		return response["result"]
+
+	def close(self) -> None:
+		if self.sock is not None:
+			self.reader.close()
+			self.sock.close()
+
+
+def _median_ms(samples: list[float]) -> float:
+	import statistics
+
+	return round(statistics.median(samples) * 1000, 3)
+
+
+def _time_command(command: list[str], rounds: int) -> float:
+	import subprocess
+
+	samples = []
+	for _ in range(rounds):
+		start = time.perf_counter()
+		subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+		samples.append(time.perf_counter() - start)
+	return _median_ms(samples)
+
+
+def benchmark(directory: Path, project_dir: Path, rounds: int) -> dict:
+	"""
+	Median latency (ms) per call: the client as a process with no server
+	(cold, in-process fallback), the client as a process against a warm
+	server, and an RPC round trip on an open connection.
+	"""
+	import subprocess
+
+	socket_path = Path(f"/tmp/analysis-server-bench-{os.getpid()}.sock")
+	server = subprocess.Popen(
+		[sys.executable, __file__, "--socket", str(socket_path), "serve"],
+		stdout=subprocess.PIPE,
+		stderr=subprocess.DEVNULL,
+	)
+	try:
+		server.stdout.readline()
+		sample = next((p for p in sorted(directory.iterdir()) if p.is_file()), directory / "example file 2024.pdf")
+		calls = {
+			"analyze_file": {"path": str(sample)},
+			"list_suggestions": {"directory": str(directory), "new_only": True},
+			"analyze_project": {"project_dir": str(project_dir)},
+		}
+
+		report = {"rounds": rounds, "directory": str(directory), "projectDir": str(project_dir), "methods": {}}
+		client = Client(socket_path)
+		try:
+			for method, params in calls.items():
+				command = [sys.executable, __file__, "--socket", "{}", "call", method, json.dumps(params)]
+				cold = command[:3] + [f"{socket_path}.none"] + command[4:]
+				warm = command[:3] + [str(socket_path)] + command[4:]
+
+				client.call(method, params)
+				samples = []
+				for _ in range(rounds):
+					start = time.perf_counter()
+					client.call(method, params)
+					samples.append(time.perf_counter() - start)
+
+				report["methods"][method] = {
+					"coldMs": _time_command(cold, rounds),
+					"warmClientMs": _time_command(warm, rounds),
+					"warmRpcMs": _median_ms(samples),
+				}
+			client.call("shutdown")
+		finally:
+			client.close()
+	finally:
+		try:
+			server.wait(timeout=10)
+		except subprocess.TimeoutExpired:
+			server.kill()
+	return report
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Resident analysis server for the cleanup and gitignore skills")
+	parser.add_argument("--socket", type=Path, default=SOCKET_PATH, help="Unix socket path")
+	commands = parser.add_subparsers(dest="command", required=True)
+
+	serve_parser = commands.add_parser("serve", help="Run the server in the foreground")
+	serve_parser.add_argument("--idle", type=float, default=IDLE_TIMEOUT_SECONDS, metavar="SECONDS", help="Exit after SECONDS without a connection")
+
+	commands.add_parser("stop", help="Stop a running server")
+
+	call_parser = commands.add_parser("call", help="Call a method (in-process if no server is running)")
+	call_parser.add_argument("method")
+	call_parser.add_argument("params", nargs="?", default="{}", help="JSON object or array of parameters")
+
+	bench_parser = commands.add_parser("benchmark", help="Compare cold CLI and warm server latency")
+	bench_parser.add_argument("directory", nargs="?", default="~/Downloads", help="Directory for the rename-files calls")
+	bench_parser.add_argument("--project", default=".", help="Project for analyze_project")
+	bench_parser.add_argument("--rounds", type=int, default=10, help="Calls per measurement")
+
+	args = parser.parse_args()
+
+	if args.command == "serve":
+		serve(args.socket, args.idle)
+		return
+
+	if args.command == "stop":
+		client = Client(args.socket)
+		if not client.connected:
+			print(json.dumps({"status": "not running"}))
+			return
+		print(json.dumps(client.call("shutdown")))
+		client.close()
+		return
+
+	if args.command == "benchmark":
+		directory = Path(args.directory).expanduser()
+		if not directory.is_dir():
+			print(json.dumps({"error": f"Not a directory: {directory}"}))
+			sys.exit(1)
+		print(json.dumps(benchmark(directory, Path(args.project).resolve(), args.rounds), indent=2))
+		return
+
+	try:
+		params = json.loads(args.params)
+	except ValueError as e:
+		print(json.dumps({"error": f"Invalid params: {e}"}))
+		sys.exit(1)
+
+	client = Client(args.socket)
+	try:
+		result = client.call(args.method, params)
+	except RPCError as e:
+		print(json.dumps({"error": str(e), "code": e.code}))
+		sys.exit(1)
+	finally:
+		client.close()
+	print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+Benchmark rename-files.py on a reproducible synthetic filename corpus.
+
+Usage:
+    python3 benchmark.py                          # 10k corpus, functions + end-to-end
+    python3 benchmark.py --scale 100k --jobs 4    # Larger corpus, parallel end-to-end
+    python3 benchmark.py --scale 1m --no-e2e      # Functions only (no files created)
+    python3 benchmark.py --corpus --scale 10k     # Print the corpus, one name per line
+    python3 benchmark.py --snapshot-check         # Compare suggestions to the snapshot
+    python3 benchmark.py --snapshot-update        # Rewrite the snapshot
+    python3 benchmark.py --history 1m             # History memory: dict-of-dicts vs HistoryTable
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+
+SCRIPT_DIR = Path(__file__).parent
+SNAPSHOT_FILE = SCRIPT_DIR / "snapshots" / "suggestions.json"
+
+# Corpus sizes accepted by --scale
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+# Names locked by the correctness snapshot
+SNAPSHOT_SIZE = 1000
+SNAPSHOT_SEED = 0
+
+# Files per directory when materializing a corpus for end-to-end runs
+FILES_PER_DIR = 1000
+
+FIRST_NAMES = ["john", "maria", "wei", "fatima", "lucas", "anna", "omar", "yuki", "peter", "chloe"]
+LAST_NAMES = ["smith", "garcia", "chen", "khan", "silva", "novak", "haddad", "tanaka", "muller", "martin"]
+TOPICS = [
+	"report", "invoice", "meeting notes", "resume", "budget", "strategy", "roadmap",
+	"statement", "receipt", "contract", "outlook", "summary", "tax return", "slides",
+]
+ABBREVIATIONS = ["BCG", "McKinsey", "NASA", "sec", "JPM", "msft", "WSJ", "KPMG", "irs", "MIT"]
+MONTH_WORDS = ["jan", "January", "feb", "march", "Apr", "may", "june", "jul", "aug", "sept", "Oct", "nov", "december"]
+EXTENSIONS = [".pdf"] * 6 + [".docx"] * 3 + [".xlsx", ".txt", ".jpg", ".png", ".tar.gz", ".md", ""]
+SEPARATORS = ["_", "-", " "]
+
+
+def load_rename_files():
+	"""Import rename-files.py (hyphenated, so not importable by name; registered so --jobs workers can unpickle it)."""
+	spec = importlib.util.spec_from_file_location("rename_files", SCRIPT_DIR / "rename-files.py")
+	module = importlib.util.module_from_spec(spec)
+	sys.modules[spec.name] = module
+	spec.loader.exec_module(module)
+
+	# Use only the built-in abbreviations so results don't depend on ~/.claude
+	module.ABBREVIATIONS = set(module.KNOWN_ABBREVIATIONS)
+	module.ABBREVIATION_TRIE = module.build_abbreviation_trie(module.ABBREVIATIONS)
+	return module
+
+
+def _date(r: random.Random) -> str:
+	"""A date fragment in one of the styles the renamer understands (or not)."""
+	year = r.randint(1995, 2026)
+	month = r.randint(1, 12)
+	day = r.randint(1, 28)
+	style = r.randrange(9)
+	if style == 0:
+		return f"{year}-{month:02d}-{day:02d}"
+	if style == 1:
+		return f"{day:02d}-{month:02d}-{year}"
+	if style == 2:
+		return f"{year}{month:02d}{day:02d}"
+	if style == 3:
+		return r.choice([f"Q{r.randint(1, 4)} {year}", f"{year}-Q{r.randint(1, 4)}", f"q{r.randint(1, 4)}_{year}"])
+	if style == 4:
+		word = r.choice(MONTH_WORDS)
+		return r.choice([f"{word} {year}", f"{year}_{word}", f"{word}-{year}"])
+	if style == 5:
+		return str(year)
+	if style == 6:
+		return f"{year}-{month}-{day}"
+	return ""
+
+
+def _name(r: random.Random) -> str:
+	"""One synthetic filename."""
+	sep = r.choice(SEPARATORS)
+	style = r.randrange(10)
+	topic = r.choice(TOPICS).replace(" ", sep)
+	date = _date(r)
+
+	if style == 0:
+		parts = [r.choice(FIRST_NAMES), r.choice(LAST_NAMES), topic, date]
+		sep = "_"
+	elif style == 1:
+		parts = [r.choice(ABBREVIATIONS), topic, date]
+	elif style == 2:
+		# Already follows the convention
+		last, first = r.choice(LAST_NAMES).capitalize(), r.choice(FIRST_NAMES).capitalize()
+		parts = [f"{last}{first}", topic.title().replace(sep, ""), f"{r.randint(0, 99):02d}{r.randint(1, 12):02d}{r.randint(1, 28):02d}"]
+		sep = "-"
+	elif style == 3:
+		parts = [r.choice(["IMG", "DSC", "Scan", "Screenshot"]), str(r.randint(1, 9999)), date]
+	elif style == 4:
+		parts = [topic, date, f"({r.randint(1, 3)})"]
+		sep = " "
+	elif style == 5:
+		parts = [date, topic, r.choice(["final", "v2", "draft", "copy"])]
+	else:
+		parts = [topic, date]
+
+	stem = sep.join(p for p in parts if p) or topic
+	return stem + r.choice(EXTENSIONS)
+
+
+def generate_corpus(size: int, seed: int = 0) -> list[str]:
+	"""Generate size filenames deterministically from seed."""
+	r = random.Random(seed)
+	return [_name(r) for _ in range(size)]
+
+
+def peak_rss_bytes() -> int:
+	"""Peak resident set size of this process."""
+	peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	# Linux reports KiB, macOS bytes
+	return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _time(fn, items: list, rounds: int) -> dict:
+	"""Call fn on every item, rounds times; report ops/sec."""
+	start = time.perf_counter()
+	for _ in range(rounds):
+		for item in items:
+			fn(item)
+	elapsed = time.perf_counter() - start
+	ops = len(items) * rounds
+	return {
+		"ops": ops,
+		"seconds": round(elapsed, 6),
+		"opsPerSecond": round(ops / elapsed) if elapsed > 0 else None,
+	}
+
+
+def benchmark_functions(rf, names: list[str], rounds: int) -> dict:
+	"""Per-function throughput on the corpus."""
+	stems = [Path(n).stem for n in names]
+	paths = [Path("/bench") / n for n in names]
+	titles = [(n, rf.extract_source(n)[0], rf.extract_date(n)[0]) for n in names]
+
+	def analyze_cold(path):
+		rf.ANALYSIS_CACHE.clear()
+		rf.analyze_file(path)
+
+	results = {
+		"extract_date": _time(rf.extract_date, names, rounds),
+		"extract_source": _time(rf.extract_source, names, rounds),
+		"extract_title": _time(lambda t: rf.extract_title(*t), titles, rounds),
+		"is_already_formatted": _time(rf.is_already_formatted, stems, rounds),
+		"analyze_file": _time(analyze_cold, paths, rounds),
+	}
+
+	# Warm pass, then measure memo hits
+	for path in paths:
+		rf.analyze_file(path)
+	results["analyze_file_memoized"] = _time(rf.analyze_file, paths, rounds)
+	rf.ANALYSIS_CACHE.clear()
+	return results
+
+
+def materialize(names: list[str], root: Path) -> None:
+	"""Create empty files for names under root, FILES_PER_DIR per directory."""
+	for i, name in enumerate(names):
+		directory = root / f"d{i // FILES_PER_DIR:05d}"
+		if i % FILES_PER_DIR == 0:
+			directory.mkdir(parents=True, exist_ok=True)
+		try:
+			(directory / name).touch()
+		except OSError:
+			pass
+
+
+def benchmark_end_to_end(rf, names: list[str], jobs: int) -> dict:
+	"""Time list_suggestions over the corpus written to a temp directory."""
+	root = Path(tempfile.mkdtemp(prefix="cleanup-bench-"))
+	try:
+		start = time.perf_counter()
+		materialize(names, root)
+		setup = time.perf_counter() - start
+
+		rf.ANALYSIS_CACHE.clear()
+		start = time.perf_counter()
+		result = rf.list_suggestions(root, recursive=True, jobs=jobs)
+		elapsed = time.perf_counter() - start
+	finally:
+		shutil.rmtree(root, ignore_errors=True)
+
+	return {
+		"jobs": jobs,
+		"files": result["totalFiles"],
+		"auto": len(result["auto"]),
+		"needsReview": len(result["needsReview"]),
+		"setupSeconds": round(setup, 3),
+		"seconds": round(elapsed, 6),
+		"filesPerSecond": round(result["totalFiles"] / elapsed) if elapsed > 0 else None,
+	}
+
+
+def write_history(path: Path, size: int, seed: int = 0) -> None:
+	"""Write a synthetic history snapshot of size entries (100 files per directory)."""
+	r = random.Random(seed)
+	names = generate_corpus(size, seed)
+	base = 1_700_000_000
+	with open(path, "w") as f:
+		f.write('{"version":1,"files":{')
+		for i, name in enumerate(names):
+			# Recorded entries are named after the file they describe
+			name = f"{i}-{name}"
+			mtime_ns = (base + r.randrange(10**7)) * 10**9 + r.randrange(10**9)
+			renamed = r.random() < 0.3
+			entry = {
+				"mtime": mtime_ns / 1e9,
+				"dev": 2049,
+				"ino": 1_000_000 + i,
+				"mtimeNs": mtime_ns,
+				"originalName": name,
+				"action": "renamed" if renamed else "skipped",
+				"newName": name if renamed else None,
+				"processedAt": f"2024-{r.randint(1, 12):02d}-{r.randint(1, 28):02d}T10:00:00.{r.randrange(1, 10**6):06d}",
+			}
+			f.write(("," if i else "") + json.dumps(f"/home/user/Downloads/d{i // 100:05d}/{name}") + ":" + json.dumps(entry, separators=(",", ":")))
+		f.write("}}")
+
+
+def _measure(load) -> dict:
+	"""Retained and peak traced bytes of load(), plus its wall time."""
+	tracemalloc.start()
+	start = time.perf_counter()
+	result = load()
+	elapsed = time.perf_counter() - start
+	current, peak = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+	return result, {"retainedBytes": current, "peakBytes": peak, "seconds": round(elapsed, 3)}
+
+
+def benchmark_history(rf, size: int, seed: int) -> dict:
+	"""
+	Memory of history plus its inode index: the plain json.load
+	dict-of-dicts with a tuple set, against HistoryTable.
+	"""
+	root = Path(tempfile.mkdtemp(prefix="cleanup-history-bench-"))
+	try:
+		path = root / "history.json"
+		write_history(path, size, seed)
+
+		def load_dicts():
+			with open(path) as f:
+				history = json.load(f)
+			index = {(e["dev"], e["ino"], e["mtimeNs"]) for e in history["files"].values()}
+			return history, index
+
+		def load_table():
+			with open(path) as f:
+				history = rf.HistoryTable.load(f)
+			return history, rf.history_index(history)
+
+		def probes_dicts(history):
+			return [(e["dev"], e["ino"], e["mtimeNs"]) for e in history["files"].values()]
+
+		def probes_table(history):
+			return [rf._inode_key(e["dev"], e["ino"], e["mtimeNs"]) for _, e in history["files"].items()]
+
+		report = {"entries": size, "snapshotBytes": path.stat().st_size}
+		layouts = (("dictOfDicts", load_dicts, probes_dicts), ("historyTable", load_table, probes_table))
+		for label, load, probes in layouts:
+			(history, index), report[label] = _measure(load)
+			report[label]["bytesPerEntry"] = round(report[label]["retainedBytes"] / size)
+
+			# Index membership, as is_stat_in_history does per file
+			keys = probes(history)
+			start = time.perf_counter()
+			for key in keys:
+				key in index
+			report[label]["lookupMicros"] = round((time.perf_counter() - start) / len(keys) * 1e6, 3)
+			del history, index, keys
+		report["retainedRatio"] = round(report["dictOfDicts"]["retainedBytes"] / report["historyTable"]["retainedBytes"], 2)
+	finally:
+		shutil.rmtree(root, ignore_errors=True)
+	return report
+
+
+def snapshot(rf) -> list:
+	"""Suggestions for the snapshot corpus, one compact record per name."""
+	records = []
+	for name in generate_corpus(SNAPSHOT_SIZE, SNAPSHOT_SEED):
+		result = rf.analyze_file(Path("/snapshot") / name)
+		if result:
+			result = [result["suggested"], result["classification"], result["source"], result["title"], result["date"]]
+		records.append([name, result])
+	return records
+
+
+def write_snapshot(records: list) -> None:
+	"""Write the snapshot with one record per line for readable diffs."""
+	SNAPSHOT_FILE.parent.mkdir(parents=True, exist_ok=True)
+	with open(SNAPSHOT_FILE, "w") as f:
+		f.write("[\n")
+		f.write(",\n".join(json.dumps(r) for r in records))
+		f.write("\n]\n")
+
+
+def check_snapshot(rf) -> dict:
+	"""Compare current suggestions to the stored snapshot."""
+	with open(SNAPSHOT_FILE) as f:
+		expected = json.load(f)
+	actual = snapshot(rf)
+
+	mismatches = [
+		{"name": e[0], "expected": e[1], "actual": a[1]}
+		for e, a in zip(expected, actual)
+		if e != a
+	]
+	if len(expected) != len(actual):
+		mismatches.append({"name": None, "expected": len(expected), "actual": len(actual)})
+
+	return {
+		"status": "ok" if not mismatches else "changed",
+		"checked": len(actual),
+		"mismatches": mismatches[:20],
+		"mismatchCount": len(mismatches),
+	}
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Benchmark rename-files.py")
+	parser.add_argument("--scale", choices=sorted(SCALES), default="10k", help="Corpus size")
+	parser.add_argument("--seed", type=int, default=0, help="Corpus random seed")
+	parser.add_argument("--rounds", type=int, default=1, help="Passes per function benchmark")
+	parser.add_argument("--jobs", type=int, default=1, help="Workers for the end-to-end run")
+	parser.add_argument("--no-e2e", action="store_true", help="Skip the end-to-end run (no files created)")
+	parser.add_argument("--corpus", action="store_true", help="Print the corpus and exit")
+	parser.add_argument("--snapshot-check", action="store_true", help="Compare suggestions to the snapshot")
+	parser.add_argument("--snapshot-update", action="store_true", help="Rewrite the snapshot")
+	parser.add_argument("--history", choices=sorted(SCALES), help="Compare history memory layouts at this many entries")
+	args = parser.parse_args()
+
+	if args.corpus:
+		for name in generate_corpus(SCALES[args.scale], args.seed):
+			print(name)
+		return
+
+	rf = load_rename_files()
+
+	if args.snapshot_update:
+		write_snapshot(snapshot(rf))
+		print(json.dumps({"status": "updated", "file": str(SNAPSHOT_FILE)}))
+		return
+
+	if args.history:
+		print(json.dumps(benchmark_history(rf, SCALES[args.history], args.seed), indent=2))
+		return
+
+	if args.snapshot_check:
+		result = check_snapshot(rf)
+		print(json.dumps(result, indent=2))
+		sys.exit(0 if result["status"] == "ok" else 1)
+
+	names = generate_corpus(SCALES[args.scale], args.seed)
+	report = {
+		"scale": args.scale,
+		"seed": args.seed,
+		"python": sys.version.split()[0],
+		"cpus": os.cpu_count(),
+		"functions": benchmark_functions(rf, names, args.rounds),
+	}
+	if not args.no_e2e:
+		report["endToEnd"] = benchmark_end_to_end(rf, names, args.jobs)
+	report["peakRssBytes"] = peak_rss_bytes()
+
+	print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+	main()
@@ -5,25 +5,116 @@ Rename files to follow naming convention: Source-Title-date.ext
 Usage:
     python3 rename-files.py --list [directory]        # Output JSON suggestions
     python3 rename-files.py --list --new-only [dir]   # Skip previously processed
+    python3 rename-files.py --list --new-only --recursive --full-scan  # Ignore directory cache
     python3 rename-files.py --rename [directory]      # Execute renames
     python3 rename-files.py --rename --dry-run        # Preview renames
     python3 rename-files.py --rename --force          # Overwrite existing
     python3 rename-files.py --record-skip <file>      # Record file as skipped
     python3 rename-files.py --record-rename <old> <new>  # Record rename
+    python3 rename-files.py --rollback                # Undo an interrupted batch
+    python3 rename-files.py --compact-history --max-age-days 90  # Evict stale history
+    python3 rename-files.py --list --jobs 8 [dir]     # Analyze on 8 processes
+    python3 rename-files.py --list --content-dates    # Date PDFs/JPEGs from metadata
+    python3 rename-files.py --list --duplicates       # Also report identical files
+    python3 rename-files.py --list --ndjson [dir]     # Stream one record per line
+    python3 rename-files.py --watch [directory]       # Rename new arrivals (Linux)
+    python3 rename-files.py --benchmark [directory]   # Date parsing throughput
 """
 
 import argparse
+import bisect
+import cProfile
+import ctypes
+import ctypes.util
+import errno
+import fcntl
+import hashlib
 import json
+import mmap
 import os
 import re
+import select
+import stat
+import struct
 import sys
-from datetime import datetime
+import tempfile
+import time
+from array import array
+from collections import OrderedDict, deque
+from collections.abc import MutableMapping
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional
 
 # History file location
 HISTORY_FILE = Path.home() / ".claude" / "cleanup-history.json"
 
+# Append-only journal of actions not yet folded into HISTORY_FILE
+HISTORY_JOURNAL = HISTORY_FILE.with_name("cleanup-history.journal")
+
+# Suggestions planned and applied together (one rollback journal and one
+# history commit each)
+RENAME_BATCH_SIZE = 1000
+
+# Moves of each batch being applied, for --rollback after a crash: one file
+# per batch (RENAME_JOURNAL_PREFIX + unique part + ".json"), flock-held while it runs
+RENAME_JOURNAL_DIR = Path.home() / ".claude"
+RENAME_JOURNAL_PREFIX = "cleanup-rename-journal"
+
+# Fingerprints of settled directories for recursive --new-only runs
+DIR_CACHE_FILE = Path.home() / ".claude" / "cleanup-dir-cache.json"
+
+# Files awaiting LLM review, queued by --watch
+REVIEW_QUEUE_FILE = Path.home() / ".claude" / "cleanup-review-queue.ndjson"
+
+# In-progress download suffixes ignored by --watch
+PARTIAL_SUFFIXES = (".crdownload", ".part", ".partial", ".download")
+
+# Quiet period before --watch handles a file
+WATCH_DEBOUNCE_SECONDS = 2.0
+
+# How often --watch flushes resident history to the journal
+WATCH_FLUSH_SECONDS = 30.0
+
+# Journal size that triggers compaction into HISTORY_FILE
+HISTORY_COMPACT_BYTES = 1 << 20
+
+# Default limits for --compact-history, which evicts entries processed more
+# than HISTORY_MAX_AGE_DAYS ago, entries whose file is gone, and then the
+# oldest entries beyond HISTORY_MAX_ENTRIES (automatic compaction evicts nothing)
+HISTORY_MAX_AGE_DAYS = 365
+HISTORY_MAX_ENTRIES = 500_000
+
+# Paths sent to each worker with --jobs
+ANALYSIS_BATCH_SIZE = 256
+
+# analyze_file results kept in the LRU memo
+ANALYSIS_CACHE_SIZE = 65536
+
+# Persisted analyze_file memo (--persist-cache)
+ANALYSIS_CACHE_FILE = Path.home() / ".claude" / "cleanup-analysis-cache.json"
+
+# Extensions whose metadata can date an undated file (--content-dates)
+CONTENT_DATE_EXTENSIONS = {".pdf", ".jpg", ".jpeg"}
+
+# Bytes read from the head and tail of a file when looking for metadata
+CONTENT_DATE_WINDOW = 64 * 1024
+
+# Threads reading metadata, and files in flight ahead of the consumer
+CONTENT_DATE_THREADS = 8
+CONTENT_DATE_QUEUE = 64
+
+# Metadata dates keyed by (st_dev, st_ino, st_mtime_ns)
+CONTENT_DATE_CACHE_SIZE = 65536
+CONTENT_DATE_CACHE_FILE = Path.home() / ".claude" / "cleanup-content-dates.json"
+
+# Bytes hashed from each end of same-size files (--duplicates); only files
+# still colliding after that are hashed in full, in chunks of
+# DUPLICATE_CHUNK_BYTES
+DUPLICATE_SAMPLE_BYTES = 64 * 1024
+DUPLICATE_CHUNK_BYTES = 1 << 20
+
 # Known abbreviations (kept uppercase)
 KNOWN_ABBREVIATIONS = {
 	# Consulting
@@ -38,6 +129,12 @@ KNOWN_ABBREVIATIONS = {
 	"MIT", "NYU", "UCLA", "USC", "HBS", "WSJ", "NYT", "BBC", "CNN",
 }
 
+# User abbreviation dictionary merged with KNOWN_ABBREVIATIONS (one per line)
+USER_ABBREVIATIONS_FILE = Path.home() / ".claude" / "cleanup-abbreviations.txt"
+
+# Compiled abbreviation trie, rebuilt when either source changes
+ABBREVIATION_CACHE_FILE = Path.home() / ".claude" / "cleanup-abbreviations.cache.json"
+
 # Month mappings
 MONTHS = {
 	"jan": "January", "january": "January",
@@ -55,66 +152,860 @@ MONTHS = {
 }
 
 
+class Profiler:
+	"""Per-stage wall time and counters collected by --profile."""
+
+	def __init__(self):
+		self.seconds = {}
+		self.counts = {}
+
+	def add(self, stage: str, seconds: float) -> None:
+		"""Add time spent in stage."""
+		self.seconds[stage] = self.seconds.get(stage, 0.0) + seconds
+
+	def lap(self, stage: str, start: float) -> float:
+		"""Add the time since start to stage and return the current time."""
+		now = time.perf_counter()
+		self.seconds[stage] = self.seconds.get(stage, 0.0) + now - start
+		return now
+
+	def count(self, name: str, n: int = 1) -> None:
+		"""Increment a counter."""
+		self.counts[name] = self.counts.get(name, 0) + n
+
+	def drain(self) -> dict:
+		"""Return and reset everything collected so far (for worker processes)."""
+		data = {"seconds": self.seconds, "counts": self.counts}
+		self.seconds = {}
+		self.counts = {}
+		return data
+
+	def merge(self, data: dict) -> None:
+		"""Fold in data drained from another process."""
+		for stage, seconds in data["seconds"].items():
+			self.add(stage, seconds)
+		for name, n in data["counts"].items():
+			self.count(name, n)
+
+	def report(self, total: float) -> dict:
+		"""
+		Timing breakdown; walk time excludes the stat calls made while walking.
+
+		With --jobs, worker stages are summed across processes and can exceed
+		the wall-clock total.
+		"""
+		seconds = dict(self.seconds)
+		if "walk" in seconds:
+			seconds["walk"] -= seconds.get("stat", 0.0)
+		return {
+			"totalSeconds": round(total, 6),
+			"seconds": {stage: round(value, 6) for stage, value in sorted(seconds.items())},
+			"counts": dict(sorted(self.counts.items())),
+		}
+
+
+# Active profiler; None unless --profile is given
+PROFILE = None
+
+
+def _timed(iterator, stage: str):
+	"""Yield from iterator, charging the time spent producing items to stage."""
+	while True:
+		start = time.perf_counter()
+		try:
+			item = next(iterator)
+		except StopIteration:
+			PROFILE.lap(stage, start)
+			return
+		PROFILE.lap(stage, start)
+		yield item
+
+
+# Action codes stored by HistoryTable
+HISTORY_ACTIONS = ("skipped", "renamed")
+_ACTION_CODES = {action: code for code, action in enumerate(HISTORY_ACTIONS)}
+
+# Flag in the action column: newName is the row's file name (renames are
+# recorded under their new path)
+_NEW_NAME_IS_NAME = 0x80
+
+# Fields HistoryTable stores in columns; anything else is kept per row
+_HISTORY_FIELDS = ("mtime", "dev", "ino", "mtimeNs", "originalName", "action", "newName", "processedAt")
+
+_HISTORY_FIELD_SET = frozenset(_HISTORY_FIELDS)
+
+# Width of datetime.isoformat() with microseconds
+_TIMESTAMP_WIDTH = 26
+
+# Column sentinels for None
+_NO_MTIME = float("nan")
+_NO_ID = (1 << 64) - 1
+_NO_MTIME_NS = -(1 << 63)
+
+
+_MASK64 = (1 << 64) - 1
+
+
+def _inode_key(dev: int, ino: int, mtime_ns: int) -> int:
+	"""Pack (st_dev, st_ino, st_mtime_ns) into one int for the history index."""
+	return (((dev << 64) | ino) << 64) | (mtime_ns & _MASK64)
+
+
+class InodeIndex:
+	"""
+	Membership index of _inode_key values for a HistoryTable.
+
+	Holds the 64-bit hash of each key in a sorted array with the row it
+	came from (12 bytes per entry instead of a set of large ints); a hash
+	match is confirmed against the table's columns. Keys added after the
+	build go in a small set.
+	"""
+
+	__slots__ = ("table", "hashes", "rows", "recent")
+
+	def __init__(self, table: "HistoryTable", rows):
+		self.table = table
+		dev, ino, mtime_ns = table._dev, table._ino, table._mtime_ns
+		# Sort (hash, row) pairs packed into single ints
+		packed = sorted(
+			((hash(_inode_key(dev[row], ino[row], mtime_ns[row])) & _MASK64) << 32) | row
+			for row in rows
+			if ino[row] != _NO_ID
+		)
+		self.hashes = array("Q", [key >> 32 for key in packed])
+		self.rows = array("L", [key & 0xFFFFFFFF for key in packed])
+		self.recent = set()
+
+	def add(self, key: int) -> None:
+		self.recent.add(key)
+
+	def __contains__(self, key: int) -> bool:
+		if key in self.recent:
+			return True
+		hashes = self.hashes
+		target = hash(key) & _MASK64
+		i = bisect.bisect_left(hashes, target)
+		if i == len(hashes) or hashes[i] != target:
+			return False
+
+		dev, ino, mtime_ns = key >> 128, (key >> 64) & _MASK64, key & _MASK64
+		table = self.table
+		while i < len(hashes) and hashes[i] == target:
+			row = self.rows[i]
+			if table._ino[row] == ino and table._dev[row] == dev and table._mtime_ns[row] & _MASK64 == mtime_ns:
+				return True
+			i += 1
+		return False
+
+	def __len__(self) -> int:
+		return len(self.hashes) + len(self.recent)
+
+
+class HistoryTable(MutableMapping):
+	"""
+	Compact {resolved_path: entry} mapping for history["files"].
+
+	Paths are split at the last '/'; each directory prefix is stored once
+	with a {name: row} dict, and entry fields live in typed arrays indexed
+	by row (actions as HISTORY_ACTIONS codes, processedAt as fixed-width
+	ASCII). Rare values (original or new names that differ from the file
+	name, unusual timestamps or actions, extra keys) are kept in per-row
+	dicts. Entries are built as dicts only when read, so lookups
+	and iteration behave like the dict-of-dicts layout at a fraction of
+	the memory. Replaced and deleted rows are not reclaimed until reload.
+	"""
+
+	def __init__(self, entries=None):
+		self._dirs = []
+		self._dir_ids = {}
+		self._names = []
+		self._count = 0
+		self._mtime = array("d")
+		self._dev = array("Q")
+		self._ino = array("Q")
+		self._mtime_ns = array("q")
+		self._action = array("B")
+		self._processed = bytearray()
+		self._new_name = {}
+		self._original = {}
+		self._irregular = {}
+		self._inode_keys = None
+		self._pending = None
+		if entries:
+			self.update(entries)
+
+	def _locate(self, path: str) -> tuple[int, str]:
+		"""Return (directory id, name), interning the directory."""
+		cut = path.rfind("/") + 1
+		prefix, name = path[:cut], path[cut:]
+		dir_id = self._dir_ids.get(prefix)
+		if dir_id is None:
+			dir_id = self._dir_ids[prefix] = len(self._dirs)
+			self._dirs.append(prefix)
+			self._names.append({})
+		return dir_id, name
+
+	def _row(self, path: str) -> Optional[int]:
+		cut = path.rfind("/") + 1
+		dir_id = self._dir_ids.get(path[:cut])
+		if dir_id is None:
+			return None
+		return self._names[dir_id].get(path[cut:])
+
+	def _append(self, entry: dict, name: Optional[str]) -> int:
+		"""Store entry's fields in a new row and return it."""
+		row = len(self._action)
+		get = entry.get
+
+		mtime, dev, ino, mtime_ns = get("mtime"), get("dev"), get("ino"), get("mtimeNs")
+		self._mtime.append(_NO_MTIME if mtime is None else mtime)
+		self._dev.append(_NO_ID if dev is None else dev)
+		self._ino.append(_NO_ID if ino is None else ino)
+		self._mtime_ns.append(_NO_MTIME_NS if mtime_ns is None else mtime_ns)
+
+		processed = get("processedAt")
+		timestamp = type(processed) is str and len(processed) == _TIMESTAMP_WIDTH and processed.isascii()
+		self._processed += processed.encode() if timestamp else b" " * _TIMESTAMP_WIDTH
+
+		code = _ACTION_CODES.get(get("action"))
+		if code is None or not timestamp or not entry.keys() <= _HISTORY_FIELD_SET:
+			irregular = {key: value for key, value in entry.items() if key not in _HISTORY_FIELD_SET}
+			if code is None:
+				irregular["action"] = get("action")
+				code = 0
+			if not timestamp:
+				irregular["processedAt"] = processed
+			self._irregular[row] = irregular
+
+		self._action.append(code)
+		if name is None:
+			# Loading: the name arrives with the path (see load)
+			self._pending.append((get("originalName"), get("newName")))
+		else:
+			self._set_names(row, name, get("originalName"), get("newName"))
+		return row
+
+	def _set_names(self, row: int, name: str, original: Optional[str], new_name: Optional[str]) -> None:
+		if original != name:
+			self._original[row] = original
+		if new_name is not None:
+			if new_name == name:
+				self._action[row] |= _NEW_NAME_IS_NAME
+			else:
+				self._new_name[row] = new_name
+
+	def _entry(self, row: int, name: str) -> dict:
+		"""Rebuild the entry dict for row."""
+		mtime = self._mtime[row]
+		dev, ino, mtime_ns = self._dev[row], self._ino[row], self._mtime_ns[row]
+		code = self._action[row]
+		entry = {
+			"mtime": None if mtime != mtime else mtime,
+			"dev": None if dev == _NO_ID else dev,
+			"ino": None if ino == _NO_ID else ino,
+			"mtimeNs": None if mtime_ns == _NO_MTIME_NS else mtime_ns,
+			"originalName": self._original.get(row, name),
+			"action": HISTORY_ACTIONS[code & ~_NEW_NAME_IS_NAME],
+			"newName": name if code & _NEW_NAME_IS_NAME else self._new_name.get(row),
+			"processedAt": self._processed[row * _TIMESTAMP_WIDTH:(row + 1) * _TIMESTAMP_WIDTH].decode(),
+		}
+		irregular = self._irregular.get(row)
+		if irregular:
+			entry.update(irregular)
+		return entry
+
+	def __getitem__(self, path: str) -> dict:
+		row = self._row(path)
+		if row is None:
+			raise KeyError(path)
+		return self._entry(row, path[path.rfind("/") + 1:])
+
+	def __contains__(self, path) -> bool:
+		return isinstance(path, str) and self._row(path) is not None
+
+	def __setitem__(self, path: str, entry: dict) -> None:
+		dir_id, name = self._locate(path)
+		names = self._names[dir_id]
+		if name in names:
+			# The replaced row's inode may no longer be in history
+			self._inode_keys = None
+		else:
+			self._count += 1
+		row = names[name] = self._append(entry, name)
+		if self._inode_keys is not None and self._ino[row] != _NO_ID:
+			self._inode_keys.add(_inode_key(self._dev[row], self._ino[row], self._mtime_ns[row]))
+
+	def __delitem__(self, path: str) -> None:
+		cut = path.rfind("/") + 1
+		dir_id = self._dir_ids.get(path[:cut])
+		if dir_id is None:
+			raise KeyError(path)
+		del self._names[dir_id][path[cut:]]
+		self._count -= 1
+		self._inode_keys = None
+
+	def __iter__(self):
+		for prefix, names in zip(self._dirs, self._names):
+			for name in names:
+				yield prefix + name
+
+	def items(self):
+		for prefix, names in zip(self._dirs, self._names):
+			for name, row in names.items():
+				yield prefix + name, self._entry(row, name)
+
+	def __len__(self) -> int:
+		return self._count
+
+	def inode_keys(self) -> InodeIndex:
+		"""Index of _inode_key for every entry with an inode, built on first use."""
+		if self._inode_keys is None:
+			self._inode_keys = InodeIndex(self, (row for names in self._names for row in names.values()))
+		return self._inode_keys
+
+	@classmethod
+	def load(cls, f) -> dict:
+		"""
+		Parse a history snapshot into {"version", "files": HistoryTable}.
+
+		Entries go into columns as the decoder produces them, so the
+		dict-of-dicts form never exists in full.
+		"""
+		table = cls()
+		table._pending = []
+
+		def hook(pairs):
+			if not pairs:
+				return {}
+			first = pairs[0][0]
+			if first in _HISTORY_FIELD_SET:
+				# One entry: store it now, name it when its path arrives
+				return table._append(dict(pairs), None)
+			if first.startswith("/"):
+				for path, row in pairs:
+					dir_id, name = table._locate(path)
+					table._set_names(row, name, *table._pending[row])
+					if name not in table._names[dir_id]:
+						table._count += 1
+					table._names[dir_id][name] = row
+				return table
+			return dict(pairs)
+
+		history = json.load(f, object_pairs_hook=hook)
+		table._pending = None
+		if not isinstance(history, dict):
+			raise ValueError("history is not an object")
+		if not isinstance(history.get("files"), cls):
+			history["files"] = cls(history.get("files") or {})
+		return history
+
+
+def _read_journal() -> dict:
+	"""Replay journal records into {path: entry}; later records win."""
+	entries = {}
+	try:
+		with open(HISTORY_JOURNAL, "rb") as f:
+			for line in f:
+				try:
+					record = json.loads(line)
+				except ValueError:
+					# Torn write from a crash; skip it
+					continue
+				if isinstance(record, dict) and "path" in record:
+					entries[record.pop("path")] = record
+	except OSError:
+		pass
+	return entries
+
+
 def load_history() -> dict:
-	"""Load history from file."""
+	"""
+	Load history from the snapshot file plus any journaled actions.
+
+	history["files"] is a HistoryTable.
+	"""
+	history = {"version": 1, "files": HistoryTable()}
 	if HISTORY_FILE.exists():
 		try:
 			with open(HISTORY_FILE) as f:
-				return json.load(f)
-		except (json.JSONDecodeError, IOError):
+				history = HistoryTable.load(f)
+		except (ValueError, TypeError, OverflowError, IOError):
+			# Unreadable or malformed snapshot; start over
+			history = {"version": 1, "files": HistoryTable()}
+	history["files"].update(_read_journal())
+	return history
+
+
+def _write_snapshot(history: dict) -> None:
+	"""Atomically replace the snapshot file, writing entries one at a time."""
+	HISTORY_FILE.parent.mkdir(parents=True, exist_ok=True)
+	tmp = HISTORY_FILE.with_name(HISTORY_FILE.name + ".tmp")
+	dumps = json.JSONEncoder(separators=(",", ":")).encode
+	with open(tmp, "w") as f:
+		f.write("{")
+		for key, value in history.items():
+			if key != "files":
+				f.write(f"{dumps(key)}:{dumps(value)},")
+		f.write('"files":{')
+		first = True
+		for path, entry in history.get("files", {}).items():
+			f.write(f"{'' if first else ','}{dumps(path)}:{dumps(entry)}")
+			first = False
+		f.write("}}")
+		f.flush()
+		os.fsync(f.fileno())
+	os.replace(tmp, HISTORY_FILE)
+
+
+def prune_history(
+	history: dict,
+	max_age_days: Optional[float] = HISTORY_MAX_AGE_DAYS,
+	max_entries: Optional[int] = HISTORY_MAX_ENTRIES,
+	prune_missing: bool = False,
+) -> dict:
+	"""
+	Evict stale entries from history in place.
+
+	Drops entries whose processedAt is older than max_age_days, and then
+	the least recently processed entries beyond max_entries. None disables
+	a limit. With prune_missing, also drops entries whose file is gone
+	from a directory that still exists (a file moved away keeps its inode
+	match only until then); entries under a missing directory, such as an
+	unmounted volume, are kept.
+
+	Returns:
+		Counts of evicted entries: {missing, expired, overLimit}
+	"""
+	files = history.setdefault("files", {})
+	evicted = {"missing": 0, "expired": 0, "overLimit": 0}
+
+	cutoff = (datetime.now() - timedelta(days=max_age_days)).isoformat() if max_age_days is not None else None
+	missing = []
+	expired = []
+	dir_exists = {}
+	# Only walk the entries when a per-entry rule is on
+	if prune_missing or cutoff is not None:
+		for path, entry in files.items():
+			if prune_missing and not os.path.lexists(path):
+				parent = os.path.dirname(path)
+				if parent not in dir_exists:
+					dir_exists[parent] = os.path.isdir(parent)
+				if dir_exists[parent]:
+					missing.append(path)
+					continue
+			if cutoff is not None and (entry.get("processedAt") or "") < cutoff:
+				expired.append(path)
+	for path in missing + expired:
+		del files[path]
+	evicted["missing"] = len(missing)
+	evicted["expired"] = len(expired)
+
+	if max_entries is not None and len(files) > max_entries:
+		# ISO timestamps sort chronologically
+		ranked = sorted((entry.get("processedAt") or "", path) for path, entry in files.items())
+		for _, path in ranked[:len(files) - max_entries]:
+			del files[path]
+		evicted["overLimit"] = len(ranked) - max_entries
+
+	return evicted
+
+
+def _history_bytes() -> int:
+	"""Combined size of the snapshot file and journal."""
+	total = 0
+	for path in (HISTORY_FILE, HISTORY_JOURNAL):
+		try:
+			total += path.stat().st_size
+		except OSError:
+			pass
+	return total
+
+
+def _compact_locked(
+	journal,
+	history: dict,
+	max_age_days: Optional[float] = None,
+	max_entries: Optional[int] = None,
+	prune_missing: bool = False,
+) -> dict:
+	"""
+	Write history as the snapshot and clear the journal (lock held).
+
+	Evicts nothing unless given limits or prune_missing (see prune_history).
+	"""
+	bytes_before = _history_bytes()
+	entries_before = len(history.get("files", {}))
+	evicted = prune_history(history, max_age_days, max_entries, prune_missing)
+	_write_snapshot(history)
+	journal.truncate(0)
+
+	if any(evicted.values()):
+		# Settled directories may now hold files that are no longer in history
+		try:
+			DIR_CACHE_FILE.unlink()
+		except OSError:
 			pass
-	return {"version": 1, "files": {}}
+
+	bytes_after = _history_bytes()
+	return {
+		"entriesBefore": entries_before,
+		"entriesAfter": len(history["files"]),
+		"evicted": evicted,
+		"bytesBefore": bytes_before,
+		"bytesAfter": bytes_after,
+		"bytesReclaimed": bytes_before - bytes_after,
+	}
 
 
-def save_history(history: dict) -> None:
-	"""Save history to file."""
+def compact_history(
+	max_age_days: Optional[float] = HISTORY_MAX_AGE_DAYS,
+	max_entries: Optional[int] = HISTORY_MAX_ENTRIES,
+) -> dict:
+	"""
+	Fold the journal into the snapshot file, evicting stale entries and
+	those whose file is gone; returns what was reclaimed.
+	"""
 	HISTORY_FILE.parent.mkdir(parents=True, exist_ok=True)
-	with open(HISTORY_FILE, "w") as f:
-		json.dump(history, f, indent=2)
+	with open(HISTORY_JOURNAL, "ab") as journal:
+		fcntl.flock(journal, fcntl.LOCK_EX)
+		return _compact_locked(journal, load_history(), max_age_days, max_entries, prune_missing=True)
 
 
-def record_action(filepath: str, action: str, new_name: Optional[str] = None) -> None:
-	"""Record an action in history."""
-	history = load_history()
+def make_history_entry(filepath: str, action: str, new_name: Optional[str] = None) -> tuple[str, dict]:
+	"""Build a (resolved_path, entry) history record for a file."""
 	path = Path(filepath)
 
 	try:
-		mtime = path.stat().st_mtime if path.exists() else None
+		st = path.stat()
 	except OSError:
-		mtime = None
+		st = None
 
-	history["files"][str(path.resolve())] = {
-		"mtime": mtime,
+	return str(path.resolve()), {
+		"mtime": st.st_mtime if st else None,
+		"dev": st.st_dev if st else None,
+		"ino": st.st_ino if st else None,
+		"mtimeNs": st.st_mtime_ns if st else None,
 		"originalName": path.name,
 		"action": action,
 		"newName": new_name,
 		"processedAt": datetime.now().isoformat(),
 	}
-	save_history(history)
 
 
-def is_in_history(filepath: Path, history: dict) -> bool:
-	"""Check if file is in history and hasn't changed."""
-	resolved = str(filepath.resolve())
-	if resolved not in history.get("files", {}):
-		return False
+def append_history(entries: list[tuple[str, dict]]) -> None:
+	"""
+	Append history records to the journal in one durable write.
+
+	The journal is folded into the snapshot once it grows past
+	HISTORY_COMPACT_BYTES; no entries are evicted then.
+	"""
+	if not entries:
+		return
+
+	data = "".join(
+		json.dumps({"path": key, **entry}, separators=(",", ":")) + "\n"
+		for key, entry in entries
+	).encode()
+
+	HISTORY_FILE.parent.mkdir(parents=True, exist_ok=True)
+	with open(HISTORY_JOURNAL, "ab") as journal:
+		fcntl.flock(journal, fcntl.LOCK_EX)
+		size = journal.seek(0, os.SEEK_END)
+		if size:
+			# Start on a fresh line if a previous write was torn
+			with open(HISTORY_JOURNAL, "rb") as tail:
+				tail.seek(size - 1)
+				if tail.read(1) != b"\n":
+					data = b"\n" + data
+		journal.write(data)
+		journal.flush()
+		os.fsync(journal.fileno())
+		size += len(data)
+
+		if size >= HISTORY_COMPACT_BYTES:
+			_compact_locked(journal, load_history())
 
-	entry = history["files"][resolved]
+
+def record_action(filepath: str, action: str, new_name: Optional[str] = None) -> None:
+	"""Record an action in history."""
+	append_history([make_history_entry(filepath, action, new_name)])
+
+
+def history_index(history: dict):
+	"""Build the index of processed files: _inode_key(st_dev, st_ino, st_mtime_ns) per entry."""
+	files = history.get("files", {})
+	if isinstance(files, HistoryTable):
+		return files.inode_keys()
+	return {
+		_inode_key(entry["dev"], entry["ino"], entry["mtimeNs"])
+		for entry in files.values()
+		if entry.get("ino") is not None
+	}
+
+
+def is_stat_in_history(real_path: str, st: os.stat_result, history: dict, index: set) -> bool:
+	"""
+	Check a file against history using an existing stat result.
+
+	Files match by inode and mtime, so moved-but-unchanged files still count
+	as processed. Entries recorded before inodes were tracked match by path.
+	"""
+	if _inode_key(st.st_dev, st.st_ino, st.st_mtime_ns) in index:
+		return True
+
+	entry = history.get("files", {}).get(real_path)
+	return entry is not None and entry.get("mtime") == st.st_mtime
+
+
+class DirectoryCache:
+	"""
+	Fingerprints of settled directories for --new-only runs.
+
+	A directory is settled when every non-hidden file in it was already in
+	history. Its fingerprint is (st_dev, st_ino, st_mtime_ns) plus the sum
+	of its non-hidden files' st_mtime_ns, with the entry count, file count
+	and subdirectory names from the last listing. While the directory's
+	mtime is unchanged its listing is unchanged; files edited in place don't
+	touch it, so the files are still stat'ed and the directory is only
+	reused while their mtimes are unchanged. A reused directory's files are
+	not checked against history or analyzed again.
+	"""
+
+	# Directories modified this recently may still change within the same
+	# mtime tick, so they are not trusted
+	RACY_NS = 2_000_000_000
+
+	def __init__(self, path: Path, root: str):
+		self.path = path
+		self.root = root
+		self.real_root = os.path.realpath(root)
+		self.cutoff_ns = time.time_ns() - self.RACY_NS
+		self.reused_files = 0
+		self.skipped_dirs = 0
+		self.unsettled = set()
+		try:
+			with open(path) as f:
+				data = json.load(f)
+			self.dirs = data["dirs"] if data.get("version") == 2 else {}
+		except (OSError, ValueError, KeyError):
+			self.dirs = {}
+
+	def _key(self, directory: str) -> str:
+		return self.real_root + directory[len(self.root):]
+
+	def lookup(self, directory: str, st: os.stat_result) -> Optional[dict]:
+		"""Return the stored record if the directory is settled and unchanged."""
+		record = self.dirs.get(self._key(directory))
+		if record is None or record["fingerprint"][:3] != [st.st_dev, st.st_ino, st.st_mtime_ns]:
+			return None
+		if files_mtime_sum(directory) != record["fingerprint"][3]:
+			# A file was edited in place
+			return None
+		self.reused_files += record["files"]
+		self.skipped_dirs += 1
+		return record
+
+	def mark_unsettled(self, directory: str) -> None:
+		"""Note that directory holds a file not yet in history."""
+		self.unsettled.add(directory)
+
+	def store(
+		self,
+		directory: str,
+		st: os.stat_result,
+		mtime_sum: int,
+		newest_ns: int,
+		entries: int,
+		files: int,
+		subdirs: list[str],
+	) -> None:
+		"""Record a freshly listed directory, keeping it only if settled and no file was just written."""
+		key = self._key(directory)
+		if directory in self.unsettled or max(st.st_mtime_ns, newest_ns) > self.cutoff_ns:
+			self.dirs.pop(key, None)
+			return
+		self.dirs[key] = {
+			"fingerprint": [st.st_dev, st.st_ino, st.st_mtime_ns, mtime_sum],
+			"entries": entries,
+			"files": files,
+			"subdirs": subdirs,
+		}
+
+	def save(self) -> None:
+		"""Persist fingerprints atomically."""
+		self.path.parent.mkdir(parents=True, exist_ok=True)
+		tmp = self.path.with_name(self.path.name + ".tmp")
+		with open(tmp, "w") as f:
+			json.dump({"version": 2, "dirs": self.dirs}, f, separators=(",", ":"))
+		os.replace(tmp, self.path)
+
+
+def files_mtime_sum(directory: str) -> Optional[int]:
+	"""Sum of st_mtime_ns over the non-hidden files directly in directory, or None if unreadable."""
+	total = 0
 	try:
-		current_mtime = filepath.stat().st_mtime
-		# Consider in history if mtime matches
-		if entry.get("mtime") == current_mtime:
-			return True
+		with os.scandir(directory) as it:
+			for entry in it:
+				if not entry.name.startswith(".") and entry.is_file():
+					total += entry.stat().st_mtime_ns
+	except OSError:
+		return None
+	return total
+
+
+def walk_files(directory: str, recursive: bool = False, dir_cache: Optional[DirectoryCache] = None):
+	"""
+	Yield (path, stat_result) for files under directory using os.scandir.
+
+	Order matches Path.glob("*") / Path.rglob("*"): each directory's files
+	in listing order, then its subdirectories depth-first. Symlinked
+	directories are not followed. Each file costs one stat call. With a
+	dir_cache, settled directories yield no files (their files are only
+	stat'ed to check for edits); only their subdirectories are visited.
+	"""
+	if dir_cache is not None:
+		try:
+			dir_st = os.stat(directory)
+		except OSError:
+			return
+		record = dir_cache.lookup(directory, dir_st)
+		if record is not None:
+			if recursive:
+				for name in record["subdirs"]:
+					yield from walk_files(os.path.join(directory, name), recursive, dir_cache)
+			return
+
+	try:
+		with os.scandir(directory) as it:
+			entries = list(it)
+	except OSError:
+		return
+
+	subdirs = []
+	visible_files = 0
+	mtime_sum = 0
+	newest_ns = 0
+	for entry in entries:
+		try:
+			if entry.is_file():
+				if PROFILE is None:
+					st = entry.stat()
+				else:
+					start = time.perf_counter()
+					st = entry.stat()
+					PROFILE.lap("stat", start)
+				if not entry.name.startswith("."):
+					visible_files += 1
+					mtime_sum += st.st_mtime_ns
+					if st.st_mtime_ns > newest_ns:
+						newest_ns = st.st_mtime_ns
+				yield entry.path, st
+			elif recursive and entry.is_dir(follow_symlinks=False):
+				subdirs.append(entry.path)
+		except OSError:
+			continue
+
+	if dir_cache is not None:
+		dir_cache.store(directory, dir_st, mtime_sum, newest_ns, len(entries), visible_files, [os.path.basename(d) for d in subdirs])
+
+	for subdir in subdirs:
+		yield from walk_files(subdir, recursive, dir_cache)
+
+
+_HAS_DELIMITER = re.compile(r"[\s\-_]")
+
+
+def build_abbreviation_trie(words) -> dict:
+	"""Build a character trie; a node's "" key holds the word ending there."""
+	trie = {}
+	for word in words:
+		node = trie
+		for char in word:
+			node = node.setdefault(char, {})
+		node[""] = word
+	return trie
+
+
+def load_abbreviations(user_file: Path = USER_ABBREVIATIONS_FILE) -> tuple[set[str], dict]:
+	"""
+	Merge KNOWN_ABBREVIATIONS with the user dictionary (one per line, # comments).
+
+	Entries containing whitespace, '-' or '_' are ignored since those are
+	name delimiters.
+	The merged set and its trie are cached in ABBREVIATION_CACHE_FILE and
+	rebuilt when the user file or the built-in set changes.
+
+	Returns:
+		(abbreviations, trie)
+	"""
+	try:
+		st = user_file.stat()
+		user_key = [st.st_mtime_ns, st.st_size]
 	except OSError:
+		user_key = None
+	builtin_key = hashlib.sha1("\n".join(sorted(KNOWN_ABBREVIATIONS)).encode()).hexdigest()
+	key = [str(user_file), user_key, builtin_key]
+
+	try:
+		with open(ABBREVIATION_CACHE_FILE) as f:
+			cache = json.load(f)
+		if cache.get("key") == key:
+			return set(cache["words"]), cache["trie"]
+	except (OSError, ValueError, KeyError):
 		pass
 
-	return False
+	words = set(KNOWN_ABBREVIATIONS)
+	if user_key is not None:
+		try:
+			with open(user_file) as f:
+				for line in f:
+					line = line.strip()
+					if line and not line.startswith("#") and not _HAS_DELIMITER.search(line):
+						words.add(line.upper())
+		except (OSError, UnicodeDecodeError):
+			pass
+
+	trie = build_abbreviation_trie(words)
+
+	# Only worth caching once a user dictionary is in play
+	if user_key is not None:
+		try:
+			ABBREVIATION_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+			tmp = ABBREVIATION_CACHE_FILE.with_name(ABBREVIATION_CACHE_FILE.name + ".tmp")
+			with open(tmp, "w") as f:
+				json.dump({"key": key, "words": sorted(words), "trie": trie}, f, separators=(",", ":"))
+			os.replace(tmp, ABBREVIATION_CACHE_FILE)
+		except OSError:
+			pass
+
+	return words, trie
+
+
+ABBREVIATIONS, ABBREVIATION_TRIE = load_abbreviations()
+
+
+def match_abbreviation(text: str) -> Optional[str]:
+	"""
+	Return the longest abbreviation that prefixes text (case insensitive)
+	and is not followed by a letter, in O(len(text)).
+	"""
+	upper = text.upper()
+	node = ABBREVIATION_TRIE
+	best = None
+	for i, char in enumerate(upper):
+		node = node.get(char)
+		if node is None:
+			break
+		word = node.get("")
+		if word and (i + 1 == len(upper) or not upper[i + 1].isalpha()):
+			best = word
+	return best
 
 
 def to_pascal_case(text: str) -> str:
 	"""Convert text to PascalCase."""
 	# Check if it's a known abbreviation
-	if text.upper() in KNOWN_ABBREVIATIONS:
+	if text.upper() in ABBREVIATIONS:
 		return text.upper()
 
 	# Remove special characters and split
@@ -123,130 +1014,314 @@ def to_pascal_case(text: str) -> str:
 	for word in words:
 		if word:
 			# Keep abbreviations uppercase
-			if word.upper() in KNOWN_ABBREVIATIONS:
+			if word.upper() in ABBREVIATIONS:
 				result.append(word.upper())
 			else:
 				result.append(word.capitalize())
 	return "".join(result)
 
 
-def extract_date(filename: str) -> tuple[Optional[str], str, str]:
+def _compile_date_grammar() -> re.Pattern:
 	"""
-	Extract date from filename.
+	Compile every date rule into one overlapping-scan pattern.
 
-	Returns:
-		(formatted_date, date_format, confidence)
-		date_format: 'full', 'quarter', 'month', 'year', or 'none'
+	Each rule is a named alternative inside a zero-width lookahead, so a single
+	finditer pass reports a candidate at every position. Alternatives are listed
+	in priority order; month names share one rule whose rank is taken from the
+	matched month key.
 	"""
-	# Remove extension for parsing
-	name = Path(filename).stem
+	month_keys = "|".join(sorted(MONTHS, key=len, reverse=True))
+	rules = [
+		("iso", r"(\d{4})[-/](\d{1,2})[-/](\d{1,2})"),
+		("european", r"(\d{1,2})[-/](\d{1,2})[-/](\d{4})"),
+		("compact", r"(?<!\d)(\d{4})(\d{2})(\d{2})(?!\d)"),
+		("quarter", r"Q([1-4])[\s\-_]*(\d{4})|(\d{4})[\s\-_]*Q([1-4])"),
+		("month", rf"(?<![a-z])({month_keys})[\s\-_]*(\d{{4}})|(\d{{4}})[\s\-_]*({month_keys})(?![a-z])"),
+		("year", r"(?<!\d)(19\d{2}|20\d{2})(?!\d)"),
+	]
+	body = "|".join(f"(?P<{name}>{pattern})" for name, pattern in rules)
+	return re.compile(f"(?=[\\dqjfmasond])(?=(?:{body}))", re.I)
+
+
+DATE_GRAMMAR = _compile_date_grammar()
+
+# Rank of each rule (lower wins); month keys are ranked in MONTHS order
+_MONTH_RANKS = {key: 4 + i for i, key in enumerate(MONTHS)}
+_DATE_RANKS = {"iso": 0, "european": 1, "compact": 2, "quarter": 3, "year": 4 + len(MONTHS)}
+
+# Date patterns stripped from titles, applied in order
+TITLE_DATE_PATTERNS = [
+	re.compile(pattern, re.I) for pattern in (
+		r"\d{4}[-/]\d{1,2}[-/]\d{1,2}",  # YYYY-MM-DD
+		r"\d{1,2}[-/]\d{1,2}[-/]\d{4}",  # DD-MM-YYYY
+		r"\d{8}",                          # YYYYMMDD
+		r"Q[1-4][\s\-_]*\d{4}",           # Q1 2024
+		r"\d{4}[\s\-_]*Q[1-4]",           # 2024 Q1
+		r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*[\s\-_]*\d{4}",
+		r"\d{4}[\s\-_]*(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*",
+		r"(?<!\d)(19|20)\d{2}(?!\d)",     # YYYY
+	)
+]
+
+_HAS_DIGIT = re.compile(r"\d")
+
 
-	# Pattern: YYYY-MM-DD or YYYY/MM/DD
-	match = re.search(r"(\d{4})[-/](\d{1,2})[-/](\d{1,2})", name)
-	if match:
-		year, month, day = match.groups()
-		return f"{year[2:]}{month.zfill(2)}{day.zfill(2)}", "full", "high"
+def _read_date_candidate(match: re.Match) -> Optional[tuple[int, tuple[int, int], str, str, str]]:
+	"""
+	Convert one grammar match into (rank, span, formatted_date, date_format, confidence).
 
-	# Pattern: DD-MM-YYYY or DD/MM/YYYY (European)
-	match = re.search(r"(\d{1,2})[-/](\d{1,2})[-/](\d{4})", name)
-	if match:
-		day, month, year = match.groups()
+	Returns None when the matched digits fail validation.
+	"""
+	kind = match.lastgroup
+	span = match.span(kind)
+	groups = match.groups()
+	base = match.re.groupindex[kind]
+	g = groups[base:base + 4]
+
+	if kind == "iso":
+		year, month, day = g[:3]
+		return _DATE_RANKS[kind], span, f"{year[2:]}{month.zfill(2)}{day.zfill(2)}", "full", "high"
+
+	if kind == "european":
+		day, month, year = g[:3]
 		if int(month) <= 12 and int(day) <= 31:
-			return f"{year[2:]}{month.zfill(2)}{day.zfill(2)}", "full", "medium"
+			return _DATE_RANKS[kind], span, f"{year[2:]}{month.zfill(2)}{day.zfill(2)}", "full", "medium"
+		return None
 
-	# Pattern: YYYYMMDD
-	match = re.search(r"(?<!\d)(\d{4})(\d{2})(\d{2})(?!\d)", name)
-	if match:
-		year, month, day = match.groups()
+	if kind == "compact":
+		year, month, day = g[:3]
 		if int(month) <= 12 and int(day) <= 31:
-			return f"{year[2:]}{month}{day}", "full", "high"
+			return _DATE_RANKS[kind], span, f"{year[2:]}{month}{day}", "full", "high"
+		return None
+
+	if kind == "quarter":
+		if g[0]:
+			quarter, year = g[0], g[1]
+		else:
+			year, quarter = g[2], g[3]
+		return _DATE_RANKS[kind], span, f"{year}-Q{quarter}", "quarter", "high"
+
+	if kind == "month":
+		if g[0]:
+			key, year = g[0], g[1]
+		else:
+			year, key = g[2], g[3]
+		key = key.lower()
+		return _MONTH_RANKS[key], span, f"{year}-{MONTHS[key]}", "month", "high"
 
-	# Pattern: Q1 2024, Q1-2024, 2024 Q1, 2024-Q1
-	match = re.search(r"Q([1-4])[\s\-_]*(\d{4})|(\d{4})[\s\-_]*Q([1-4])", name, re.I)
-	if match:
-		if match.group(1):
-			quarter, year = match.group(1), match.group(2)
+	return _DATE_RANKS[kind], span, g[0], "year", "medium"
+
+
+def scan_dates(name: str) -> list[tuple[tuple[int, int], str, str, str]]:
+	"""
+	Find every date candidate in a stem with one pass of DATE_GRAMMAR.
+
+	Only the leftmost match of each rule is kept, mirroring a per-rule
+	re.search. Candidates are returned best first.
+
+	Returns:
+		[(span, formatted_date, date_format, confidence), ...]
+	"""
+	if not _HAS_DIGIT.search(name):
+		return []
+
+	seen = set()
+	candidates = []
+	for match in DATE_GRAMMAR.finditer(name):
+		kind = match.lastgroup
+		if kind == "month":
+			base = DATE_GRAMMAR.groupindex[kind]
+			key = (match.group(base + 1) or match.group(base + 4)).lower()
+			rank_key = key
 		else:
-			year, quarter = match.group(3), match.group(4)
-		return f"{year}-Q{quarter}", "quarter", "high"
-
-	# Pattern: Month YYYY or YYYY Month
-	for month_str, month_name in MONTHS.items():
-		pattern = rf"(?<![a-z]){month_str}[\s\-_]*(\d{{4}})|(\d{{4}})[\s\-_]*{month_str}(?![a-z])"
-		match = re.search(pattern, name, re.I)
-		if match:
-			year = match.group(1) or match.group(2)
-			return f"{year}-{month_name}", "month", "high"
-
-	# Pattern: Just YYYY (4 digit year between 1990-2099)
-	match = re.search(r"(?<!\d)(19\d{2}|20\d{2})(?!\d)", name)
-	if match:
-		return match.group(1), "year", "medium"
+			rank_key = kind
+		if rank_key in seen:
+			continue
+		seen.add(rank_key)
+		candidate = _read_date_candidate(match)
+		if candidate:
+			candidates.append(candidate)
+
+	candidates.sort(key=lambda c: c[0])
+	return [c[1:] for c in candidates]
+
+
+# Lexical token kinds
+WORD = "word"
+DIGITS = "digits"
+DELIMITER = "delimiter"
+MONTH = "month"
+QUARTER = "quarter"
+ABBREVIATION = "abbreviation"
+OTHER = "other"
+
+_TOKEN_PATTERN = re.compile(
+	r"(?P<delimiter>[\s\-_]+)|(?P<quarter>Q[1-4])|(?P<digits>\d+)|(?P<word>[^\W\d_]+)|(?P<other>.)",
+	re.I | re.S,
+)
+
+
+class ParsedStem:
+	"""
+	A filename stem tokenized once and shared by the extractors.
+
+	Tokens are (kind, start, end) tuples over the stem. Date candidates and
+	'-' parts are computed on first use and cached.
+	"""
+
+	__slots__ = ("stem", "tokens", "has_digit", "_dates", "_parts")
+
+	def __init__(self, stem: str):
+		self.stem = stem
+		self.tokens = []
+		self.has_digit = False
+		self._dates = None
+		self._parts = None
+
+		for match in _TOKEN_PATTERN.finditer(stem):
+			kind = match.lastgroup
+			start, end = match.span()
+			if kind == WORD:
+				word = stem[start:end]
+				if word.lower() in MONTHS:
+					kind = MONTH
+				elif word.upper() in ABBREVIATIONS:
+					kind = ABBREVIATION
+			elif kind == DIGITS or kind == QUARTER:
+				self.has_digit = True
+			self.tokens.append((kind, start, end))
+
+	def text(self, index: int) -> str:
+		"""Return the text of token at index."""
+		_, start, end = self.tokens[index]
+		return self.stem[start:end]
+
+	def skip_delimiter(self, offset: int) -> int:
+		"""Return the offset past a delimiter token starting at offset."""
+		for kind, start, end in self.tokens:
+			if start == offset:
+				return end if kind == DELIMITER else offset
+			if start > offset:
+				break
+		return offset
+
+	@property
+	def dates(self) -> list[tuple[tuple[int, int], str, str, str]]:
+		"""Date candidates from scan_dates, best first."""
+		if self._dates is None:
+			self._dates = scan_dates(self.stem) if self.has_digit else []
+		return self._dates
+
+	@property
+	def parts(self) -> list[str]:
+		"""The stem split on '-'."""
+		if self._parts is None:
+			self._parts = self.stem.split("-")
+		return self._parts
+
+
+def _parse(filename) -> ParsedStem:
+	"""Accept a filename or an already parsed stem."""
+	if isinstance(filename, ParsedStem):
+		return filename
+	return ParsedStem(Path(filename).stem)
+
+
+def extract_date(filename) -> tuple[Optional[str], str, str]:
+	"""
+	Extract date from filename.
+
+	Returns:
+		(formatted_date, date_format, confidence)
+		date_format: 'full', 'quarter', 'month', 'year', or 'none'
+	"""
+	if isinstance(filename, ParsedStem):
+		candidates = filename.dates
+	else:
+		candidates = scan_dates(Path(filename).stem)
+	if candidates:
+		return candidates[0][1:]
 
 	return None, "none", "low"
 
 
-def extract_name_pattern(text: str) -> tuple[Optional[str], str]:
+# Common words that aren't names
+COMMON_WORDS = {
+	"report", "document", "file", "form", "scan", "statement", "invoice",
+	"receipt", "letter", "memo", "note", "draft", "final", "copy", "input",
+	"output", "data", "info", "list", "summary", "analysis", "review",
+	"foods", "inc", "corp", "llc", "ltd", "company", "group", "services",
+	"tax", "organizer", "unknown", "untitled", "new", "old", "top", "best",
+}
+
+_ASCII_WORD = re.compile(r"[a-z]+", re.I)
+_CAMEL_NAME = re.compile(r"([A-Z][a-z]+)([A-Z][a-z]+)")
+
+
+def extract_name_pattern(text) -> tuple[Optional[str], str]:
 	"""
 	Detect if text contains a person's name pattern at the START of text.
 
 	Returns:
 		(formatted_name, confidence)
 	"""
-	# Common words that aren't names
-	common_words = {
-		"report", "document", "file", "form", "scan", "statement", "invoice",
-		"receipt", "letter", "memo", "note", "draft", "final", "copy", "input",
-		"output", "data", "info", "list", "summary", "analysis", "review",
-		"foods", "inc", "corp", "llc", "ltd", "company", "group", "services",
-		"tax", "organizer", "unknown", "untitled", "new", "old", "top", "best",
-	}
+	parsed = text if isinstance(text, ParsedStem) else ParsedStem(text)
+	tokens = parsed.tokens
+	if not tokens:
+		return None, "low"
 
 	# Pattern: firstname_lastname at start
-	match = re.match(r"^([a-z]+)[_]([a-z]+)", text, re.I)
-	if match:
-		first, last = match.groups()
-		if (len(first) >= 3 and len(last) >= 3 and
-			first.lower() not in common_words and
-			last.lower() not in common_words):
-			return f"{last.capitalize()}{first.capitalize()}", "medium"
+	if len(tokens) >= 3 and parsed.text(1) == "_" and _ASCII_WORD.fullmatch(parsed.text(0)):
+		last_match = _ASCII_WORD.match(parsed.text(2))
+		if last_match:
+			first, last = parsed.text(0), last_match.group()
+			if (len(first) >= 3 and len(last) >= 3 and
+				first.lower() not in COMMON_WORDS and
+				last.lower() not in COMMON_WORDS):
+				return f"{last.capitalize()}{first.capitalize()}", "medium"
 
 	# Pattern: LastnameFirstname already (PascalCase with two capital letters)
-	match = re.match(r"^([A-Z][a-z]+)([A-Z][a-z]+)(?:-|$)", text)
-	if match:
+	match = _CAMEL_NAME.fullmatch(parsed.text(0))
+	if match and (len(tokens) == 1 or parsed.stem[tokens[1][1]] == "-"):
 		part1, part2 = match.groups()
-		if (part1.lower() not in common_words and
-			part2.lower() not in common_words):
+		if (part1.lower() not in COMMON_WORDS and
+			part2.lower() not in COMMON_WORDS):
 			# Already in LastnameFirstname format
 			return f"{part1}{part2}", "high"
 
 	return None, "low"
 
 
-def extract_source(filename: str) -> tuple[Optional[str], str]:
+def extract_source(filename) -> tuple[Optional[str], str]:
 	"""
 	Extract source from filename.
 
 	Returns:
 		(source, confidence)
 	"""
-	stem = Path(filename).stem
-	name_upper = stem.upper()
+	parsed = _parse(filename)
 
-	# Check for known abbreviations at start
-	for abbr in KNOWN_ABBREVIATIONS:
-		if name_upper.startswith(abbr) and (len(name_upper) == len(abbr) or not name_upper[len(abbr)].isalpha()):
+	# Check for the longest known abbreviation at start
+	if parsed.tokens:
+		abbr = match_abbreviation(parsed.stem)
+		if abbr:
 			return abbr, "high"
 
 	# Check for name pattern at start of filename
-	person_name, confidence = extract_name_pattern(stem)
+	person_name, confidence = extract_name_pattern(parsed)
 	if person_name and confidence != "low":
 		return person_name, confidence
 
 	return None, "low"
 
 
-def extract_title(filename: str, source: Optional[str], date_str: Optional[str]) -> tuple[str, str]:
+_PERSON_NAME = re.compile(r"^[A-Z][a-z]+[A-Z][a-z]+$")
+_NAME_WORDS = re.compile(r"[a-z]+[_\-][a-z]+", re.I)
+_DELIMITER_RUN = re.compile(r"[\s\-_]+")
+_TITLE_NOISE = re.compile(r"[\s\-_\(\)\[\]]+")
+
+
+def extract_title(filename, source: Optional[str], date_str: Optional[str]) -> tuple[str, str]:
 	"""
 	Extract and format the title portion of the filename.
 
@@ -254,49 +1329,54 @@ def extract_title(filename: str, source: Optional[str], date_str: Optional[str])
 		(title, confidence) - confidence is 'high' if title is clearly extracted,
 		'low' if title is just the whole filename or empty
 	"""
-	name = Path(filename).stem
-
-	# Remove source if present
-	if source:
-		# Remove source from beginning (case insensitive)
-		pattern = rf"^{re.escape(source)}[\s\-_]*"
-		name = re.sub(pattern, "", name, flags=re.I)
+	parsed = _parse(filename)
+	name = parsed.stem
 
-	# Remove date patterns
-	date_patterns = [
-		r"\d{4}[-/]\d{1,2}[-/]\d{1,2}",  # YYYY-MM-DD
-		r"\d{1,2}[-/]\d{1,2}[-/]\d{4}",  # DD-MM-YYYY
-		r"\d{8}",                          # YYYYMMDD
-		r"Q[1-4][\s\-_]*\d{4}",           # Q1 2024
-		r"\d{4}[\s\-_]*Q[1-4]",           # 2024 Q1
-		r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*[\s\-_]*\d{4}",
-		r"\d{4}[\s\-_]*(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*",
-		r"(?<!\d)(19|20)\d{2}(?!\d)",     # YYYY
-	]
+	# Remove source from beginning (case insensitive)
+	if source and name[:len(source)].lower() == source.lower():
+		name = name[parsed.skip_delimiter(len(source)):]
 
-	for pattern in date_patterns:
-		name = re.sub(pattern, "", name, flags=re.I)
+	# Remove date patterns (all of them need a digit)
+	if parsed.has_digit:
+		for pattern in TITLE_DATE_PATTERNS:
+			name = pattern.sub("", name)
 
 	# Remove name patterns if we detected a person name as source
-	if source and re.match(r"^[A-Z][a-z]+[A-Z][a-z]+$", source):
+	if source and _PERSON_NAME.match(source):
 		# Remove firstname_lastname patterns
-		name = re.sub(r"[a-z]+[_\-][a-z]+", "", name, flags=re.I)
+		name = _NAME_WORDS.sub("", name)
 
 	# Clean up remaining text
-	name = re.sub(r"[\s\-_]+", " ", name).strip()
+	name = _DELIMITER_RUN.sub(" ", name).strip()
 
 	if not name:
 		return "", "low"
 
 	# Check if title is meaningful (not just numbers or single chars)
-	cleaned = re.sub(r"[\s\-_\(\)\[\]]+", "", name)
+	cleaned = _TITLE_NOISE.sub("", name)
 	if len(cleaned) < 2 or cleaned.isdigit():
 		return "", "low"
 
 	return to_pascal_case(name), "high"
 
 
-def is_already_formatted(stem: str) -> bool:
+_PASCAL_PART = re.compile(r"^[A-Z][a-zA-Z0-9]*$")
+_YYMMDD = re.compile(r"^\d{6}$")
+_YYYY = re.compile(r"^\d{4}$")
+_QUARTER_PART = re.compile(r"^Q[1-4]$")
+_YEAR_PART = re.compile(r"^(19|20)\d{2}$")
+_MONTH_NAMES = set(MONTHS.values())
+
+
+def _is_pascal_or_abbr(s: str) -> bool:
+	"""Check that a non-date part is PascalCase (not lowercase) or an abbreviation."""
+	if s.upper() in ABBREVIATIONS:
+		return True
+	# PascalCase: starts with uppercase, rest is mixed case
+	return bool(_PASCAL_PART.match(s))
+
+
+def is_already_formatted(stem) -> bool:
 	"""
 	Check if stem already follows Source-Title-date convention.
 
@@ -306,7 +1386,13 @@ def is_already_formatted(stem: str) -> bool:
 	- First part(s) are PascalCase
 	- Ends with a valid date format
 	"""
-	parts = stem.split("-")
+	parsed = stem if isinstance(stem, ParsedStem) else ParsedStem(stem)
+
+	# Every accepted date format contains a digit
+	if not parsed.has_digit:
+		return False
+
+	parts = parsed.parts
 
 	if len(parts) < 2:
 		return False
@@ -314,33 +1400,26 @@ def is_already_formatted(stem: str) -> bool:
 	# Check if last part is a valid date format
 	last = parts[-1]
 
-	# Check that non-date parts are PascalCase (not lowercase)
-	def is_pascal_or_abbr(s: str) -> bool:
-		if s.upper() in KNOWN_ABBREVIATIONS:
-			return True
-		# PascalCase: starts with uppercase, rest is mixed case
-		return bool(re.match(r"^[A-Z][a-zA-Z0-9]*$", s))
-
 	# YYMMDD - most specific, require PascalCase prefix
-	if re.match(r"^\d{6}$", last):
+	if _YYMMDD.match(last):
 		non_date_parts = parts[:-1]
-		return all(is_pascal_or_abbr(p) for p in non_date_parts)
+		return all(_is_pascal_or_abbr(p) for p in non_date_parts)
 
 	# YYYY-Qn (would be split as YYYY, Qn)
-	if len(parts) >= 3 and re.match(r"^\d{4}$", parts[-2]) and re.match(r"^Q[1-4]$", last):
+	if len(parts) >= 3 and _YYYY.match(parts[-2]) and _QUARTER_PART.match(last):
 		non_date_parts = parts[:-2]
-		return all(is_pascal_or_abbr(p) for p in non_date_parts)
+		return all(_is_pascal_or_abbr(p) for p in non_date_parts)
 
 	# YYYY-Month
-	if len(parts) >= 3 and re.match(r"^\d{4}$", parts[-2]) and last in MONTHS.values():
+	if len(parts) >= 3 and _YYYY.match(parts[-2]) and last in _MONTH_NAMES:
 		non_date_parts = parts[:-2]
-		return all(is_pascal_or_abbr(p) for p in non_date_parts)
+		return all(_is_pascal_or_abbr(p) for p in non_date_parts)
 
 	# YYYY - only valid if preceded by PascalCase parts
-	if re.match(r"^(19|20)\d{2}$", last):
+	if _YEAR_PART.match(last):
 		non_date_parts = parts[:-1]
 		# Must have at least one PascalCase part before the year
-		if non_date_parts and all(is_pascal_or_abbr(p) for p in non_date_parts):
+		if non_date_parts and all(_is_pascal_or_abbr(p) for p in non_date_parts):
 			return True
 
 	return False
@@ -422,28 +1501,310 @@ def is_trivial_change(original: str, suggested: str, source: Optional[str], titl
 	return False
 
 
-def analyze_file(filepath: Path) -> Optional[dict]:
-	"""Analyze a file and suggest a new name."""
-	filename = filepath.name
-	ext = get_extension(filepath)
+class AnalysisCache:
+	"""Size-bounded LRU of per-filename analysis results with hit/miss counters."""
 
-	# Get stem by removing extension
-	if ext and len(ext) > 1:
-		stem = filename[:-len(ext)]
-	else:
-		stem = filepath.stem
+	MISSING = object()
 
-	# Skip files already in correct format
-	if is_already_formatted(stem):
-		return None
+	def __init__(self, maxsize: int):
+		self.maxsize = maxsize
+		self.entries = OrderedDict()
+		self.hits = 0
+		self.misses = 0
 
-	# Extract components (use stem, not full filename)
-	source, source_confidence = extract_source(stem + ".tmp")
-	date_str, date_format, date_confidence = extract_date(stem + ".tmp")
-	title, title_confidence = extract_title(stem + ".tmp", source, date_str)
+	def get(self, key: str):
+		"""Return the cached value for key, or MISSING."""
+		try:
+			value = self.entries[key]
+		except KeyError:
+			self.misses += 1
+			return self.MISSING
+		self.entries.move_to_end(key)
+		self.hits += 1
+		return value
+
+	def put(self, key: str, value: Optional[dict]) -> None:
+		"""Store value, evicting the least recently used entry when full."""
+		self.entries[key] = value
+		self.entries.move_to_end(key)
+		if len(self.entries) > self.maxsize:
+			self.entries.popitem(last=False)
+
+	def clear(self) -> None:
+		"""Drop all entries and reset counters."""
+		self.entries.clear()
+		self.hits = 0
+		self.misses = 0
+
+	def stats(self) -> dict:
+		"""Return hit/miss counters."""
+		lookups = self.hits + self.misses
+		return {
+			"hits": self.hits,
+			"misses": self.misses,
+			"hitRate": round(self.hits / lookups, 4) if lookups else None,
+			"entries": len(self.entries),
+			"maxEntries": self.maxsize,
+		}
+
+	def load(self, path: Path, version: str) -> None:
+		"""Load persisted entries if they were written by the same analyzer version."""
+		try:
+			with open(path) as f:
+				data = json.load(f)
+		except (OSError, ValueError):
+			return
+		if data.get("version") != version:
+			return
+		for key, value in data.get("entries", [])[-self.maxsize:]:
+			self.entries[key] = value
 
-	# Build suggested name - omit unknown components
-	parts = []
+	def save(self, path: Path, version: str) -> None:
+		"""Persist entries in LRU order."""
+		path.parent.mkdir(parents=True, exist_ok=True)
+		tmp = path.with_name(path.name + ".tmp")
+		with open(tmp, "w") as f:
+			json.dump({"version": version, "entries": list(self.entries.items())}, f, separators=(",", ":"))
+		os.replace(tmp, path)
+
+
+ANALYSIS_CACHE = AnalysisCache(ANALYSIS_CACHE_SIZE)
+
+# Set by --content-dates; None means filename dates only
+CONTENT_DATE_CACHE = None
+
+
+def analysis_version() -> str:
+	"""Fingerprint of this script and the abbreviation set, for cache invalidation."""
+	digest = hashlib.sha1(Path(__file__).read_bytes())
+	digest.update("\n".join(sorted(ABBREVIATIONS)).encode())
+	return digest.hexdigest()
+
+
+# PDF Info dictionary and XMP creation dates
+_PDF_INFO_DATE = re.compile(rb"/CreationDate\s*\(\s*(?:D:)?(\d{4})(\d{2})(\d{2})")
+_PDF_XMP_DATE = re.compile(rb"xmp:CreateDate(?:>|=[\"'])\s*(\d{4})-(\d{2})-(\d{2})")
+_EXIF_DATE = re.compile(rb"(\d{4}):(\d{2}):(\d{2})")
+
+# EXIF tags: IFD0 DateTime, Exif IFD pointer, DateTimeOriginal
+_EXIF_DATETIME = 0x0132
+_EXIF_IFD_POINTER = 0x8769
+_EXIF_DATETIME_ORIGINAL = 0x9003
+
+
+def _format_content_date(match: Optional[re.Match]) -> Optional[str]:
+	"""Format a (year, month, day) byte match as YYMMDD, or None if invalid."""
+	if match is None:
+		return None
+	year, month, day = (int(g) for g in match.groups())
+	if not (1900 <= year <= 2099 and 1 <= month <= 12 and 1 <= day <= 31):
+		return None
+	return f"{year % 100:02d}{month:02d}{day:02d}"
+
+
+def _pdf_date(head: bytes, tail: bytes) -> Optional[str]:
+	"""CreationDate from the Info dictionary, else the XMP CreateDate."""
+	for pattern in (_PDF_INFO_DATE, _PDF_XMP_DATE):
+		# The Info dictionary usually sits near the trailer
+		for window in (tail, head):
+			date = _format_content_date(pattern.search(window))
+			if date:
+				return date
+	return None
+
+
+def _exif_ifd(tiff: bytes, offset: int, order: str) -> dict[int, tuple[int, int, int]]:
+	"""Read one IFD as {tag: (type, count, value_or_offset)}."""
+	(count,) = struct.unpack_from(order + "H", tiff, offset)
+	entries = {}
+	for i in range(count):
+		tag, kind, n, value = struct.unpack_from(order + "HHII", tiff, offset + 2 + 12 * i)
+		entries[tag] = (kind, n, value)
+	return entries
+
+
+def _exif_date(tiff: bytes) -> Optional[str]:
+	"""DateTimeOriginal (or IFD0 DateTime) from a TIFF-structured EXIF block."""
+	if tiff[:2] == b"II":
+		order = "<"
+	elif tiff[:2] == b"MM":
+		order = ">"
+	else:
+		return None
+	(ifd0,) = struct.unpack_from(order + "I", tiff, 4)
+	tags = _exif_ifd(tiff, ifd0, order)
+
+	candidates = []
+	if _EXIF_IFD_POINTER in tags:
+		exif = _exif_ifd(tiff, tags[_EXIF_IFD_POINTER][2], order)
+		candidates.append(exif.get(_EXIF_DATETIME_ORIGINAL))
+	candidates.append(tags.get(_EXIF_DATETIME))
+
+	for entry in candidates:
+		# ASCII values longer than 4 bytes are stored at an offset
+		if entry and entry[0] == 2 and entry[1] > 4:
+			date = _format_content_date(_EXIF_DATE.match(tiff, entry[2], entry[2] + entry[1]))
+			if date:
+				return date
+	return None
+
+
+def _jpeg_date(head: bytes) -> Optional[str]:
+	"""Walk JPEG segments in head to the APP1 Exif block."""
+	if head[:2] != b"\xff\xd8":
+		return None
+	offset = 2
+	while offset + 4 <= len(head):
+		marker, length = struct.unpack_from(">HH", head, offset)
+		# Stop at start-of-scan or anything that isn't a marker
+		if marker & 0xFF00 != 0xFF00 or marker == 0xFFDA:
+			return None
+		if marker == 0xFFE1 and head[offset + 4:offset + 10] == b"Exif\x00\x00":
+			return _exif_date(head[offset + 10:offset + 2 + length])
+		offset += 2 + length
+	return None
+
+
+def read_content_date(path: str) -> Optional[str]:
+	"""
+	Read a creation date (YYMMDD) from PDF or JPEG metadata.
+
+	Only the first and last CONTENT_DATE_WINDOW bytes are mapped, so large
+	files cost at most two small reads. Returns None when no date is found
+	or the file can't be read.
+	"""
+	ext = os.path.splitext(path)[1].lower()
+	try:
+		with open(path, "rb") as f:
+			size = os.fstat(f.fileno()).st_size
+			if size == 0:
+				return None
+			with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+				head = mm[:CONTENT_DATE_WINDOW]
+				if ext == ".pdf":
+					return _pdf_date(head, mm[max(0, size - CONTENT_DATE_WINDOW):])
+				return _jpeg_date(head)
+	except (OSError, ValueError, struct.error):
+		return None
+
+
+def needs_content_date(path: str) -> bool:
+	"""True for PDFs and JPEGs whose filename carries no date."""
+	name = os.path.basename(path)
+	return os.path.splitext(name)[1].lower() in CONTENT_DATE_EXTENSIONS and extract_date(name)[0] is None
+
+
+def with_content_dates(paths, threads: int = CONTENT_DATE_THREADS):
+	"""
+	Yield (path, content_date) in input order.
+
+	Undated PDFs and JPEGs are read on a thread pool so their I/O overlaps;
+	up to CONTENT_DATE_QUEUE files are in flight. Results are cached in
+	CONTENT_DATE_CACHE by (st_dev, st_ino, st_mtime_ns). Cache access stays
+	on this thread.
+	"""
+	cache = CONTENT_DATE_CACHE
+	pending = deque()
+
+	def ready():
+		path, key, value = pending.popleft()
+		if key is None:
+			return path, value
+		date = value.result()
+		cache.put(key, date)
+		if PROFILE is not None:
+			PROFILE.count("contentDateReads")
+		return path, date
+
+	with ThreadPoolExecutor(max_workers=threads) as pool:
+		for path in paths:
+			if not needs_content_date(path):
+				pending.append((path, None, None))
+			else:
+				try:
+					st = os.stat(path)
+				except OSError:
+					pending.append((path, None, None))
+				else:
+					key = f"{st.st_dev}:{st.st_ino}:{st.st_mtime_ns}"
+					date = cache.get(key)
+					if date is AnalysisCache.MISSING:
+						pending.append((path, key, pool.submit(read_content_date, path)))
+					else:
+						pending.append((path, None, date))
+
+			while pending and (pending[0][1] is None or len(pending) >= CONTENT_DATE_QUEUE):
+				yield ready()
+
+		while pending:
+			yield ready()
+
+
+def analyze_file(filepath: Path, content_date: Optional[str] = None) -> Optional[dict]:
+	"""
+	Analyze a file and suggest a new name.
+
+	Results depend only on the filename (and content_date, a YYMMDD date
+	from file metadata used when the name has none), so they are memoized
+	in ANALYSIS_CACHE and the path is reattached per call.
+	"""
+	key = filepath.name if content_date is None else f"{filepath.name}\0{content_date}"
+	cached = ANALYSIS_CACHE.get(key)
+	if cached is AnalysisCache.MISSING:
+		cached = _analyze_name(filepath, content_date)
+		ANALYSIS_CACHE.put(key, cached)
+	elif PROFILE is not None:
+		# Memo hits skip _analyze_name; count them (and already formatted names) per file
+		PROFILE.count("analysisCacheHits")
+		if cached is None and is_already_formatted(ParsedStem(_split_name(filepath)[0])):
+			PROFILE.count("alreadyFormatted")
+	if cached is None:
+		return None
+	return {**cached, "path": str(filepath)}
+
+
+def _split_name(filepath: Path) -> tuple[str, str]:
+	"""Split a filename into (stem, extension), keeping compound extensions whole."""
+	ext = get_extension(filepath)
+	if ext and len(ext) > 1:
+		return filepath.name[:-len(ext)], ext
+	return filepath.stem, ext
+
+
+def _analyze_name(filepath: Path, content_date: Optional[str] = None) -> Optional[dict]:
+	"""Suggest a new name from the filename (and content_date), without the path."""
+	filename = filepath.name
+	stem, ext = _split_name(filepath)
+
+	profile = PROFILE
+	if profile is not None:
+		start = time.perf_counter()
+
+	# Tokenize the stem once for every extractor
+	parsed = ParsedStem(stem)
+
+	# Skip files already in correct format
+	if is_already_formatted(parsed):
+		if profile is not None:
+			profile.lap("extract", start)
+			profile.count("alreadyFormatted")
+		return None
+
+	# Extract components
+	source, source_confidence = extract_source(parsed)
+	date_str, date_format, date_confidence = extract_date(parsed)
+	title, title_confidence = extract_title(parsed, source, date_str)
+
+	# Fall back to the metadata date; it isn't in the name, so it counts
+	# for less than a date the user typed
+	if date_str is None and content_date:
+		date_str, date_format, date_confidence = content_date, "full", "medium"
+
+	if profile is not None:
+		start = profile.lap("extract", start)
+
+	# Build suggested name - omit unknown components
+	parts = []
 	if source:
 		parts.append(source)
 	if title:
@@ -468,6 +1829,9 @@ def analyze_file(filepath: Path) -> Optional[dict]:
 	# Determine if this is auto (trivial) or needs review
 	is_auto = is_trivial_change(filename, suggested, source, title, date_str)
 
+	if profile is not None:
+		profile.lap("is_trivial_change", start)
+
 	# Also consider high confidence components for auto
 	if not is_auto and date_confidence == "high" and (source_confidence == "high" or title_confidence == "high"):
 		is_auto = True
@@ -479,49 +1843,546 @@ def analyze_file(filepath: Path) -> Optional[dict]:
 		"source": source,  # None if unknown, not "Unknown"
 		"title": title if title else None,  # None if empty
 		"date": date_str,  # None if unknown
-		"path": str(filepath),
 	}
 
 
-def list_suggestions(directory: Path, recursive: bool = False, new_only: bool = False) -> dict:
-	"""List rename suggestions for files in directory."""
+def _init_worker() -> None:
+	"""Start each worker with empty profile counters instead of the parent's."""
+	if PROFILE is not None:
+		PROFILE.drain()
+
+
+def _analyze_batch(items: list[tuple[str, Optional[str]]]) -> tuple[list[Optional[dict]], int, int, Optional[dict]]:
+	"""
+	Analyze a batch of (path, content_date) in a worker process.
+
+	Returns the results plus cache hit/miss deltas and profile data, which
+	would otherwise stay in the worker.
+	"""
+	hits, misses = ANALYSIS_CACHE.hits, ANALYSIS_CACHE.misses
+	results = [analyze_file(Path(path), content_date) for path, content_date in items]
+	profile = PROFILE.drain() if PROFILE is not None else None
+	return results, ANALYSIS_CACHE.hits - hits, ANALYSIS_CACHE.misses - misses, profile
+
+
+def _batches(items, size: int):
+	"""Group an iterable into lists of at most size items."""
+	batch = []
+	for item in items:
+		batch.append(item)
+		if len(batch) == size:
+			yield batch
+			batch = []
+	if batch:
+		yield batch
+
+
+def analyze_parallel(items, jobs: int):
+	"""
+	Analyze (path, content_date) items on a process pool, yielding results in input order.
+
+	Items are sent in batches of ANALYSIS_BATCH_SIZE so workers are fed
+	while the caller is still walking the tree.
+	"""
+	with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker) as pool:
+		for results, hits, misses, profile in pool.map(_analyze_batch, _batches(items, ANALYSIS_BATCH_SIZE)):
+			# Fold worker counters into this process for --cache-stats/--profile
+			ANALYSIS_CACHE.hits += hits
+			ANALYSIS_CACHE.misses += misses
+			if profile is not None:
+				PROFILE.merge(profile)
+			yield from results
+
+
+def _sample_digest(path: str, size: int) -> Optional[bytes]:
+	"""Hash the first and last DUPLICATE_SAMPLE_BYTES of a file (all of it if small)."""
+	try:
+		with open(path, "rb") as f:
+			digest = hashlib.blake2b(f.read(DUPLICATE_SAMPLE_BYTES))
+			if size > 2 * DUPLICATE_SAMPLE_BYTES:
+				f.seek(size - DUPLICATE_SAMPLE_BYTES)
+			digest.update(f.read(DUPLICATE_SAMPLE_BYTES))
+	except OSError:
+		return None
+	if PROFILE is not None:
+		PROFILE.count("duplicateSampleReads")
+	return digest.digest()
+
+
+def _full_digest(path: str) -> Optional[bytes]:
+	"""Hash a whole file in DUPLICATE_CHUNK_BYTES chunks."""
+	digest = hashlib.blake2b()
+	try:
+		with open(path, "rb") as f:
+			while chunk := f.read(DUPLICATE_CHUNK_BYTES):
+				digest.update(chunk)
+	except OSError:
+		return None
+	if PROFILE is not None:
+		PROFILE.count("duplicateFullReads")
+	return digest.digest()
+
+
+def _collisions(paths: list[str], key) -> list[list[str]]:
+	"""Group paths by key(path), keeping groups of two or more; None keys are dropped."""
+	groups = {}
+	for path in paths:
+		value = key(path)
+		if value is not None:
+			groups.setdefault(value, []).append(path)
+	return [group for group in groups.values() if len(group) > 1]
+
+
+def find_duplicates(by_size: dict[int, list[str]]) -> list[dict]:
+	"""
+	Find groups of files with identical content.
+
+	by_size maps file size to paths (one path per inode, so hard links
+	aren't reported). Files of a unique size are never opened; same-size
+	files are compared by a hash of their first and last
+	DUPLICATE_SAMPLE_BYTES, which covers small files entirely, and only
+	larger files that still collide are hashed in full. Empty files are
+	ignored. Groups are ordered by reclaimable bytes, largest first.
+	"""
+	groups = []
+	for size, paths in by_size.items():
+		if size == 0 or len(paths) < 2:
+			continue
+		for candidates in _collisions(paths, lambda path: _sample_digest(path, size)):
+			if size > 2 * DUPLICATE_SAMPLE_BYTES:
+				matches = _collisions(candidates, _full_digest)
+			else:
+				matches = [candidates]
+			for group in matches:
+				groups.append({"size": size, "paths": group})
+
+	groups.sort(key=lambda g: g["size"] * (len(g["paths"]) - 1), reverse=True)
+	return groups
+
+
+def iter_suggestions(
+	directory: Path,
+	recursive: bool = False,
+	new_only: bool = False,
+	jobs: int = 1,
+	counts: Optional[dict] = None,
+	use_dir_cache: bool = True,
+	duplicates: bool = False,
+):
+	"""
+	Yield rename suggestions as files are analyzed.
+
+	Once the generator is exhausted, counts (if given) holds the
+	alreadyProcessed, newFiles and totalFiles counters, plus the
+	duplicates groups when duplicates is set. Recursive new_only runs skip
+	settled directories via DIR_CACHE_FILE unless use_dir_cache is False
+	or duplicates is set (every file must be seen to be compared); their
+	files count as already processed.
+	"""
+	profile = PROFILE
+	if profile is not None:
+		start = time.perf_counter()
+
 	history = load_history() if new_only else {"files": {}}
+	index = history_index(history) if new_only else set()
+
+	if profile is not None:
+		profile.lap("load_history", start)
 
-	auto = []
-	needs_review = []
 	already_processed = 0
 	total_files = 0
 
-	if recursive:
-		files = directory.rglob("*")
+	# Resolve the root once; paths below it need no per-file resolve()
+	root = str(directory)
+	real_root = os.path.realpath(root)
+
+	dir_cache = DirectoryCache(DIR_CACHE_FILE, root) if recursive and new_only and use_dir_cache and not duplicates else None
+
+	# Visible files by size for the duplicate pass, one path per inode
+	by_size = {}
+	inodes = set()
+
+	def new_paths():
+		nonlocal already_processed, total_files
+		walker = walk_files(root, recursive, dir_cache)
+		if profile is not None:
+			walker = _timed(walker, "walk")
+
+		for path, st in walker:
+			if profile is not None:
+				profile.count("filesSeen")
+			if not os.path.basename(path).startswith("."):
+				total_files += 1
+
+				if duplicates and (st.st_dev, st.st_ino) not in inodes:
+					inodes.add((st.st_dev, st.st_ino))
+					# Spelled like the suggestions' "path" (str(Path(...))) so the two can be joined
+					by_size.setdefault(st.st_size, []).append(str(Path(path)))
+
+				# Skip if in history
+				if new_only:
+					if profile is not None:
+						start = time.perf_counter()
+					processed = is_stat_in_history(real_root + path[len(root):], st, history, index)
+					if profile is not None:
+						profile.lap("history_check", start)
+					if processed:
+						already_processed += 1
+						if profile is not None:
+							profile.count("historyHits")
+						continue
+					if dir_cache is not None:
+						dir_cache.mark_unsettled(os.path.dirname(path))
+
+				yield path
+			elif profile is not None:
+				profile.count("hidden")
+
+	if CONTENT_DATE_CACHE is not None:
+		items = with_content_dates(new_paths())
 	else:
-		files = directory.glob("*")
+		items = ((path, None) for path in new_paths())
 
-	for filepath in files:
-		if filepath.is_file() and not filepath.name.startswith("."):
-			total_files += 1
+	if jobs > 1:
+		results = analyze_parallel(items, jobs)
+	else:
+		results = (analyze_file(Path(path), content_date) for path, content_date in items)
+
+	for result in results:
+		if result:
+			if profile is not None:
+				profile.count("auto" if result["classification"] == "auto" else "needsReview")
+			yield result
+
+	if dir_cache is not None:
+		# Settled directories contribute their stored counts
+		total_files += dir_cache.reused_files
+		already_processed += dir_cache.reused_files
+		if profile is not None:
+			profile.count("dirsSkipped", dir_cache.skipped_dirs)
+		try:
+			dir_cache.save()
+		except OSError:
+			pass
 
-			# Skip if in history
-			if new_only and is_in_history(filepath, history):
-				already_processed += 1
-				continue
+	if counts is not None:
+		counts.update({
+			"alreadyProcessed": already_processed,
+			"newFiles": total_files - already_processed,
+			"totalFiles": total_files,
+		})
+
+	if duplicates:
+		if profile is not None:
+			start = time.perf_counter()
+		groups = find_duplicates(by_size)
+		if profile is not None:
+			profile.lap("duplicates", start)
+		if counts is not None:
+			counts["duplicates"] = groups
+
+
+def list_suggestions(
+	directory: Path,
+	recursive: bool = False,
+	new_only: bool = False,
+	jobs: int = 1,
+	use_dir_cache: bool = True,
+	duplicates: bool = False,
+) -> dict:
+	"""List rename suggestions for files in directory."""
+	auto = []
+	needs_review = []
+	counts = {}
 
-			result = analyze_file(filepath)
-			if result:
-				if result["classification"] == "auto":
-					auto.append(result)
-				else:
-					needs_review.append(result)
+	for result in iter_suggestions(directory, recursive, new_only, jobs, counts, use_dir_cache, duplicates):
+		if result["classification"] == "auto":
+			auto.append(result)
+		else:
+			needs_review.append(result)
 
 	return {
 		"auto": auto,
 		"needsReview": needs_review,
-		"alreadyProcessed": already_processed,
-		"newFiles": total_files - already_processed,
-		"totalFiles": total_files,
+		**counts,
 	}
 
 
+def plan_renames(suggestions: list[dict], force: bool = False) -> tuple[list[tuple[str, str, Optional[dict]]], list[tuple[str, dict]]]:
+	"""
+	Plan a batch of renames up front.
+
+	Builds a target index to reject duplicate targets and targets that exist
+	outside the batch (unless force), then orders moves so every target is
+	free when its move runs. Each src has one dst and each dst one src, so
+	the moves form disjoint chains and cycles: chains run tail first, and
+	each cycle is broken by parking one file under a temporary name.
+
+	Returns:
+		(steps, rejected)
+		steps: [(src, dst, item)], item is None for temporary moves
+		rejected: [(kind, record)] for suggestions that will not be applied
+	"""
+	moves = {}
+	by_target = {}
+	rejected = []
+
+	for item in suggestions:
+		src = item["path"]
+		dst = os.path.join(os.path.dirname(src), item["suggested"])
+		if src in moves or dst in by_target:
+			rejected.append(("skipped", {"file": item["original"], "reason": "duplicate target"}))
+			continue
+		moves[src] = (dst, item)
+		by_target[dst] = src
+
+	# Targets occupied by files outside the batch; dropping one move can
+	# block the move into its source, so repeat until stable
+	changed = True
+	while changed and not force:
+		changed = False
+		for src, (dst, item) in list(moves.items()):
+			if dst in moves or not os.path.lexists(dst) or _same_file(src, dst):
+				continue
+			rejected.append(("skipped", {"file": item["original"], "reason": "target exists"}))
+			del moves[src]
+			del by_target[dst]
+			changed = True
+
+	steps = []
+	done = set()
+
+	def unwind(src: str) -> None:
+		# Walk back along the chain ending at src's target
+		while src is not None and src not in done:
+			dst, item = moves[src]
+			steps.append((src, dst, item))
+			done.add(src)
+			src = by_target.get(src)
+
+	# Chains: start from moves whose target is not itself being moved
+	for src, (dst, _) in moves.items():
+		if dst not in moves:
+			unwind(src)
+
+	# Whatever is left forms cycles
+	for start in moves:
+		if start in done:
+			continue
+		dst, item = moves[start]
+		temp = os.path.join(os.path.dirname(start), f".{os.path.basename(start)}.rename-{os.getpid()}-{len(steps)}")
+		steps.append((start, temp, None))
+		done.add(start)
+		unwind(by_target[start])
+		steps.append((temp, dst, item))
+
+	return steps, rejected
+
+
+def _same_file(src: str, dst: str) -> bool:
+	"""True when dst is src itself (case-only rename on a case-insensitive filesystem)."""
+	try:
+		return os.path.samefile(src, dst)
+	except OSError:
+		return False
+
+
+def _load_renameat2():
+	"""Return libc renameat2 if the platform has it, else None."""
+	try:
+		libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+		renameat2 = libc.renameat2
+	except (OSError, AttributeError):
+		return None
+	renameat2.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_char_p, ctypes.c_uint]
+	return renameat2
+
+
+_RENAMEAT2 = _load_renameat2()
+_AT_FDCWD = -100
+_RENAME_NOREPLACE = 1
+
+
+def rename_noreplace(src: str, dst: str) -> None:
+	"""
+	Rename src to dst, failing with FileExistsError if dst exists.
+
+	Uses renameat2(RENAME_NOREPLACE) where available so the check is atomic.
+	"""
+	if _RENAMEAT2 is not None:
+		if _RENAMEAT2(_AT_FDCWD, os.fsencode(src), _AT_FDCWD, os.fsencode(dst), _RENAME_NOREPLACE) == 0:
+			return
+		err = ctypes.get_errno()
+		if err == errno.EEXIST:
+			raise FileExistsError(err, os.strerror(err), dst)
+		# Fall back when the filesystem or kernel lacks RENAME_NOREPLACE
+		if err not in (errno.EINVAL, errno.ENOSYS):
+			raise OSError(err, os.strerror(err), src)
+
+	if os.path.lexists(dst) and not _same_file(src, dst):
+		raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), dst)
+	os.rename(src, dst)
+
+
+def _write_rename_journal(steps: list[tuple[str, str, Optional[dict]]]) -> tuple:
+	"""
+	Durably record a batch's moves before applying them.
+
+	Each batch gets its own journal file, so concurrent runs (or a run next
+	to --watch) never overwrite each other's. Returns (file, path); the file
+	holds an exclusive flock until the batch closes it, which tells
+	--rollback the batch is still running.
+	"""
+	RENAME_JOURNAL_DIR.mkdir(parents=True, exist_ok=True)
+	fd, tmp = tempfile.mkstemp(prefix=RENAME_JOURNAL_PREFIX + ".", suffix=".json.tmp", dir=RENAME_JOURNAL_DIR)
+	os.close(fd)
+	f = open(tmp, "w")
+	fcntl.flock(f, fcntl.LOCK_EX)
+	json.dump({
+		"startedAt": datetime.now().isoformat(),
+		"steps": [[src, dst] for src, dst, _ in steps],
+	}, f)
+	f.flush()
+	os.fsync(f.fileno())
+	# Only complete, locked journals appear under the name --rollback looks for
+	path = tmp[:-len(".tmp")]
+	os.rename(tmp, path)
+	return f, path
+
+
+def _finish_rename_journal(journal: tuple) -> None:
+	"""Remove a batch's journal, then release its lock."""
+	f, path = journal
+	try:
+		os.unlink(path)
+	except OSError:
+		pass
+	f.close()
+
+
+def rollback_renames() -> dict:
+	"""
+	Undo the moves of interrupted batches, newest first.
+
+	Only journals nobody holds a lock on are rolled back; batches still
+	running in another process are reported under "active".
+	"""
+	results = {"restored": [], "errors": [], "active": []}
+	journals = []
+	for path in RENAME_JOURNAL_DIR.glob(RENAME_JOURNAL_PREFIX + "*.json"):
+		try:
+			f = open(path)
+		except OSError:
+			continue
+		try:
+			fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+		except OSError:
+			f.close()
+			results["active"].append(str(path))
+			continue
+		try:
+			journal = json.load(f)
+		except ValueError:
+			# Torn before any move was made
+			journal = {}
+		journals.append((journal.get("startedAt") or "", str(path), journal.get("steps", []), f))
+
+	for _, path, steps, f in sorted(journals, reverse=True):
+		for src, dst in reversed(steps):
+			if os.path.lexists(dst) and not os.path.lexists(src):
+				try:
+					rename_noreplace(dst, src)
+					results["restored"].append({"from": dst, "to": src})
+				except OSError as e:
+					results["errors"].append({"file": dst, "error": str(e)})
+		_finish_rename_journal((f, path))
+
+	return results
+
+
+def rename_batch(
+	suggestions: list[dict],
+	dry_run: bool = False,
+	force: bool = False,
+	history_entries: Optional[list] = None,
+):
+	"""
+	Plan and apply one batch of renames, yielding (kind, record) per suggestion.
+
+	kind is 'renamed', 'skipped' or 'errors'. Moves never overwrite a file
+	unless force is set and the target lies outside the batch. The batch
+	writes one rollback journal and one history commit; if history_entries
+	is given, records are collected there for the caller to flush instead.
+	"""
+	steps, rejected = plan_renames(suggestions, force)
+	yield from rejected
+
+	if dry_run:
+		for _, _, item in steps:
+			if item:
+				yield "renamed", {"from": item["original"], "to": item["suggested"], "dry_run": True}
+		return
+
+	if not steps:
+		return
+
+	flush = history_entries is None
+	if flush:
+		history_entries = []
+
+	journal = _write_rename_journal(steps)
+	batch_sources = {src for src, _, _ in steps}
+	parked = {}
+
+	try:
+		for src, dst, item in steps:
+			try:
+				if force and dst not in batch_sources and not _same_file(src, dst):
+					# --force may replace files outside the batch
+					os.replace(src, dst)
+				else:
+					rename_noreplace(src, dst)
+			except OSError as e:
+				if item is None:
+					# Could not park a cycle member; its dependents will fail no-clobber
+					continue
+				if src in parked:
+					# Try to return the parked file to where it started
+					try:
+						rename_noreplace(src, parked.pop(src))
+					except OSError:
+						pass
+				yield "errors", {"file": item["original"], "error": str(e)}
+				continue
+
+			if item is None:
+				parked[dst] = src
+				continue
+			parked.pop(src, None)
+
+			# Record in history
+			history_entries.append(make_history_entry(dst, "renamed", item["suggested"]))
+			yield "renamed", {"from": item["original"], "to": item["suggested"]}
+	finally:
+		if flush:
+			append_history(history_entries)
+		_finish_rename_journal(journal)
+
+
+def iter_renames(
+	suggestions,
+	dry_run: bool = False,
+	force: bool = False,
+	history_entries: Optional[list] = None,
+):
+	"""
+	Rename suggestions in planned batches of RENAME_BATCH_SIZE, yielding
+	(kind, record) as each batch is applied.
+	"""
+	for batch in _batches(suggestions, RENAME_BATCH_SIZE):
+		yield from rename_batch(batch, dry_run, force, history_entries)
+
+
 def execute_renames(
 	suggestions: list[dict],
 	dry_run: bool = False,
@@ -534,41 +2395,263 @@ def execute_renames(
 		"errors": [],
 	}
 
-	for item in suggestions:
-		src = Path(item["path"])
-		dst = src.parent / item["suggested"]
-
-		if dst.exists() and not force:
-			results["skipped"].append({
-				"file": item["original"],
-				"reason": "target exists",
-			})
-			continue
-
-		if dry_run:
-			results["renamed"].append({
-				"from": item["original"],
-				"to": item["suggested"],
-				"dry_run": True,
-			})
-		else:
-			try:
-				src.rename(dst)
-				# Record in history
-				record_action(str(dst), "renamed", item["suggested"])
-				results["renamed"].append({
-					"from": item["original"],
-					"to": item["suggested"],
-				})
-			except Exception as e:
-				results["errors"].append({
-					"file": item["original"],
-					"error": str(e),
-				})
+	for kind, record in iter_renames(suggestions, dry_run, force):
+		results[kind].append(record)
 
 	return results
 
 
+def write_ndjson(record: dict) -> None:
+	"""Write one NDJSON record and flush so consumers see it immediately."""
+	if PROFILE is not None:
+		start = time.perf_counter()
+		line = json.dumps(record)
+		PROFILE.lap("serialize", start)
+	else:
+		line = json.dumps(record)
+	sys.stdout.write(line + "\n")
+	sys.stdout.flush()
+
+
+def stream_ndjson(
+	directory: Path,
+	recursive: bool,
+	new_only: bool,
+	jobs: int,
+	rename: bool,
+	dry_run: bool = False,
+	force: bool = False,
+	use_dir_cache: bool = True,
+	duplicates: bool = False,
+) -> None:
+	"""
+	Stream suggestions (or rename results) as NDJSON, one per line.
+
+	Each record has a "type": 'suggestion', or 'renamed'/'skipped'/'error'
+	when renaming. A final 'summary' record carries the counters (and
+	duplicate groups).
+	"""
+	counts = {}
+	suggestions = iter_suggestions(directory, recursive, new_only, jobs, counts, use_dir_cache, duplicates)
+
+	if rename:
+		kinds = {"renamed": "renamed", "skipped": "skipped", "errors": "error"}
+		for kind, record in iter_renames(suggestions, dry_run, force):
+			write_ndjson({"type": kinds[kind], **record})
+	else:
+		for suggestion in suggestions:
+			write_ndjson({"type": "suggestion", **suggestion})
+
+	write_ndjson({"type": "summary", **counts})
+
+
+class Inotify:
+	"""Minimal ctypes wrapper around Linux inotify."""
+
+	IN_CLOSE_WRITE = 0x00000008
+	IN_MOVED_TO = 0x00000080
+	IN_IGNORED = 0x00008000
+	IN_ISDIR = 0x40000000
+	IN_NONBLOCK = 0o4000
+	IN_CLOEXEC = 0o2000000
+
+	_EVENT = struct.Struct("iIII")
+
+	def __init__(self):
+		libc_name = ctypes.util.find_library("c")
+		self._libc = ctypes.CDLL(libc_name, use_errno=True)
+		if not hasattr(self._libc, "inotify_init1"):
+			raise OSError("inotify is not available on this platform")
+		self.fd = self._libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+		if self.fd < 0:
+			err = ctypes.get_errno()
+			raise OSError(err, os.strerror(err))
+
+	def add_watch(self, path: str, mask: int) -> int:
+		"""Watch path for the events in mask."""
+		wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+		if wd < 0:
+			err = ctypes.get_errno()
+			raise OSError(err, os.strerror(err), path)
+		return wd
+
+	def read_events(self) -> list[tuple[int, int, str]]:
+		"""Return pending (wd, mask, name) events without blocking."""
+		try:
+			data = os.read(self.fd, 64 * 1024)
+		except BlockingIOError:
+			return []
+
+		events = []
+		offset = 0
+		while offset < len(data):
+			wd, mask, _, length = self._EVENT.unpack_from(data, offset)
+			offset += self._EVENT.size
+			name = data[offset:offset + length].rstrip(b"\0")
+			offset += length
+			events.append((wd, mask, os.fsdecode(name)))
+		return events
+
+	def close(self) -> None:
+		"""Release the inotify descriptor."""
+		os.close(self.fd)
+
+
+def watch_directory(
+	directory: Path,
+	dry_run: bool = False,
+	force: bool = False,
+	duration: Optional[float] = None,
+	emit=None,
+) -> None:
+	"""
+	Watch directory and handle files as they arrive.
+
+	Files are picked up on IN_CLOSE_WRITE or IN_MOVED_TO once no further
+	event has been seen for WATCH_DEBOUNCE_SECONDS. Partial downloads
+	(PARTIAL_SUFFIXES) are ignored until they are renamed to their final
+	name. Auto suggestions are renamed; needs-review suggestions are
+	appended to REVIEW_QUEUE_FILE. History stays in memory and is flushed
+	every WATCH_FLUSH_SECONDS and on exit. Runs until interrupted, or for
+	duration seconds if given.
+	"""
+	emit = emit or write_ndjson
+	history = load_history()
+	queued = set()
+	pending = {}
+	history_entries = []
+
+	root = str(directory)
+	real_root = os.path.realpath(root)
+
+	inotify = Inotify()
+	inotify.add_watch(root, Inotify.IN_CLOSE_WRITE | Inotify.IN_MOVED_TO)
+
+	start = time.monotonic()
+	last_flush = start
+
+	def handle(name: str) -> None:
+		path = os.path.join(root, name)
+		try:
+			st = os.stat(path)
+		except OSError:
+			return
+		if not stat.S_ISREG(st.st_mode):
+			return
+
+		key = (st.st_dev, st.st_ino, st.st_mtime_ns)
+		# Fetched per file: overwriting a history path drops the table's index until it is rebuilt
+		index = history_index(history)
+		if key in queued or is_stat_in_history(os.path.join(real_root, name), st, history, index):
+			return
+
+		content_date = None
+		if CONTENT_DATE_CACHE is not None:
+			[(_, content_date)] = with_content_dates([path], threads=1)
+		result = analyze_file(Path(path), content_date)
+		if not result:
+			return
+
+		if result["classification"] != "auto":
+			queued.add(key)
+			REVIEW_QUEUE_FILE.parent.mkdir(parents=True, exist_ok=True)
+			with open(REVIEW_QUEUE_FILE, "a") as f:
+				f.write(json.dumps(result) + "\n")
+			emit({"type": "queued", **result})
+			return
+
+		before = len(history_entries)
+		kinds = {"renamed": "renamed", "skipped": "skipped", "errors": "error"}
+		for kind, record in iter_renames([result], dry_run, force, history_entries):
+			emit({"type": kinds[kind], **record})
+
+		# Keep the resident history (and so its inode index) current so the renamed file is not revisited
+		for resolved, entry in history_entries[before:]:
+			history["files"][resolved] = entry
+
+	try:
+		while True:
+			now = time.monotonic()
+			if duration is not None and now - start >= duration:
+				break
+
+			deadlines = [last_flush + WATCH_FLUSH_SECONDS]
+			if pending:
+				deadlines.append(min(pending.values()))
+			if duration is not None:
+				deadlines.append(start + duration)
+			timeout = max(0.0, min(deadlines) - now)
+
+			readable, _, _ = select.select([inotify.fd], [], [], timeout)
+			if readable:
+				for _, mask, name in inotify.read_events():
+					if mask & Inotify.IN_IGNORED:
+						# Watched directory was removed
+						return
+					if mask & Inotify.IN_ISDIR or not name or name.startswith("."):
+						continue
+					if name.lower().endswith(PARTIAL_SUFFIXES):
+						continue
+					pending[name] = time.monotonic() + WATCH_DEBOUNCE_SECONDS
+
+			now = time.monotonic()
+			for name in [n for n, deadline in pending.items() if deadline <= now]:
+				del pending[name]
+				handle(name)
+
+			if now - last_flush >= WATCH_FLUSH_SECONDS:
+				append_history(history_entries)
+				history_entries.clear()
+				last_flush = now
+	except KeyboardInterrupt:
+		pass
+	finally:
+		append_history(history_entries)
+		inotify.close()
+
+
+def benchmark_dates(directory: Path, recursive: bool = False, rounds: int = 5) -> dict:
+	"""Time extract_date over every filename in directory."""
+	files = directory.rglob("*") if recursive else directory.glob("*")
+	names = [f.name for f in files if not f.name.startswith(".")]
+
+	start = time.perf_counter()
+	for _ in range(rounds):
+		for name in names:
+			extract_date(name)
+	elapsed = time.perf_counter() - start
+
+	parsed = len(names) * rounds
+	return {
+		"files": len(names),
+		"rounds": rounds,
+		"seconds": round(elapsed, 6),
+		"filesPerSecond": round(parsed / elapsed) if elapsed > 0 else None,
+	}
+
+
+def benchmark_scaling(directory: Path, recursive: bool = False, max_jobs: int = 16) -> list[dict]:
+	"""Time list_suggestions with 1, 2, 4, ... max_jobs workers."""
+	rows = []
+	baseline = None
+	jobs = 1
+	while jobs <= max_jobs:
+		# Measure cold analysis, not memo hits from the previous round
+		ANALYSIS_CACHE.clear()
+		start = time.perf_counter()
+		result = list_suggestions(directory, recursive, jobs=jobs)
+		elapsed = time.perf_counter() - start
+		baseline = baseline or elapsed
+		rows.append({
+			"jobs": jobs,
+			"seconds": round(elapsed, 6),
+			"filesPerSecond": round(result["totalFiles"] / elapsed) if elapsed > 0 else None,
+			"speedup": round(baseline / elapsed, 2) if elapsed > 0 else None,
+		})
+		jobs *= 2
+	return rows
+
+
 def main():
 	"""Main entry point."""
 	parser = argparse.ArgumentParser(
@@ -610,6 +2693,11 @@ def main():
 		action="store_true",
 		help="Skip files already in history",
 	)
+	parser.add_argument(
+		"--full-scan",
+		action="store_true",
+		help="With --recursive --new-only, list every directory instead of skipping settled ones",
+	)
 	parser.add_argument(
 		"--record-skip",
 		metavar="FILE",
@@ -621,6 +2709,82 @@ def main():
 		metavar=("OLD", "NEW"),
 		help="Record a rename in history",
 	)
+	parser.add_argument(
+		"--watch",
+		action="store_true",
+		help="Watch directory (Linux inotify) and handle new files as they arrive",
+	)
+	parser.add_argument(
+		"--ndjson",
+		action="store_true",
+		help="Stream --list/--rename output as one JSON record per line",
+	)
+	parser.add_argument(
+		"--jobs",
+		type=int,
+		default=1,
+		metavar="N",
+		help="Analyze files on N worker processes (0 = all CPUs)",
+	)
+	parser.add_argument(
+		"--duplicates",
+		action="store_true",
+		help="Report groups of identical files (size, then sampled and full hashes)",
+	)
+	parser.add_argument(
+		"--content-dates",
+		action="store_true",
+		help="Date undated PDFs and JPEGs from their metadata (PDF CreationDate, EXIF DateTimeOriginal)",
+	)
+	parser.add_argument(
+		"--cache-stats",
+		action="store_true",
+		help="Print analysis cache hit/miss counters to stderr",
+	)
+	parser.add_argument(
+		"--persist-cache",
+		action="store_true",
+		help="Load and save the analysis cache between runs",
+	)
+	parser.add_argument(
+		"--profile",
+		action="store_true",
+		help="Print a per-stage timing and counter breakdown to stderr as JSON",
+	)
+	parser.add_argument(
+		"--profile-dump",
+		metavar="FILE",
+		help="Also write cProfile stats to FILE (readable with pstats)",
+	)
+	parser.add_argument(
+		"--benchmark",
+		action="store_true",
+		help="Report date parsing throughput (filenames/sec); with --jobs N, also worker scaling up to N",
+	)
+	parser.add_argument(
+		"--rollback",
+		action="store_true",
+		help="Undo the moves of an interrupted rename batch",
+	)
+	parser.add_argument(
+		"--compact-history",
+		action="store_true",
+		help="Fold the journal into the history file and evict stale entries and those whose file is gone",
+	)
+	parser.add_argument(
+		"--max-age-days",
+		type=float,
+		default=HISTORY_MAX_AGE_DAYS,
+		metavar="DAYS",
+		help=f"With --compact-history, evict entries processed more than DAYS ago (0 = keep all; default {HISTORY_MAX_AGE_DAYS})",
+	)
+	parser.add_argument(
+		"--max-entries",
+		type=int,
+		default=HISTORY_MAX_ENTRIES,
+		metavar="N",
+		help=f"With --compact-history, keep at most the N most recently processed entries (0 = no limit; default {HISTORY_MAX_ENTRIES})",
+	)
 	parser.add_argument(
 		"--clear-history",
 		action="store_true",
@@ -631,11 +2795,21 @@ def main():
 
 	# Handle history management commands
 	if args.clear_history:
-		if HISTORY_FILE.exists():
-			HISTORY_FILE.unlink()
+		for path in (HISTORY_FILE, HISTORY_JOURNAL, DIR_CACHE_FILE):
+			if path.exists():
+				path.unlink()
 		print(json.dumps({"status": "history cleared"}))
 		return
 
+	if args.compact_history:
+		report = compact_history(args.max_age_days or None, args.max_entries or None)
+		print(json.dumps({"status": "compacted", **report}, indent=2))
+		return
+
+	if args.rollback:
+		print(json.dumps(rollback_renames(), indent=2))
+		return
+
 	if args.record_skip:
 		record_action(args.record_skip, "skipped")
 		print(json.dumps({"status": "recorded", "action": "skipped", "file": args.record_skip}))
@@ -652,19 +2826,99 @@ def main():
 		print(json.dumps({"error": f"Not a directory: {directory}"}))
 		sys.exit(1)
 
-	result = list_suggestions(directory, args.recursive, args.new_only)
+	jobs = args.jobs if args.jobs > 0 else os.cpu_count() or 1
+
+	global PROFILE
+	if args.profile or args.profile_dump:
+		PROFILE = Profiler()
+	profiler = cProfile.Profile() if args.profile_dump else None
+	started = time.perf_counter()
+
+	if args.persist_cache or args.content_dates:
+		version = analysis_version()
+	if args.persist_cache:
+		ANALYSIS_CACHE.load(ANALYSIS_CACHE_FILE, version)
+
+	global CONTENT_DATE_CACHE
+	if args.content_dates:
+		CONTENT_DATE_CACHE = AnalysisCache(CONTENT_DATE_CACHE_SIZE)
+		CONTENT_DATE_CACHE.load(CONTENT_DATE_CACHE_FILE, version)
+
+	try:
+		if profiler is not None:
+			profiler.runcall(run, args, directory, jobs)
+		else:
+			run(args, directory, jobs)
+	finally:
+		if args.persist_cache:
+			ANALYSIS_CACHE.save(ANALYSIS_CACHE_FILE, version)
+		if CONTENT_DATE_CACHE is not None:
+			CONTENT_DATE_CACHE.save(CONTENT_DATE_CACHE_FILE, version)
+		if args.cache_stats:
+			print(json.dumps({"cacheStats": ANALYSIS_CACHE.stats()}), file=sys.stderr)
+		if PROFILE is not None:
+			print(json.dumps({"profile": PROFILE.report(time.perf_counter() - started)}), file=sys.stderr)
+		if profiler is not None:
+			profiler.dump_stats(args.profile_dump)
+
+
+def to_json(data) -> str:
+	"""Pretty-print data as JSON, timed under 'serialize' when profiling."""
+	if PROFILE is None:
+		return json.dumps(data, indent=2)
+	start = time.perf_counter()
+	text = json.dumps(data, indent=2)
+	PROFILE.lap("serialize", start)
+	return text
+
+
+def run(args: argparse.Namespace, directory: Path, jobs: int) -> None:
+	"""Run the selected directory command."""
+	if args.watch:
+		try:
+			watch_directory(directory, dry_run=args.dry_run, force=args.force)
+		except OSError as e:
+			print(json.dumps({"error": f"Cannot watch {directory}: {e}"}))
+			sys.exit(1)
+		return
+
+	if args.benchmark:
+		report = benchmark_dates(directory, args.recursive)
+		if jobs > 1:
+			report["scaling"] = benchmark_scaling(directory, args.recursive, jobs)
+		print(json.dumps(report, indent=2))
+		return
+
+	if args.ndjson and (args.list or args.rename):
+		stream_ndjson(
+			directory,
+			args.recursive,
+			args.new_only,
+			jobs,
+			rename=args.rename,
+			dry_run=args.dry_run,
+			force=args.force,
+			use_dir_cache=not args.full_scan,
+			duplicates=args.duplicates,
+		)
+		return
+
+	result = list_suggestions(directory, args.recursive, args.new_only, jobs, not args.full_scan, args.duplicates)
 
 	if args.list:
-		print(json.dumps(result, indent=2))
+		print(to_json(result))
 	elif args.rename:
 		# Combine auto and needs_review for rename
 		all_suggestions = result["auto"] + result["needsReview"]
+		start = time.perf_counter()
 		rename_results = execute_renames(
 			all_suggestions,
 			dry_run=args.dry_run,
 			force=args.force,
 		)
-		print(json.dumps(rename_results, indent=2))
+		if PROFILE is not None:
+			PROFILE.lap("rename", start)
+		print(to_json(rename_results))
 	else:
 		# Default: show suggestions as table-like output
 		all_suggestions = result["auto"] + result["needsReview"]
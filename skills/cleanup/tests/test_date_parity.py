@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Differential test: the date grammar and title stripping in rename-files.py give
+exactly the results of the original per-pattern regex path.
+
+Usage:
+    python3 -m unittest discover skills/cleanup/tests
+"""
+
+import importlib.util
+import random
+import re
+import sys
+import unittest
+from pathlib import Path
+from typing import Optional
+
+
+SCRIPT = Path(__file__).resolve().parent.parent / "scripts" / "rename-files.py"
+
+# Generated names per run; fixed seed so failures reproduce
+CORPUS_SIZE = 20_000
+CORPUS_SEED = 1
+
+# Fragments joined into names: several dates per name, dates run together or
+# split by delimiters, month words that only start like a month, sources
+FRAGMENTS = [
+	"2024-03-15", "2024/3/5", "15-03-2024", "31/12/2020", "13-13-2020", "20240315", "20241340",
+	"240315", "2024", "1999", "2099", "1890", "Q1 2024", "q3-2023", "2024 Q2", "Q4_2023",
+	"aug 2024", "2024-January", "jun-2022", "2021december", "jan2023", "2023jan", "march", "may",
+	"sept", "mayday", "octane", "decor", "summary", "report", "invoice", "notes", "final", "v2",
+	"(1)", "12", "3", "BCG", "NASA", "msft", "JohnSmith", "john_smith", "Scan", "IMG",
+]
+DELIMITERS = ["-", "_", " ", "", "-_-", "__", " - ", "."]
+EXTENSIONS = [".pdf", ".docx", ".tar.gz", ""]
+
+# Names that once diverged
+REGRESSIONS = [
+	"aug 2024-03-15 1999",
+	"2099 2024-03-15 may.pdf",
+	"JohnSmith-_-2024-20240315-mar-report",
+	"KPMG summary 2020.pdf",
+	"DSC-9622-aug-2007.pdf",
+	"2024-Q1_2024-Q1_Q4_2023",
+	"resume1999jan2023msftv2",
+]
+
+
+def load_rename_files():
+	"""Import rename-files.py (hyphenated, so not importable by name)."""
+	spec = importlib.util.spec_from_file_location("rename_files", SCRIPT)
+	module = importlib.util.module_from_spec(spec)
+	sys.modules[spec.name] = module
+	spec.loader.exec_module(module)
+	return module
+
+
+def reference_date(filename: str, months: dict) -> tuple[Optional[str], str, str]:
+	"""The original extract_date: one re.search per rule, in order."""
+	name = Path(filename).stem
+
+	match = re.search(r"(\d{4})[-/](\d{1,2})[-/](\d{1,2})", name)
+	if match:
+		year, month, day = match.groups()
+		return f"{year[2:]}{month.zfill(2)}{day.zfill(2)}", "full", "high"
+
+	match = re.search(r"(\d{1,2})[-/](\d{1,2})[-/](\d{4})", name)
+	if match:
+		day, month, year = match.groups()
+		if int(month) <= 12 and int(day) <= 31:
+			return f"{year[2:]}{month.zfill(2)}{day.zfill(2)}", "full", "medium"
+
+	match = re.search(r"(?<!\d)(\d{4})(\d{2})(\d{2})(?!\d)", name)
+	if match:
+		year, month, day = match.groups()
+		if int(month) <= 12 and int(day) <= 31:
+			return f"{year[2:]}{month}{day}", "full", "high"
+
+	match = re.search(r"Q([1-4])[\s\-_]*(\d{4})|(\d{4})[\s\-_]*Q([1-4])", name, re.I)
+	if match:
+		if match.group(1):
+			quarter, year = match.group(1), match.group(2)
+		else:
+			year, quarter = match.group(3), match.group(4)
+		return f"{year}-Q{quarter}", "quarter", "high"
+
+	for month_str, month_name in months.items():
+		pattern = rf"(?<![a-z]){month_str}[\s\-_]*(\d{{4}})|(\d{{4}})[\s\-_]*{month_str}(?![a-z])"
+		match = re.search(pattern, name, re.I)
+		if match:
+			year = match.group(1) or match.group(2)
+			return f"{year}-{month_name}", "month", "high"
+
+	match = re.search(r"(?<!\d)(19\d{2}|20\d{2})(?!\d)", name)
+	if match:
+		return match.group(1), "year", "medium"
+
+	return None, "none", "low"
+
+
+def reference_title(filename: str, source: Optional[str], to_pascal_case) -> tuple[str, str]:
+	"""The original extract_title: eight date regexes substituted in order."""
+	name = Path(filename).stem
+
+	if source:
+		name = re.sub(rf"^{re.escape(source)}[\s\-_]*", "", name, flags=re.I)
+
+	for pattern in (
+		r"\d{4}[-/]\d{1,2}[-/]\d{1,2}",
+		r"\d{1,2}[-/]\d{1,2}[-/]\d{4}",
+		r"\d{8}",
+		r"Q[1-4][\s\-_]*\d{4}",
+		r"\d{4}[\s\-_]*Q[1-4]",
+		r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*[\s\-_]*\d{4}",
+		r"\d{4}[\s\-_]*(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*",
+		r"(?<!\d)(19|20)\d{2}(?!\d)",
+	):
+		name = re.sub(pattern, "", name, flags=re.I)
+
+	if source and re.match(r"^[A-Z][a-z]+[A-Z][a-z]+$", source):
+		name = re.sub(r"[a-z]+[_\-][a-z]+", "", name, flags=re.I)
+
+	name = re.sub(r"[\s\-_]+", " ", name).strip()
+	if not name:
+		return "", "low"
+	cleaned = re.sub(r"[\s\-_\(\)\[\]]+", "", name)
+	if len(cleaned) < 2 or cleaned.isdigit():
+		return "", "low"
+	return to_pascal_case(name), "high"
+
+
+def corpus(size: int, seed: int) -> list[str]:
+	"""Names of one to five fragments joined by random delimiters."""
+	r = random.Random(seed)
+	return REGRESSIONS + [
+		r.choice(DELIMITERS).join(r.choice(FRAGMENTS) for _ in range(r.randint(1, 5))) + r.choice(EXTENSIONS)
+		for _ in range(size)
+	]
+
+
+class DateParityTest(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		cls.rf = load_rename_files()
+		cls.names = corpus(CORPUS_SIZE, CORPUS_SEED)
+
+	def test_extract_date_matches_regex_path(self):
+		for name in self.names:
+			self.assertEqual(self.rf.extract_date(name), reference_date(name, self.rf.MONTHS), name)
+
+	def test_extract_title_matches_regex_path(self):
+		for name in self.names:
+			source, _ = self.rf.extract_source(name)
+			date, _, _ = self.rf.extract_date(name)
+			self.assertEqual(
+				self.rf.extract_title(name, source, date),
+				reference_title(name, source, self.rf.to_pascal_case),
+				name,
+			)
+
+	def test_parsed_stem_matches_filename(self):
+		# analyze_file passes a shared ParsedStem; it must not change the answer
+		for name in self.names:
+			parsed = self.rf.ParsedStem(Path(name).stem)
+			source, _ = self.rf.extract_source(parsed)
+			date, _, _ = self.rf.extract_date(parsed)
+			self.assertEqual(self.rf.extract_title(parsed, source, date), self.rf.extract_title(name, source, date), name)
+
+
+if __name__ == "__main__":
+	unittest.main()
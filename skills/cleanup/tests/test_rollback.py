@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Tests for rename-files.py --rollback with several batches' journals.
+
+Usage:
+    python3 -m unittest discover skills/cleanup/tests
+"""
+
+import importlib.util
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+SCRIPT = Path(__file__).resolve().parent.parent / "scripts" / "rename-files.py"
+
+
+def load_rename_files(home: Path):
+	"""Import rename-files.py with its state files (history, journals) under home."""
+	previous = os.environ.get("HOME")
+	os.environ["HOME"] = str(home)
+	try:
+		spec = importlib.util.spec_from_file_location("rename_files", SCRIPT)
+		module = importlib.util.module_from_spec(spec)
+		sys.modules[spec.name] = module
+		spec.loader.exec_module(module)
+	finally:
+		if previous is None:
+			del os.environ["HOME"]
+		else:
+			os.environ["HOME"] = previous
+	return module
+
+
+class RollbackTest(unittest.TestCase):
+	def setUp(self):
+		self.tmp = Path(tempfile.mkdtemp(prefix="cleanup-rollback-"))
+		self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+		self.rf = load_rename_files(self.tmp / "home")
+
+	def move(self, src: str, dst: str):
+		"""Journal and apply one move as a batch would, returning the (locked file, path) journal."""
+		(self.tmp / src).write_text(src)
+		journal = self.rf._write_rename_journal([(str(self.tmp / src), str(self.tmp / dst), None)])
+		os.rename(self.tmp / src, self.tmp / dst)
+		return journal
+
+	def test_rolls_back_only_interrupted_batches(self):
+		# A batch whose process died: its lock is gone but the journal remains
+		crashed, _ = self.move("crashed.txt", "Crashed.txt")
+		crashed.close()
+		# A batch still running (lock held)
+		running, running_path = self.move("running.txt", "Running.txt")
+		self.addCleanup(running.close)
+
+		result = self.rf.rollback_renames()
+
+		self.assertEqual([r["to"] for r in result["restored"]], [str(self.tmp / "crashed.txt")])
+		self.assertEqual(result["active"], [running_path])
+		self.assertTrue((self.tmp / "crashed.txt").exists())
+		self.assertTrue((self.tmp / "Running.txt").exists())
+		self.assertTrue(os.path.exists(running_path))
+
+	def test_finished_batch_leaves_no_journal(self):
+		self.rf._finish_rename_journal(self.move("done.txt", "Done.txt"))
+		self.assertEqual(self.rf.rollback_renames(), {"restored": [], "errors": [], "active": []})
+		self.assertTrue((self.tmp / "Done.txt").exists())
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Tests for rename-files.py --watch: files already processed are recognised wherever they reappear.
+
+Usage:
+    python3 -m unittest discover skills/cleanup/tests
+"""
+
+import importlib.util
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+
+SCRIPT = Path(__file__).resolve().parent.parent / "scripts" / "rename-files.py"
+
+# Debounce used by the watcher under test (the default waits two seconds per file)
+DEBOUNCE_SECONDS = 0.05
+
+# How long to let the watcher catch up after each file operation
+SETTLE_SECONDS = 0.5
+
+
+def load_rename_files(home: Path):
+	"""Import rename-files.py with its state files (history, caches) under home."""
+	previous = os.environ.get("HOME")
+	os.environ["HOME"] = str(home)
+	try:
+		spec = importlib.util.spec_from_file_location("rename_files", SCRIPT)
+		module = importlib.util.module_from_spec(spec)
+		sys.modules[spec.name] = module
+		spec.loader.exec_module(module)
+	finally:
+		if previous is None:
+			del os.environ["HOME"]
+		else:
+			os.environ["HOME"] = previous
+	module.WATCH_DEBOUNCE_SECONDS = DEBOUNCE_SECONDS
+	return module
+
+
+@unittest.skipUnless(sys.platform.startswith("linux"), "watch mode needs inotify")
+class WatchTest(unittest.TestCase):
+	def setUp(self):
+		self.tmp = Path(tempfile.mkdtemp(prefix="cleanup-watch-"))
+		self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+		self.rf = load_rename_files(self.tmp / "home")
+		self.watched = self.tmp / "inbox"
+		self.watched.mkdir()
+		self.events = []
+
+	def start_watch(self, seconds: float) -> threading.Thread:
+		thread = threading.Thread(
+			target=self.rf.watch_directory, args=(self.watched,),
+			kwargs={"duration": seconds, "emit": self.events.append},
+		)
+		thread.start()
+		time.sleep(SETTLE_SECONDS)
+		return thread
+
+	def test_moved_processed_file_is_not_renamed_again(self):
+		original = "quarterly_report_2024-03-15.pdf"
+		result = self.rf.analyze_file(self.watched / original)
+		self.assertEqual(result["classification"], "auto")
+		suggested = result["suggested"]
+
+		# A stale entry at the target path, so recording the rename overwrites it
+		self.rf.append_history([self.rf.make_history_entry(str(self.watched / suggested), "renamed", suggested)])
+
+		thread = self.start_watch(4 * SETTLE_SECONDS)
+		(self.watched / original).write_bytes(b"%PDF-1.4\n")
+		time.sleep(SETTLE_SECONDS)
+		self.assertTrue((self.watched / suggested).exists(), self.events)
+
+		# Move the processed file out and back under another name: same inode and mtime
+		os.rename(self.watched / suggested, self.tmp / suggested)
+		os.rename(self.tmp / suggested, self.watched / original)
+		thread.join()
+
+		self.assertEqual([event["type"] for event in self.events], ["renamed"])
+		self.assertTrue((self.watched / original).exists())
+
+
+if __name__ == "__main__":
+	unittest.main()
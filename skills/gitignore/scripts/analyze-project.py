@@ -4,14 +4,32 @@ Analyze project structure and generate gitignore recommendations.
 Outputs JSON for Claude to process.
 """
 
+import argparse
+import hashlib
+import itertools
 import json
 import os
+import re
+import struct
+import subprocess
 import sys
+import time
 from pathlib import Path
+from typing import Optional
 
 
 SCRIPT_DIR = Path(__file__).parent
-TEMPLATES_DIR = SCRIPT_DIR / "templates"
+TEMPLATES_DIR = SCRIPT_DIR.parent / "templates"
+
+# Parsed, deduplicated templates, rebuilt when any template file changes
+TEMPLATE_BUNDLE_FILE = Path.home() / ".claude" / "gitignore-templates.json"
+
+# Bump when the bundle layout changes
+TEMPLATE_BUNDLE_FORMAT = 1
+
+# Templates recommended for every project, and the reason shown for them
+BASE_TEMPLATE = ("base", "Base configuration")
+MACOS_TEMPLATE = ("macos", "macOS system files")
 
 
 # Project detection rules: (indicator_files, indicator_dirs, template_name)
@@ -61,6 +79,13 @@ PROJECT_DETECTORS = [
 ]
 
 
+# Detector lookup by project type name
+DETECTORS_BY_NAME = {detector["name"]: detector for detector in PROJECT_DETECTORS}
+
+# Every indicator file and directory name, in a stable order
+INDICATOR_NAMES = sorted({name for detector in PROJECT_DETECTORS for name in detector["files"] + detector["dirs"]})
+
+
 # Critical patterns that should always be ignored (secrets, sensitive data)
 CRITICAL_PATTERNS = [
 	{
@@ -83,6 +108,11 @@ CRITICAL_PATTERNS = [
 		"reason": "Production secrets",
 		"severity": "critical",
 	},
+	{
+		"pattern": ".env.test.local",
+		"reason": "Test secrets",
+		"severity": "critical",
+	},
 	{
 		"pattern": "*.pem",
 		"reason": "Private keys",
@@ -103,9 +133,61 @@ CRITICAL_PATTERNS = [
 		"reason": "Service account credentials",
 		"severity": "critical",
 	},
+	{
+		"pattern": "id_rsa",
+		"reason": "SSH private key",
+		"severity": "critical",
+	},
+	{
+		"pattern": "id_ed25519",
+		"reason": "SSH private key",
+		"severity": "critical",
+	},
 ]
 
 
+# Directories never descended into, whatever .gitignore says
+ALWAYS_PRUNED = {".git"}
+
+# Paths listed per missing critical pattern (the rest are only counted)
+MAX_FILES_AT_RISK = 5
+
+# How a file at risk relates to git, most serious first: committed in HEAD, added to the
+# index since, or on disk and neither ignored nor added yet
+FINDING_STATUSES = ("tracked", "staged", "untracked")
+
+
+# Deepest directory level the workspace walk reads (the root is level 0)
+WORKSPACE_MAX_DEPTH = 8
+
+# Threads reading directories during the workspace walk
+WORKSPACE_THREADS = 8
+
+# Dependency, vendored and build directories the workspace walk never enters
+WORKSPACE_SKIP_DIRS = {
+	"node_modules", "bower_components", "vendor", "third_party", "target", "dist", "build",
+	"out", ".next", ".venv", "venv", "__pycache__", ".tox", ".terraform", ".gradle",
+}
+
+
+# Cached analysis, stored in the repository's git directory
+RESULT_CACHE_NAME = "gitignore-analysis.json"
+
+# Bump when the analysis output or its fingerprint changes
+RESULT_CACHE_FORMAT = 2
+
+# Directories modified this recently may still change within the same mtime
+# tick, so an analysis that read one is not cached
+RESULT_CACHE_RACY_NS = 2_000_000_000
+
+# Fixed part of a git index entry, skipping ctime/mtime/dev/ino before mode and
+# uid/gid before size: mode, size, object id, flags
+_INDEX_ENTRY = struct.Struct(">24xI8xI20sH")
+
+# Worker processes for batch mode
+BATCH_JOBS = os.cpu_count() or 1
+
+
 # Tradeoff questions for user preferences
 TRADEOFFS = [
 	{
@@ -150,22 +232,29 @@ TRADEOFFS = [
 ]
 
 
+def _detect(names: set[str], dir_names: set[str]) -> list[str]:
+	"""Project types indicated by a directory's entry names and subdirectory names."""
+	return [
+		detector["name"] for detector in PROJECT_DETECTORS
+		if any(f in names for f in detector["files"]) or any(d in dir_names for d in detector["dirs"])
+	]
+
+
 def detect_project_types(project_dir: Path) -> list[str]:
 	"""Detect what types of project this is based on files/dirs present."""
-	detected = []
-	for detector in PROJECT_DETECTORS:
-		# Check for indicator files
-		for filename in detector["files"]:
-			if (project_dir / filename).exists():
-				detected.append(detector["name"])
-				break
-		else:
-			# Check for indicator directories
-			for dirname in detector["dirs"]:
-				if (project_dir / dirname).is_dir():
-					detected.append(detector["name"])
-					break
-	return detected
+	names, dir_names = set(), set()
+	try:
+		with os.scandir(project_dir) as it:
+			for entry in it:
+				names.add(entry.name)
+				try:
+					if entry.is_dir():
+						dir_names.add(entry.name)
+				except OSError:
+					pass
+	except OSError:
+		pass
+	return _detect(names, dir_names)
 
 
 def parse_gitignore(gitignore_path: Path) -> list[str]:
@@ -182,89 +271,745 @@ def parse_gitignore(gitignore_path: Path) -> list[str]:
 	return patterns
 
 
-def load_template(template_name: str) -> list[str]:
-	"""Load patterns from a template file."""
-	template_path = TEMPLATES_DIR / template_name
-	if not template_path.exists():
-		return []
-	return parse_gitignore(template_path)
+def _template_key(templates_dir: Path) -> list:
+	"""Stat fingerprint of every template file; the bundle is valid while this is unchanged."""
+	files = []
+	try:
+		with os.scandir(templates_dir) as it:
+			for entry in it:
+				if entry.name.endswith(".gitignore"):
+					st = entry.stat()
+					files.append([entry.name, st.st_mtime_ns, st.st_size])
+	except OSError:
+		pass
+	return [TEMPLATE_BUNDLE_FORMAT, str(templates_dir), sorted(files)]
 
 
-def get_recommended_patterns(project_types: list[str]) -> dict:
-	"""Get recommended patterns based on project types."""
-	# Always include base patterns
-	mandatory = load_template("base.gitignore")
+def build_template_bundle(templates_dir: Path, key: list) -> dict:
+	"""
+	Parse every template once into a bundle.
+
+	Returns:
+		{"key", "version", "templates": {name: [pattern, ...]},
+		 "sources": {pattern: [template name, ...]}}
+		Template names drop the .gitignore suffix and match detector names.
+	"""
+	templates = {}
+	sources = {}
+	for filename, _, _ in key[2]:
+		name = filename[:-len(".gitignore")]
+		patterns = list(dict.fromkeys(parse_gitignore(templates_dir / filename)))
+		templates[name] = patterns
+		for pattern in patterns:
+			sources.setdefault(pattern, []).append(name)
+	return {"key": key, "version": _template_version(key), "templates": templates, "sources": sources}
+
+
+def _template_version(key: list) -> str:
+	"""Short hash identifying a template bundle."""
+	return hashlib.sha1(json.dumps(key).encode()).hexdigest()[:16]
+
+
+_BUNDLE = None
 
-	# Add project-specific patterns
-	project_specific = []
-	for ptype in project_types:
-		for detector in PROJECT_DETECTORS:
-			if detector["name"] == ptype:
-				patterns = load_template(detector["template"])
-				project_specific.extend(patterns)
-				break
 
-	# Always include macOS patterns
-	macos_patterns = load_template("macos.gitignore")
+def load_template_bundle(templates_dir: Path = TEMPLATES_DIR) -> dict:
+	"""
+	The template bundle, from memory, TEMPLATE_BUNDLE_FILE or the templates themselves.
+
+	Each call stats the template files; while none has changed no template is read,
+	and a new process reads only the bundle file.
+	"""
+	global _BUNDLE
+	key = _template_key(templates_dir)
+	if _BUNDLE is not None and _BUNDLE["key"] == key:
+		return _BUNDLE
+
+	try:
+		with open(TEMPLATE_BUNDLE_FILE) as f:
+			bundle = json.load(f)
+		if bundle.get("key") == key:
+			_BUNDLE = bundle
+			return bundle
+	except (OSError, ValueError):
+		pass
+
+	bundle = build_template_bundle(templates_dir, key)
+	try:
+		TEMPLATE_BUNDLE_FILE.parent.mkdir(parents=True, exist_ok=True)
+		tmp = TEMPLATE_BUNDLE_FILE.with_name(TEMPLATE_BUNDLE_FILE.name + ".tmp")
+		with open(tmp, "w") as f:
+			json.dump(bundle, f, separators=(",", ":"))
+		os.replace(tmp, TEMPLATE_BUNDLE_FILE)
+	except OSError:
+		pass
+	_BUNDLE = bundle
+	return bundle
+
+
+def get_recommended_patterns(project_types: list[str], bundle: Optional[dict] = None) -> dict:
+	"""
+	Get recommended patterns based on project types.
+
+	Each pattern appears once across all sections (base, then macOS, then project
+	templates) and lists the templates it came from.
+	"""
+	bundle = bundle or load_template_bundle()
+	templates = bundle["templates"]
+	seen = set()
+
+	def section(names: list[str], reason: Optional[str] = None) -> list[dict]:
+		entries = []
+		for name in names:
+			for pattern in templates.get(name, []):
+				if pattern in seen:
+					continue
+				seen.add(pattern)
+				sources = [source for source in bundle["sources"][pattern] if source in names]
+				entries.append({
+					"pattern": pattern,
+					"reason": reason or f"Project: {', '.join(sources)}",
+					"templates": sources,
+				})
+		return entries
+
+	mandatory = section([BASE_TEMPLATE[0]], BASE_TEMPLATE[1])
+	macos = section([MACOS_TEMPLATE[0]], MACOS_TEMPLATE[1])
+	project_templates = [
+		DETECTORS_BY_NAME[ptype]["template"][:-len(".gitignore")]
+		for ptype in project_types if ptype in DETECTORS_BY_NAME
+	]
+	project_specific = section(project_templates)
 
 	return {
-		"mandatory": [{"pattern": p, "reason": "Base configuration"} for p in mandatory],
-		"projectSpecific": [{"pattern": p, "reason": f"Project: {', '.join(project_types)}"} for p in project_specific],
-		"macos": [{"pattern": p, "reason": "macOS system files"} for p in macos_patterns],
+		"mandatory": mandatory,
+		"projectSpecific": project_specific,
+		"macos": macos,
 	}
 
 
-def check_missing_critical(existing_patterns: list[str], project_dir: Path) -> list[dict]:
-	"""Check for critical patterns that are missing from .gitignore."""
-	missing = []
+def _glob_to_regex(glob: str) -> str:
+	"""Translate a gitignore glob to a regex: * and ? stop at /, ** spans directories."""
+	out = []
+	i, n = 0, len(glob)
+	while i < n:
+		c = glob[i]
+		i += 1
+		if c == "*":
+			if glob.startswith("*", i) and (i == 1 or glob[i - 2] == "/") and (i + 1 == n or glob[i + 1] == "/"):
+				# "**" as a whole path segment: "a/**" is everything inside a, "**/b" and "a/**/b" any depth
+				if i + 1 == n:
+					out.append(".+")
+					i += 1
+				else:
+					out.append("(?:.*/)?")
+					i += 2
+				continue
+			while i < n and glob[i] == "*":
+				i += 1
+			out.append("[^/]*")
+		elif c == "?":
+			out.append("[^/]")
+		elif c == "[":
+			j = i
+			if j < n and glob[j] in "!^":
+				j += 1
+			if j < n and glob[j] == "]":
+				j += 1
+			j = glob.find("]", j)
+			if j == -1:
+				out.append("\\[")
+				continue
+			body = glob[i:j].replace("\\", "\\\\")
+			if body[0] in "!^":
+				body = "^" + body[1:]
+			out.append(f"(?!/)[{body}]")
+			i = j + 1
+		elif c == "\\" and i < n:
+			out.append(re.escape(glob[i]))
+			i += 1
+		else:
+			out.append(re.escape(c))
+	return "".join(out)
+
+
+def parse_rule(line: str) -> Optional[tuple[str, bool, bool, bool]]:
+	"""
+	Compile one .gitignore line to (regex, negated, directory_only, basename_only).
+
+	Returns None for blank lines and comments. Patterns without a slash (other than a
+	trailing one) match the file name at any depth; all others are anchored to the
+	directory holding the .gitignore.
+	"""
+	line = line.rstrip("\r\n")
+	stripped = line.rstrip(" ")
+	if stripped.endswith("\\") and len(stripped) < len(line):
+		stripped += " "
+	line = stripped
+	if not line or line.startswith("#"):
+		return None
+	negated = line.startswith("!")
+	if negated:
+		line = line[1:]
+	directory_only = line.endswith("/")
+	line = line.rstrip("/")
+	if not line:
+		return None
+	basename_only = "/" not in line
+	return _glob_to_regex(line.lstrip("/")), negated, directory_only, basename_only
+
+
+def _alternation(regexes: list[str]):
+	"""One compiled fullmatch for any of regexes, or None when there are none."""
+	if not regexes:
+		return None
+	return re.compile("|".join(f"(?:{r})" for r in regexes), re.S).fullmatch
+
+
+class IgnoreRules:
+	"""
+	The compiled rules of one .gitignore, matched against paths relative to its directory.
+
+	Consecutive rules with the same sign are merged into a single regex: git applies the
+	last matching rule, so walking these runs from the bottom up, the first run that matches
+	decides. A file tests name and path regexes; a directory also tests directory-only rules.
+	"""
+
+	__slots__ = ("runs",)
+
+	def __init__(self, lines: list[str]):
+		rules = [rule for rule in map(parse_rule, lines) if rule]
+		self.runs = []
+		for negated, group in itertools.groupby(reversed(rules), key=lambda rule: rule[1]):
+			group = list(group)
+			files = [rule for rule in group if not rule[2]]
+			self.runs.append((
+				negated,
+				_alternation([rule[0] for rule in files if rule[3]]),
+				_alternation([rule[0] for rule in files if not rule[3]]),
+				_alternation([rule[0] for rule in group if rule[3]]),
+				_alternation([rule[0] for rule in group if not rule[3]]),
+			))
+
+	def match(self, path: str, name: str, is_dir: bool) -> Optional[bool]:
+		"""True if ignored, False if re-included by a negation, None if no rule applies."""
+		for negated, file_names, file_paths, dir_names, dir_paths in self.runs:
+			by_name, by_path = (dir_names, dir_paths) if is_dir else (file_names, file_paths)
+			if (by_name and by_name(name)) or (by_path and by_path(path)):
+				return not negated
+		return None
+
+
+def find_git_dir(project_dir: Path) -> Optional[Path]:
+	"""The repository's git directory, following a "gitdir:" file (worktrees, submodules)."""
+	dot_git = Path(project_dir) / ".git"
+	if dot_git.is_dir():
+		return dot_git
+	try:
+		with open(dot_git) as f:
+			line = f.readline().strip()
+	except OSError:
+		return None
+	if not line.startswith("gitdir:"):
+		return None
+	git_dir = Path(line[len("gitdir:"):].strip())
+	return git_dir if git_dir.is_absolute() else dot_git.parent / git_dir
+
+
+def _index_varint(data: bytes, pos: int) -> tuple[int, int]:
+	"""Decode git's offset varint (index v4 prefix lengths); returns (value, next position)."""
+	c = data[pos]
+	pos += 1
+	value = c & 0x7F
+	while c & 0x80:
+		c = data[pos]
+		pos += 1
+		value = ((value + 1) << 7) | (c & 0x7F)
+	return value, pos
+
+
+def read_index(git_dir: Path) -> Optional[dict[str, tuple[int, bytes, int, int]]]:
+	"""
+	Entries of the git index, read directly: {path: (mode, raw object id, size, stage)}.
+
+	size is the work tree size recorded when the file was staged, which is the blob size
+	unless a clean filter rewrote the content (and is truncated to 32 bits). Returns None
+	for indexes this reader doesn't handle (split or SHA-256 indexes, unknown versions),
+	so callers can fall back to git.
+	"""
+	try:
+		data = (git_dir / "index").read_bytes()
+	except FileNotFoundError:
+		return {}
+	except OSError:
+		return None
+	if len(data) < 12 or data[:4] != b"DIRC":
+		return None
+	version, count = struct.unpack_from(">II", data, 4)
+	if version not in (2, 3, 4):
+		return None
+	try:
+		with open(git_dir / "config") as f:
+			if re.search(r"objectformat\s*=\s*sha256", f.read(), re.I):
+				return None
+	except OSError:
+		pass
+
+	entries = {}
+	unpack = _INDEX_ENTRY.unpack_from
+	fixed = _INDEX_ENTRY.size
+	pos = 12
+	previous = b""
+	try:
+		for _ in range(count):
+			mode, size, oid, flags = unpack(data, pos)
+			name_at = pos + fixed + (2 if flags & 0x4000 else 0)
+			if version == 4:
+				# Path is the previous path minus N trailing bytes, plus this suffix
+				strip, name_at = _index_varint(data, name_at)
+				end = data.index(b"\0", name_at)
+				name = previous[:len(previous) - strip] + data[name_at:end]
+				previous = name
+				pos = end + 1
+			else:
+				# Flags hold the path length up to 0xFFF; entries are NUL-padded to 8 bytes
+				length = flags & 0xFFF
+				end = name_at + length if length < 0xFFF else data.index(b"\0", name_at)
+				name = data[name_at:end]
+				pos += (end - pos + 8) & ~7
+			entries[name.decode("utf-8", "surrogateescape")] = (mode, oid, size, (flags >> 12) & 3)
+		# A split index keeps most entries in a shared file
+		while pos + 8 <= len(data) - 20:
+			signature, size = struct.unpack_from(">4sI", data, pos)
+			if signature == b"link":
+				return None
+			pos += 8 + size
+	except (struct.error, ValueError, IndexError):
+		return None
+	return entries
+
+
+def _read_lines(path: Path) -> list[str]:
+	"""Lines of a text file, or [] when it can't be read."""
+	try:
+		with open(path, "r", encoding="utf-8", errors="surrogateescape") as f:
+			return f.read().splitlines()
+	except OSError:
+		return []
+
+
+class GitignoreMatcher:
+	"""
+	Git's ignore decision for paths in one work tree.
+
+	Reads .git/info/exclude and the .gitignore of each directory on first use, so a
+	matcher can be shared by a full walk and by spot checks of individual paths.
+	Paths are relative to the root and "/"-separated.
+	"""
+
+	def __init__(self, root: Path):
+		self.root = Path(root)
+		self._rules = {}
+		self._chains = {}
+		self._ignored_dirs = {"": False}
+		# When a dict, scan() records {directory: [mtime_ns, .gitignore stat or None]}
+		self.visited = None
+
+	def rules(self, directory: str) -> Optional[IgnoreRules]:
+		"""Compiled rules of directory/.gitignore (with .git/info/exclude first at the root)."""
+		if directory not in self._rules:
+			lines = _read_lines(self.root / directory / ".gitignore")
+			git_dir = find_git_dir(self.root) if not directory else None
+			if git_dir is not None:
+				lines = _read_lines(git_dir / "info" / "exclude") + lines
+			rules = IgnoreRules(lines)
+			self._rules[directory] = rules if rules.runs else None
+		return self._rules[directory]
+
+	def _chain(self, directory: str) -> tuple:
+		"""(prefix, rules) of every .gitignore that applies inside directory, deepest first."""
+		chain = self._chains.get(directory)
+		if chain is None:
+			parent = self._chain(directory.rpartition("/")[0]) if directory else ()
+			rules = self.rules(directory)
+			chain = ((directory + "/" if directory else "", rules),) + parent if rules else parent
+			self._chains[directory] = chain
+		return chain
 
+	def match(self, path: str, is_dir: bool = False) -> bool:
+		"""Whether path's own rules ignore it, assuming no parent directory is ignored."""
+		directory, _, name = path.rpartition("/")
+		for prefix, rules in self._chain(directory):
+			verdict = rules.match(path[len(prefix):], name, is_dir)
+			if verdict is not None:
+				return verdict
+		return False
+
+	def is_ignored(self, path: str, is_dir: bool = False) -> bool:
+		"""Whether git ignores path, either directly or because a parent directory is ignored."""
+		return self._dir_ignored(path.rpartition("/")[0]) or self.match(path, is_dir)
+
+	def _dir_ignored(self, directory: str) -> bool:
+		ignored = self._ignored_dirs.get(directory)
+		if ignored is None:
+			ignored = self._dir_ignored(directory.rpartition("/")[0]) or self.match(directory, True)
+			self._ignored_dirs[directory] = ignored
+		return ignored
+
+	def scan(self, directory: str, select=None) -> Optional[tuple[set[str], list[tuple[str, str]], list[str]]]:
+		"""
+		Read one directory.
+
+		Returns (entry names, [(name, path)] of subdirectories git would not ignore, paths of
+		files git would not ignore), or None when the directory is unreadable or is a nested
+		repository. With select, only file names for which select(name) is true are checked.
+		"""
+		try:
+			mtime_ns = os.stat(self.root / directory).st_mtime_ns if self.visited is not None else None
+			with os.scandir(self.root / directory) as it:
+				entries = list(it)
+		except OSError:
+			return None
+		names = {entry.name for entry in entries}
+		if self.visited is not None:
+			self.visited[directory] = [mtime_ns, _stat_key(self.root / directory / ".gitignore") if ".gitignore" in names else None]
+		if directory and ".git" in names:
+			return None
+		if ".gitignore" not in names:
+			self._rules.setdefault(directory, None)
+		prefix = directory + "/" if directory else ""
+		subdirs, files = [], []
+		for entry in entries:
+			name = entry.name
+			path = prefix + name
+			try:
+				is_dir = entry.is_dir(follow_symlinks=False)
+			except OSError:
+				continue
+			if is_dir:
+				if name not in ALWAYS_PRUNED and not self.match(path, True):
+					subdirs.append((name, path))
+			elif (select is None or select(name)) and not self.match(path):
+				files.append(path)
+		return names, subdirs, files
+
+	def walk(self, select=None):
+		"""
+		Yield the files git would not ignore, in one os.scandir walk.
+
+		Ignored directories, .git and nested repositories are never entered. With select,
+		only file names for which select(name) is true are checked and yielded, so the
+		ignore rules run for every directory but only for candidate files.
+		"""
+		stack = [""]
+		while stack:
+			scanned = self.scan(stack.pop(), select)
+			if scanned is not None:
+				stack.extend(path for _, path in scanned[1])
+				yield from scanned[2]
+
+
+def critical_matcher():
+	"""
+	One compiled match of a file name against every critical pattern.
+
+	Returns a function mapping a name to its CRITICAL_PATTERNS entry, or None.
+	"""
+	regex = re.compile("|".join(
+		f"(?P<p{i}>{_glob_to_regex(critical['pattern'])})" for i, critical in enumerate(CRITICAL_PATTERNS)
+	), re.S)
+
+	def match(name: str) -> Optional[dict]:
+		m = regex.fullmatch(name)
+		return CRITICAL_PATTERNS[int(m.lastgroup[1:])] if m else None
+
+	return match
+
+
+def critical_findings(findings: list[tuple[str, str]]) -> list[dict]:
+	"""Group (path, status) findings by the critical patterns their file names match."""
+	match = critical_matcher()
+	at_risk = {}
+	for path, status in findings:
+		critical = match(path.rpartition("/")[2])
+		if critical is not None:
+			at_risk.setdefault(critical["pattern"], []).append((FINDING_STATUSES.index(status), path))
+
+	missing = []
 	for critical in CRITICAL_PATTERNS:
-		pattern = critical["pattern"]
-		# Check if pattern or a broader pattern exists
-		pattern_covered = False
-		for existing in existing_patterns:
-			# Simple check: exact match or wildcard that covers it
-			if existing == pattern:
-				pattern_covered = True
-				break
-			# Check if .env* would cover .env, .env.local, etc.
-			if pattern.startswith(".env") and existing == ".env*":
-				pattern_covered = True
+		files = at_risk.get(critical["pattern"])
+		if files:
+			files.sort()
+			entry = {
+				"pattern": critical["pattern"],
+				"severity": critical["severity"],
+				"reason": critical["reason"],
+				"files_at_risk": [path for _, path in files[:MAX_FILES_AT_RISK]],
+				"count": len(files),
+			}
+			for rank, status in enumerate(FINDING_STATUSES):
+				paths = [path for r, path in files if r == rank]
+				entry[status] = paths[:MAX_FILES_AT_RISK]
+				entry[status + "Count"] = len(paths)
+			missing.append(entry)
+	return missing
+
+
+def load_index(project_dir: Path, git_dir: Optional[Path]) -> dict:
+	"""
+	Index entries of the repository at project_dir ({} outside one): read directly,
+	or with a single git ls-files --stage when read_index can't handle the index.
+	"""
+	if git_dir is None:
+		return {}
+	index = read_index(git_dir)
+	if index is not None:
+		return index
+	try:
+		result = subprocess.run(["git", "-C", str(project_dir), "ls-files", "-z", "--stage"], capture_output=True)
+	except OSError:
+		return {}
+	index = {}
+	for record in result.stdout.split(b"\0"):
+		if record:
+			# "<mode> <object id> <stage>\t<path>"
+			meta, _, path = record.partition(b"\t")
+			mode, oid, stage = meta.split(b" ")
+			index[path.decode("utf-8", "surrogateescape")] = (int(mode, 8), bytes.fromhex(oid.decode()), 0, int(stage))
+	return index
+
+
+def head_paths(project_dir: Path, paths: list[str]) -> set[str]:
+	"""Which of paths exist in HEAD, asked with a single git cat-file --batch-check."""
+	names = [path for path in paths if "\n" not in path]
+	if not names:
+		return set()
+	try:
+		result = subprocess.run(
+			["git", "-C", str(project_dir), "cat-file", "--batch-check=%(objecttype)"],
+			input="".join(f"HEAD:{path}\n" for path in names).encode("utf-8", "surrogateescape"),
+			capture_output=True,
+		)
+	except OSError:
+		return set()
+	lines = result.stdout.decode("utf-8", "replace").splitlines()
+	return {path for path, line in zip(names, lines) if not line.endswith(" missing")}
+
+
+def classify_at_risk(project_dir: Path, unignored: list[str]) -> list[tuple[str, str]]:
+	"""
+	(path, status) of every file at risk: critical files in the index, whether or not
+	.gitignore matches them (ignore rules don't apply to tracked files), plus unignored
+	critical files found on disk that aren't in the index.
+	"""
+	match = critical_matcher()
+	index = load_index(project_dir, find_git_dir(project_dir))
+	indexed = [path for path in index if match(path.rpartition("/")[2])]
+	committed = head_paths(project_dir, indexed)
+	findings = [(path, "tracked" if path in committed else "staged") for path in indexed]
+	findings.extend((path, "untracked") for path in unignored if path not in index)
+	return findings
+
+
+def check_missing_critical(project_dir: Path, matcher: Optional[GitignoreMatcher] = None) -> list[dict]:
+	"""
+	Find files matching a critical pattern that are, or could be, committed.
+
+	Tracked and staged files come from one read of the git index; untracked ones from a
+	single walk of the tree (see GitignoreMatcher.walk), honoring negations, anchors, **
+	and nested .gitignore files.
+	"""
+	matcher = matcher or GitignoreMatcher(project_dir)
+	return critical_findings(classify_at_risk(project_dir, list(matcher.walk(critical_matcher()))))
+
+
+def _stat_key(path: Path) -> Optional[list]:
+	"""[mtime_ns, size] of path, or None when it doesn't exist."""
+	try:
+		st = os.stat(path)
+	except OSError:
+		return None
+	return [st.st_mtime_ns, st.st_size]
+
+
+def _head_key(git_dir: Path) -> list:
+	"""HEAD's content and the stat of the ref it names (loose or packed)."""
+	try:
+		head = (git_dir / "HEAD").read_text().strip()
+	except OSError:
+		return [None]
+	key = [head, _stat_key(git_dir / "packed-refs")]
+	if head.startswith("ref: "):
+		key.append(_stat_key(git_dir / head[len("ref: "):]))
+	return key
+
+
+def _fingerprint(project_dir: Path, git_dir: Path) -> list:
+	"""
+	The inputs of analyze_project other than the tree itself: indicator files,
+	.gitignore content, git's exclude file, index and HEAD, the template bundle
+	version and the critical patterns.
+	"""
+	try:
+		gitignore = hashlib.sha1((project_dir / ".gitignore").read_bytes()).hexdigest()
+	except OSError:
+		gitignore = None
+	return [
+		RESULT_CACHE_FORMAT,
+		str(project_dir),
+		_template_version(_template_key(TEMPLATES_DIR)),
+		gitignore,
+		_stat_key(git_dir / "info" / "exclude"),
+		_stat_key(git_dir / "index"),
+		_head_key(git_dir),
+		[_stat_key(project_dir / name) for name in INDICATOR_NAMES],
+		[critical["pattern"] for critical in CRITICAL_PATTERNS],
+	]
+
+
+def _tree_unchanged(project_dir: Path, visited: dict) -> bool:
+	"""Whether every directory the cached walk read still has the same mtime and .gitignore."""
+	for directory, (mtime_ns, gitignore) in visited.items():
+		path = project_dir / directory
+		try:
+			if os.stat(path).st_mtime_ns != mtime_ns:
+				return False
+		except OSError:
+			return False
+		if gitignore is not None and _stat_key(path / ".gitignore") != gitignore:
+			return False
+	return True
+
+
+def load_cached_analysis(project_dir: Path, git_dir: Path, key: list) -> Optional[dict]:
+	"""The cached analysis of project_dir if none of its inputs changed since, else None."""
+	try:
+		with open(git_dir / RESULT_CACHE_NAME) as f:
+			cache = json.load(f)
+		if cache.get("key") != key or not _tree_unchanged(project_dir, cache["visited"]):
+			return None
+		return cache["analysis"]
+	except (OSError, ValueError, KeyError, TypeError):
+		return None
+
+
+def save_cached_analysis(git_dir: Path, key: list, visited: dict, analysis: dict, started_ns: int) -> None:
+	"""Store an analysis unless a directory it read was modified too recently to trust."""
+	cutoff_ns = started_ns - RESULT_CACHE_RACY_NS
+	if any(mtime_ns >= cutoff_ns for mtime_ns, _ in visited.values()):
+		return
+	path = git_dir / RESULT_CACHE_NAME
+	try:
+		tmp = path.with_name(path.name + ".tmp")
+		with open(tmp, "w") as f:
+			json.dump({"key": key, "visited": visited, "analysis": analysis}, f, separators=(",", ":"))
+		os.replace(tmp, path)
+	except OSError:
+		pass
+
+
+def scan_workspace(project_dir: Path, max_depth: int = WORKSPACE_MAX_DEPTH,
+		threads: int = WORKSPACE_THREADS, matcher: Optional[GitignoreMatcher] = None) -> dict:
+	"""
+	Find sub-project roots and unignored critical files in one parallel walk.
+
+	Directories are read level by level on a thread pool, skipping ignored and
+	WORKSPACE_SKIP_DIRS directories and stopping below max_depth.
+
+	Returns:
+		{"projects": {directory: project types}, "atRisk": [path, ...],
+		 "directories": directories read, "truncated": directories left unread at the depth limit}
+	"""
+	# Imported here so the pre-commit check, which loads this module, doesn't pay for it
+	from concurrent.futures import ThreadPoolExecutor
+
+	matcher = matcher or GitignoreMatcher(project_dir)
+	select = critical_matcher()
+	projects, at_risk = {}, []
+	directories = 0
+	level = [""]
+	with ThreadPoolExecutor(max_workers=max(1, threads)) as pool:
+		for _ in range(max_depth + 1):
+			if not level:
 				break
-			# Check if *.pem covers specific.pem
-			if existing.startswith("*") and pattern.endswith(existing[1:]):
-				pattern_covered = True
+			next_level = []
+			for directory, scanned in zip(level, pool.map(lambda d: matcher.scan(d, select), level)):
+				if scanned is None:
+					continue
+				names, subdirs, files = scanned
+				directories += 1
+				types = _detect(names, {name for name, _ in subdirs})
+				if types:
+					projects[directory] = types
+				at_risk.extend(files)
+				next_level.extend(path for name, path in subdirs if name not in WORKSPACE_SKIP_DIRS)
+			level = next_level
+	return {"projects": projects, "atRisk": at_risk, "directories": directories, "truncated": len(level)}
+
+
+def analyze_workspace(project_dir: Path, max_depth: int = WORKSPACE_MAX_DEPTH,
+		threads: int = WORKSPACE_THREADS) -> dict:
+	"""
+	Workspace analysis: project types, recommendations and missing critical patterns
+	for every sub-project (pnpm/Cargo/Go workspaces and other monorepos).
+
+	Files at risk are reported under the deepest sub-project containing them, and all
+	of them again in the top-level "missing".
+	"""
+	gitignore_path = project_dir / ".gitignore"
+	scan = scan_workspace(project_dir, max_depth, threads)
+	bundle = load_template_bundle()
+
+	findings = classify_at_risk(project_dir, scan["atRisk"])
+	by_root = {directory: [] for directory in scan["projects"]}
+	for path, status in findings:
+		directory = path
+		while directory:
+			directory = directory.rpartition("/")[0]
+			if directory in by_root:
+				by_root[directory].append((path, status))
 				break
 
-		if not pattern_covered:
-			# Check if such files actually exist in the project
-			# For wildcards, do a simple check
-			if "*" in pattern:
-				# Check for files matching pattern
-				import glob
-				matches = list(project_dir.glob(pattern))
-				if matches:
-					missing.append({
-						"pattern": pattern,
-						"severity": critical["severity"],
-						"reason": critical["reason"],
-						"files_at_risk": [str(m.relative_to(project_dir)) for m in matches[:5]],
-					})
-			else:
-				if (project_dir / pattern).exists():
-					missing.append({
-						"pattern": pattern,
-						"severity": critical["severity"],
-						"reason": critical["reason"],
-						"files_at_risk": [pattern],
-					})
+	projects = [
+		{
+			"path": directory or ".",
+			"projectTypes": types,
+			"recommended": get_recommended_patterns(types, bundle),
+			"missing": critical_findings(by_root[directory]),
+		}
+		for directory, types in sorted(scan["projects"].items())
+	]
 
-	return missing
+	return {
+		"projectDir": str(project_dir),
+		"workspace": True,
+		"existingGitignore": {
+			"exists": gitignore_path.exists(),
+			"patterns": parse_gitignore(gitignore_path),
+		},
+		"templateVersion": bundle["version"],
+		"projects": projects,
+		"tradeoffs": TRADEOFFS,
+		"missing": critical_findings(findings),
+		"scanned": {"directories": scan["directories"], "truncated": scan["truncated"], "maxDepth": max_depth},
+	}
 
 
-def analyze_project(project_dir: Path) -> dict:
-	"""Main analysis function. Returns comprehensive JSON output."""
+def analyze_project(project_dir: Path, use_cache: bool = True) -> dict:
+	"""
+	Main analysis function. Returns comprehensive JSON output.
+
+	In a git repository the result is cached in the git directory and reused while
+	the indicator files, .gitignore files, templates and walked directories are unchanged.
+	"""
 	gitignore_path = project_dir / ".gitignore"
+	git_dir = find_git_dir(project_dir) if use_cache else None
+	if git_dir is not None:
+		started_ns = time.time_ns()
+		key = _fingerprint(project_dir, git_dir)
+		cached = load_cached_analysis(project_dir, git_dir, key)
+		if cached is not None:
+			return cached
 
 	# Detect project types
 	project_types = detect_project_types(project_dir)
@@ -273,10 +1018,14 @@ def analyze_project(project_dir: Path) -> dict:
 	existing_patterns = parse_gitignore(gitignore_path)
 
 	# Get recommendations
-	recommended = get_recommended_patterns(project_types)
+	bundle = load_template_bundle()
+	recommended = get_recommended_patterns(project_types, bundle)
 
-	# Check for missing critical patterns
-	missing = check_missing_critical(existing_patterns, project_dir)
+	# Check for unignored files matching critical patterns
+	matcher = GitignoreMatcher(project_dir)
+	if git_dir is not None:
+		matcher.visited = {}
+	missing = check_missing_critical(project_dir, matcher)
 
 	# Build output
 	output = {
@@ -287,25 +1036,142 @@ def analyze_project(project_dir: Path) -> dict:
 			"patterns": existing_patterns,
 		},
 		"recommended": recommended,
+		"templateVersion": bundle["version"],
 		"tradeoffs": TRADEOFFS,
 		"missing": missing,
 	}
 
+	if git_dir is not None:
+		save_cached_analysis(git_dir, key, matcher.visited, output, started_ns)
 	return output
 
 
+def _init_batch_worker(bundle: dict) -> None:
+	"""Seed each worker with the parent's template bundle so none reads it again."""
+	global _BUNDLE
+	_BUNDLE = bundle
+
+
+def _analyze_one(project_dir: str, workspace: bool, max_depth: int, use_cache: bool) -> dict:
+	"""Analyze one repository for batch mode, as a 'repo' or 'error' record."""
+	path = Path(project_dir).expanduser().resolve()
+	if not path.is_dir():
+		return {"type": "error", "projectDir": str(path), "error": f"Not a directory: {path}"}
+	try:
+		result = analyze_workspace(path, max_depth, threads=1) if workspace else analyze_project(path, use_cache)
+	except OSError as e:
+		return {"type": "error", "projectDir": str(path), "error": str(e)}
+	return {"type": "repo", **result}
+
+
+def analyze_batch(project_dirs: list[str], jobs: int = BATCH_JOBS, workspace: bool = False,
+		max_depth: int = WORKSPACE_MAX_DEPTH, use_cache: bool = True):
+	"""
+	Analyze many repositories on a process pool, yielding each record as it finishes.
+
+	Templates are loaded once here and handed to every worker.
+	"""
+	from concurrent.futures import ProcessPoolExecutor, as_completed
+
+	bundle = load_template_bundle()
+	if jobs <= 1:
+		for project_dir in project_dirs:
+			yield _analyze_one(project_dir, workspace, max_depth, use_cache)
+		return
+	with ProcessPoolExecutor(max_workers=jobs, initializer=_init_batch_worker, initargs=(bundle,)) as pool:
+		futures = [pool.submit(_analyze_one, project_dir, workspace, max_depth, use_cache) for project_dir in project_dirs]
+		for future in as_completed(futures):
+			yield future.result()
+
+
+def _tally(summary: dict, record: dict) -> None:
+	"""Fold one batch record into the aggregate summary."""
+	summary["repos"] += 1
+	if record["type"] == "error":
+		summary["errors"] += 1
+		return
+	types = record.get("projectTypes")
+	if types is None:
+		types = {ptype for project in record["projects"] for ptype in project["projectTypes"]}
+	for ptype in types:
+		summary["projectTypes"][ptype] = summary["projectTypes"].get(ptype, 0) + 1
+	for entry in record["missing"]:
+		pattern = entry["pattern"]
+		summary["missing"][pattern] = summary["missing"].get(pattern, 0) + 1
+		summary["filesAtRisk"][pattern] = summary["filesAtRisk"].get(pattern, 0) + entry["count"]
+	if record["missing"]:
+		summary["reposAtRisk"] += 1
+	if any(entry["trackedCount"] for entry in record["missing"]):
+		summary["reposTracked"] += 1
+
+
+def write_ndjson(record: dict) -> None:
+	"""Write one NDJSON record and flush so consumers see it immediately."""
+	sys.stdout.write(json.dumps(record) + "\n")
+	sys.stdout.flush()
+
+
+def stream_batch(project_dirs: list[str], jobs: int, workspace: bool, max_depth: int, use_cache: bool = True) -> None:
+	"""
+	Stream one NDJSON record per repository ('repo' or 'error'), then a 'summary' record
+	counting, per critical pattern, the repositories missing it.
+	"""
+	start = time.perf_counter()
+	summary = {
+		"type": "summary", "repos": 0, "errors": 0, "reposAtRisk": 0, "reposTracked": 0,
+		"missing": {}, "filesAtRisk": {}, "projectTypes": {},
+	}
+	for record in analyze_batch(project_dirs, jobs, workspace, max_depth, use_cache):
+		_tally(summary, record)
+		write_ndjson(record)
+	summary["seconds"] = round(time.perf_counter() - start, 3)
+	write_ndjson(summary)
+
+
+def _read_roots(source: str) -> list[str]:
+	"""Repository paths from a file (or '-' for stdin), one per line; blank lines and # comments skipped."""
+	f = sys.stdin if source == "-" else open(source)
+	try:
+		lines = [line.strip() for line in f]
+	finally:
+		if f is not sys.stdin:
+			f.close()
+	return [line for line in lines if line and not line.startswith("#")]
+
+
 def main():
-	# Get project directory from argument or use current directory
-	if len(sys.argv) > 1:
-		project_dir = Path(sys.argv[1]).resolve()
-	else:
-		project_dir = Path.cwd()
+	parser = argparse.ArgumentParser(description="Analyze a project and recommend .gitignore patterns")
+	parser.add_argument("project_dirs", nargs="*", help="Project directory (default: cwd); several for batch mode")
+	parser.add_argument("--from", dest="from_file", metavar="FILE", help="Batch mode: read directories from FILE ('-' for stdin)")
+	parser.add_argument("--jobs", type=int, default=BATCH_JOBS, help="Batch mode worker processes")
+	parser.add_argument("--no-cache", action="store_true", help="Ignore and don't update the cached analysis in .git/")
+	parser.add_argument("--workspace", action="store_true", help="Analyze every sub-project of a monorepo")
+	parser.add_argument("--max-depth", type=int, default=WORKSPACE_MAX_DEPTH, help="Workspace walk depth limit")
+	parser.add_argument("--threads", type=int, default=WORKSPACE_THREADS, help="Workspace walk threads")
+	args = parser.parse_args()
 
+	project_dirs = list(args.project_dirs)
+	if args.from_file:
+		try:
+			project_dirs += _read_roots(args.from_file)
+		except OSError as e:
+			print(json.dumps({"error": f"Cannot read {args.from_file}: {e.strerror}"}))
+			sys.exit(1)
+		stream_batch(project_dirs, args.jobs, args.workspace, args.max_depth, not args.no_cache)
+		return
+	if len(project_dirs) > 1:
+		stream_batch(project_dirs, args.jobs, args.workspace, args.max_depth, not args.no_cache)
+		return
+
+	project_dir = Path(project_dirs[0]).resolve() if project_dirs else Path.cwd()
 	if not project_dir.is_dir():
 		print(json.dumps({"error": f"Not a directory: {project_dir}"}))
 		sys.exit(1)
 
-	result = analyze_project(project_dir)
+	if args.workspace:
+		result = analyze_workspace(project_dir, args.max_depth, args.threads)
+	else:
+		result = analyze_project(project_dir, not args.no_cache)
 	print(json.dumps(result, indent=2))
 
 
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Benchmark analyze-project.py on a reproducible synthetic monorepo.
+
+Usage:
+    python3 benchmark.py                          # 10k-file monorepo: critical walk, workspace, git comparison
+    python3 benchmark.py --scale 500k --rounds 3  # Larger tree, best of three walks
+    python3 benchmark.py --fixture /tmp/mono      # Build (or reuse) the fixture at a fixed path
+    python3 benchmark.py --no-git                 # Skip the git ls-files reference run
+    python3 benchmark.py --staged 20000           # Pre-commit check with 20k staged files
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+
+SCRIPT_DIR = Path(__file__).parent
+
+# Fixture sizes accepted by --scale (approximate file counts)
+SCALES = {"10k": 10_000, "100k": 100_000, "500k": 500_000}
+
+# Share of the fixture's files placed in ignored dependency/build directories
+IGNORED_SHARE = 0.7
+
+# Files per generated directory
+FILES_PER_DIR = 50
+
+# Root .gitignore of the fixture: anchors, negations, ** and directory-only rules
+ROOT_GITIGNORE = """\
+node_modules/
+dist/
+/coverage
+**/.next/
+*.log
+!keep.log
+.env*
+!.env.example
+"""
+
+# Package kinds: (workspace directory, indicator file, build directory, nested .gitignore)
+PACKAGE_KINDS = [
+	("apps", "next.config.ts", ".next", ""),
+	("packages", "package.json", "dist", "*.tsbuildinfo\n"),
+	("services", "go.mod", "bin", "/bin\n"),
+	("crates", "Cargo.toml", "target", "target/\n!target/keep.pem\n"),
+]
+
+# Secret-looking files scattered through packages (the .env* ones are ignored by the root rules)
+SECRETS = [".env", ".env.local", "server.pem", "tls.key", "credentials.json", "service-account-prod.json"]
+
+
+def _load(name: str, filename: str):
+	"""Import a script (hyphenated, so not importable by name)."""
+	spec = importlib.util.spec_from_file_location(name, SCRIPT_DIR / filename)
+	module = importlib.util.module_from_spec(spec)
+	spec.loader.exec_module(module)
+	return module
+
+
+def load_analyze_project():
+	"""Import analyze-project.py."""
+	return _load("analyze_project", "analyze-project.py")
+
+
+def _fill(directory: Path, count: int, r: random.Random, ext: str) -> None:
+	"""Write count empty source-like files spread over FILES_PER_DIR-sized subdirectories."""
+	written = 0
+	while written < count:
+		sub = directory / f"d{written // FILES_PER_DIR}"
+		sub.mkdir(parents=True, exist_ok=True)
+		for i in range(min(FILES_PER_DIR, count - written)):
+			(sub / f"f{r.randrange(1 << 30):x}{i}{ext}").touch()
+		written += FILES_PER_DIR
+
+
+def build_fixture(root: Path, size: int, seed: int = 0) -> dict:
+	"""Materialize a workspace of packages with sources, dependency and build trees and a few secrets."""
+	r = random.Random(seed)
+	root.mkdir(parents=True, exist_ok=True)
+	(root / ".gitignore").write_text(ROOT_GITIGNORE)
+	(root / "package.json").write_text("{}\n")
+	packages = max(4, size // 1000)
+	per_package = size // packages
+	for n in range(packages):
+		workspace, indicator, build_dir, nested = PACKAGE_KINDS[n % len(PACKAGE_KINDS)]
+		package = root / workspace / f"pkg{n}"
+		package.mkdir(parents=True, exist_ok=True)
+		(package / indicator).touch()
+		if nested:
+			(package / ".gitignore").write_text(nested)
+		ignored = int(per_package * IGNORED_SHARE)
+		_fill(package / "src", per_package - ignored, r, ".ts")
+		_fill(package / "node_modules" / "dep", ignored // 2, r, ".js")
+		_fill(package / build_dir, ignored - ignored // 2, r, ".o")
+		for name in r.sample(SECRETS, 2):
+			secret = package / r.choice(["", "config"]) / name
+			secret.parent.mkdir(exist_ok=True)
+			secret.touch()
+		(package / "node_modules" / "dep" / ".env").touch()
+	return {"packages": packages, "files": size}
+
+
+def _git_unignored(root: Path) -> Optional[set[str]]:
+	"""Files git reports as untracked and not ignored, or None when git is unavailable."""
+	try:
+		if not (root / ".git").exists():
+			subprocess.run(["git", "init", "-q", str(root)], check=True)
+		result = subprocess.run(
+			["git", "-C", str(root), "ls-files", "--others", "--exclude-standard", "-z"],
+			capture_output=True, check=True,
+		)
+	except (OSError, subprocess.CalledProcessError):
+		return None
+	return {p for p in result.stdout.decode("utf-8", "surrogateescape").split("\0") if p and not p.endswith("/")}
+
+
+def benchmark(ap, root: Path, rounds: int, use_git: bool) -> dict:
+	"""Time the critical-file walk, workspace analysis and a full unignored listing; compare the listing with git."""
+	critical_times = []
+	for _ in range(rounds):
+		start = time.perf_counter()
+		missing = ap.check_missing_critical(root)
+		critical_times.append(time.perf_counter() - start)
+
+	workspace_times = []
+	for _ in range(rounds):
+		start = time.perf_counter()
+		workspace = ap.analyze_workspace(root)
+		workspace_times.append(time.perf_counter() - start)
+
+	start = time.perf_counter()
+	unignored = set(ap.GitignoreMatcher(root).walk())
+	walk_seconds = time.perf_counter() - start
+
+	result = {
+		"criticalSeconds": round(min(critical_times), 4),
+		"workspaceSeconds": round(min(workspace_times), 4),
+		"subprojects": len(workspace["projects"]),
+		"walkSeconds": round(walk_seconds, 4),
+		"unignoredFiles": len(unignored),
+		"missing": {entry["pattern"]: entry["count"] for entry in missing},
+	}
+	if use_git:
+		start = time.perf_counter()
+		reference = _git_unignored(root)
+		if reference is not None:
+			result["gitSeconds"] = round(time.perf_counter() - start, 4)
+			result["matchesGit"] = reference == unignored
+			result["onlyOurs"] = sorted(unignored - reference)[:10]
+			result["onlyGit"] = sorted(reference - unignored)[:10]
+	return result
+
+
+def benchmark_staged(root: Path, count: int, rounds: int) -> dict:
+	"""Stage count distinct files (a few secrets, one oversized) and time the pre-commit check."""
+	check = _load("check_gitignore", "check-gitignore.py")
+	ap = check.load_analyze_project()
+	subprocess.run(["git", "init", "-q", str(root)], check=True)
+	for n in range(count):
+		directory = root / "src" / f"d{n // FILES_PER_DIR}"
+		directory.mkdir(parents=True, exist_ok=True)
+		(directory / f"f{n}.ts").write_text(f"export const n = {n};\n")
+	for name in SECRETS:
+		(root / "config" / name).parent.mkdir(exist_ok=True)
+		(root / "config" / name).write_text("secret\n")
+	(root / "large.bin").write_bytes(b"\0" * (check.MAX_STAGED_BYTES + 1))
+	subprocess.run(["git", "-C", str(root), "add", "-A"], check=True)
+
+	cwd = os.getcwd()
+	os.chdir(root)
+	try:
+		times = []
+		for _ in range(rounds):
+			start = time.perf_counter()
+			result = check.check_staged(ap)
+			times.append(time.perf_counter() - start)
+	finally:
+		os.chdir(cwd)
+	return {
+		"stagedFiles": count + len(SECRETS) + 1,
+		"seconds": round(min(times), 4),
+		"status": result["status"],
+		"issues": len(result["issues"]),
+	}
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Benchmark analyze-project.py on a synthetic monorepo")
+	parser.add_argument("--scale", choices=sorted(SCALES), default="10k", help="Fixture size")
+	parser.add_argument("--seed", type=int, default=0, help="Fixture random seed")
+	parser.add_argument("--rounds", type=int, default=1, help="Timed passes (best is reported)")
+	parser.add_argument("--fixture", type=Path, help="Build the fixture here, or reuse it if present")
+	parser.add_argument("--no-git", action="store_true", help="Skip the git ls-files comparison")
+	parser.add_argument("--staged", type=int, metavar="N", help="Time the pre-commit check with N staged files instead")
+	args = parser.parse_args()
+
+	temp = None
+	root = args.fixture
+	if root is None:
+		temp = tempfile.mkdtemp(prefix="gitignore-bench-")
+		root = Path(temp)
+	try:
+		if args.staged:
+			print(json.dumps({"staged": benchmark_staged(root, args.staged, args.rounds)}, indent=2))
+			return
+		ap = load_analyze_project()
+		start = time.perf_counter()
+		fixture = {"reused": True}
+		if not (root / ".gitignore").exists():
+			fixture = build_fixture(root, SCALES[args.scale], args.seed)
+		fixture["seconds"] = round(time.perf_counter() - start, 2)
+		results = {
+			"scale": args.scale,
+			"fixture": fixture,
+			"analysis": benchmark(ap, root, args.rounds, not args.no_git),
+		}
+		print(json.dumps(results, indent=2))
+		if results["analysis"].get("matchesGit") is False:
+			sys.exit(1)
+	finally:
+		if temp:
+			shutil.rmtree(temp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+	main()
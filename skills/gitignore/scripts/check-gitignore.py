@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Fast pre-commit gitignore validation.
+Outputs JSON with status and issues, or with --hook the PreToolUse decision.
+
+Reads the staged files with one git diff and matches every critical pattern from
+analyze-project.py with a single compiled matcher. Sizes come from the index, with
+one git cat-file call for the few blobs that may be too large, so no subprocess is
+started per file.
+"""
+
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Optional
+
+
+SCRIPT_DIR = Path(__file__).parent
+
+# Staged files larger than this draw a warning
+MAX_STAGED_BYTES = 10 * 1024 * 1024
+
+# git's mode for submodule entries, whose object is a commit in another repository
+SUBMODULE_MODE = 0o160000
+
+# Object id of the empty blob (the index records size 0 for it, as for sizes it didn't know)
+EMPTY_BLOB_ID = bytes.fromhex("e69de29bb2d1d6434b8b29ae775ad8c2e48c5391")
+
+
+def load_analyze_project():
+	"""Import analyze-project.py (hyphenated, so not importable by name)."""
+	spec = importlib.util.spec_from_file_location("analyze_project", SCRIPT_DIR / "analyze-project.py")
+	module = importlib.util.module_from_spec(spec)
+	spec.loader.exec_module(module)
+	return module
+
+
+def _git(args: list[str], stdin: Optional[bytes] = None) -> Optional[bytes]:
+	"""Run git and return its stdout, or None if it failed."""
+	try:
+		result = subprocess.run(["git", *args], input=stdin, capture_output=True)
+	except OSError:
+		return None
+	return result.stdout if result.returncode == 0 else None
+
+
+def staged_files() -> Optional[list[str]]:
+	"""
+	Paths of every staged addition or modification, from one git diff.
+
+	Renames count as additions; deletions are skipped since they can't leak anything.
+	Returns None outside a git repository.
+	"""
+	out = _git(["diff", "--cached", "--name-only", "-z", "--no-renames", "--diff-filter=ACMT"])
+	if out is None:
+		return None
+	return [path.decode("utf-8", "surrogateescape") for path in out.split(b"\0") if path]
+
+
+def blob_sizes(names: list[str]) -> list[Optional[int]]:
+	"""Sizes of the given objects (ids or ":path"), read with a single git cat-file --batch-check."""
+	if not names:
+		return []
+	out = _git(["cat-file", "--batch-check=%(objecttype) %(objectsize)"], "\n".join(names).encode() + b"\n")
+	sizes = []
+	for line in (out or b"").decode("ascii", "replace").splitlines():
+		kind, _, size = line.partition(" ")
+		sizes.append(int(size) if kind == "blob" else None)
+	return sizes
+
+
+def _file_size(path: str) -> Optional[int]:
+	"""Size of a work tree file, or None if it can't be read."""
+	try:
+		return os.lstat(path).st_size
+	except OSError:
+		return None
+
+
+def large_files(ap, paths: list[str], git_dir: Optional[Path], work_tree: Path) -> list[str]:
+	"""
+	Staged paths whose blob is larger than MAX_STAGED_BYTES.
+
+	The index records the size of every staged file, so only files it reports as large
+	(or empty, or can't be read) are sized exactly with git cat-file. Index sizes are
+	truncated to 32 bits, so a file whose work tree size differs from its index size
+	(a wrapped 4 GiB+ file, or one edited since staging) is sized exactly as well.
+	"""
+	index = ap.read_index(git_dir) if git_dir is not None else None
+	prefix = f"{work_tree}{os.sep}"
+	candidates, names = [], []
+	for path in paths:
+		entry = index.get(path) if index is not None else None
+		if entry is None:
+			if "\n" not in path:
+				candidates.append(path)
+				names.append(":" + path)
+			continue
+		mode, oid, size, _ = entry
+		if mode == SUBMODULE_MODE:
+			continue
+		if size > MAX_STAGED_BYTES or (size == 0 and oid != EMPTY_BLOB_ID) or _file_size(prefix + path) not in (None, size):
+			candidates.append(path)
+			names.append(oid.hex())
+	return [path for path, size in zip(candidates, blob_sizes(names)) if size and size > MAX_STAGED_BYTES]
+
+
+def _work_tree() -> Path:
+	"""The enclosing work tree: the nearest directory holding .git (or cwd)."""
+	cwd = Path.cwd()
+	for directory in (cwd, *cwd.parents):
+		if os.path.lexists(directory / ".git"):
+			return directory
+	return cwd
+
+
+def check_staged(ap) -> dict:
+	"""Validate the staged files. Returns {"status": ok|warning|error, "issues": [...]}."""
+	staged = staged_files()
+	if not staged:
+		return {"status": "ok", "issues": []}
+
+	issues = []
+	match = ap.critical_matcher()
+	for path in staged:
+		critical = match(path.rpartition("/")[2])
+		if critical is not None:
+			issues.append({
+				"severity": "critical",
+				"message": f"{path} would be committed (secrets at risk)",
+				"pattern": critical["pattern"],
+				"file": path,
+			})
+
+	work_tree = _work_tree()
+	if not (work_tree / ".gitignore").exists():
+		issues.append({"severity": "warning", "message": "No .gitignore file found", "pattern": None})
+
+	for path in large_files(ap, staged, ap.find_git_dir(work_tree), work_tree):
+		issues.append({
+			"severity": "warning",
+			"message": f"{path} is larger than {MAX_STAGED_BYTES // (1024 * 1024)}MB",
+			"pattern": None,
+			"file": path,
+		})
+
+	if any(issue["severity"] == "critical" for issue in issues):
+		status = "error"
+	elif issues:
+		status = "warning"
+	else:
+		status = "ok"
+	return {"status": status, "issues": issues}
+
+
+def hook_decision(result: dict) -> dict:
+	"""The PreToolUse decision for a check result, quoting the first issue of its severity."""
+	if result["status"] == "ok":
+		return {"decision": "allow"}
+	severity = "critical" if result["status"] == "error" else "warning"
+	message = next(issue["message"] for issue in result["issues"] if issue["severity"] == severity)
+	if severity == "critical":
+		return {"decision": "block", "message": f"Blocked: {message}. Run /gitignore to fix."}
+	return {"decision": "ask", "message": f"Warning: {message}. Continue with commit?"}
+
+
+def main():
+	result = check_staged(load_analyze_project())
+	if sys.argv[1:] == ["--hook"]:
+		result = hook_decision(result)
+	print(json.dumps(result))
+
+
+if __name__ == "__main__":
+	main()
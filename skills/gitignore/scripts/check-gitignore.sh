@@ -41,21 +41,17 @@ for pattern in "${CRITICAL_PATTERNS[@]}"; do
 	# Use git check-ignore to see if pattern is ignored
 	# Then check if any staged file matches the pattern
 
-	# For exact matches
-	if [[ "$pattern" == *"*"* ]]; then
-		# Wildcard pattern - use grep with pattern conversion
-		GREP_PATTERN=$(echo "$pattern" | sed 's/\./\\./g' | sed 's/\*/.*/')
-		MATCHED_FILES=$(echo "$STAGED_FILES" | grep -E "^${GREP_PATTERN}$" || true)
-	else
-		# Exact match
-		MATCHED_FILES=$(echo "$STAGED_FILES" | grep -E "^${pattern}$" || true)
-	fi
+	# Match the pattern against each staged file's name, in any directory
+	GREP_PATTERN=$(echo "$pattern" | sed 's/\./\\./g' | sed 's/\*/[^\/]*/')
+	MATCHED_FILES=$(echo "$STAGED_FILES" | grep -E "(^|/)${GREP_PATTERN}\"?$" || true)
 
 	if [[ -n "$MATCHED_FILES" ]]; then
 		# Check if it would be ignored by .gitignore
 		while IFS= read -r file; do
 			if [[ -n "$file" ]]; then
-				# File is staged but should be ignored
+				# File is staged but should be ignored (git quotes unusual names; escape them for JSON)
+				file=${file//\\/\\\\}
+				file=${file//\"/\\\"}
 				if [[ -n "$ISSUES" ]]; then
 					ISSUES="$ISSUES,"
 				fi
@@ -25,8 +25,20 @@ if [[ ! "$COMMAND" =~ ^git[[:space:]]+commit ]]; then
 	exit 0
 fi
 
-# Run the gitignore check
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+
+# Run the Python engine, which prints the final decision itself. Anything but a
+# well-formed decision (no python3, a crash, an unsupported Python) falls through
+# to the shell check below rather than allowing the commit.
+if command -v python3 >/dev/null 2>&1; then
+	DECISION=$(python3 "$SCRIPT_DIR/check-gitignore.py" --hook 2>/dev/null) || DECISION=""
+	if [[ "$DECISION" =~ ^\{\"decision\":\ \"(allow|ask|block)\".*\}$ ]]; then
+		echo "$DECISION"
+		exit 0
+	fi
+fi
+
+# Fallback: shell check
 CHECK_RESULT=$("$SCRIPT_DIR/check-gitignore.sh" 2>/dev/null)
 
 if [[ $? -ne 0 ]]; then
@@ -44,12 +56,12 @@ case "$STATUS" in
 		;;
 	"warning")
 		# Extract warning message
-		MESSAGE=$(echo "$CHECK_RESULT" | grep -o '"message"[[:space:]]*:[[:space:]]*"[^"]*"' | head -1 | sed 's/.*"message"[[:space:]]*:[[:space:]]*"//' | sed 's/".*//')
+		MESSAGE=$(echo "$CHECK_RESULT" | grep -oE '"message"[[:space:]]*:[[:space:]]*"([^"\\]|\\.)*"' | head -1 | sed 's/^"message"[[:space:]]*:[[:space:]]*"//; s/"$//')
 		echo "{\"decision\": \"ask\", \"message\": \"Warning: $MESSAGE. Continue with commit?\"}"
 		;;
 	"error")
 		# Extract error message
-		MESSAGE=$(echo "$CHECK_RESULT" | grep -o '"message"[[:space:]]*:[[:space:]]*"[^"]*"' | head -1 | sed 's/.*"message"[[:space:]]*:[[:space:]]*"//' | sed 's/".*//')
+		MESSAGE=$(echo "$CHECK_RESULT" | grep -oE '"message"[[:space:]]*:[[:space:]]*"([^"\\]|\\.)*"' | head -1 | sed 's/^"message"[[:space:]]*:[[:space:]]*"//; s/"$//')
 		echo "{\"decision\": \"block\", \"message\": \"Blocked: $MESSAGE. Run /gitignore to fix.\"}"
 		;;
 	*)
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Tests for check-gitignore.py's large-file guard.
+
+Usage:
+    python3 -m unittest discover skills/gitignore/tests
+"""
+
+import importlib.util
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+
+
+SCRIPT = Path(__file__).resolve().parent.parent / "scripts" / "check-gitignore.py"
+
+# Size limit used by the tests, so no multi-gigabyte files are written
+MAX_STAGED_BYTES = 1024
+
+
+def load_check_gitignore():
+	"""Import check-gitignore.py (hyphenated, so not importable by name)."""
+	spec = importlib.util.spec_from_file_location("check_gitignore", SCRIPT)
+	module = importlib.util.module_from_spec(spec)
+	spec.loader.exec_module(module)
+	return module
+
+
+@unittest.skipUnless(shutil.which("git"), "needs git")
+class LargeFilesTest(unittest.TestCase):
+	def setUp(self):
+		self.repo = Path(tempfile.mkdtemp(prefix="check-gitignore-"))
+		self.addCleanup(shutil.rmtree, self.repo, ignore_errors=True)
+		subprocess.run(["git", "init", "-q", str(self.repo)], check=True)
+		# The hook runs inside the repository
+		cwd = os.getcwd()
+		os.chdir(self.repo)
+		self.addCleanup(os.chdir, cwd)
+		self.check = load_check_gitignore()
+		self.check.MAX_STAGED_BYTES = MAX_STAGED_BYTES
+		self.ap = self.check.load_analyze_project()
+		self.git_dir = self.ap.find_git_dir(self.repo)
+
+	def stage(self, relative: str, size: int) -> None:
+		(self.repo / relative).write_bytes(b"x" * size)
+		subprocess.run(["git", "-C", str(self.repo), "add", "--", relative], check=True)
+
+	def large_files(self) -> list[str]:
+		return self.check.large_files(self.ap, ["big.bin", "small.txt"], self.git_dir, self.repo)
+
+	def test_reports_file_over_limit(self):
+		self.stage("big.bin", MAX_STAGED_BYTES + 5)
+		self.stage("small.txt", 10)
+		self.assertEqual(self.large_files(), ["big.bin"])
+
+	def test_reports_file_whose_index_size_wrapped(self):
+		self.stage("big.bin", MAX_STAGED_BYTES * 2 + 5)
+		self.stage("small.txt", 10)
+
+		# The index keeps sizes modulo 2^32; fake a wrap that leaves big.bin looking tiny
+		read_index = self.ap.read_index
+
+		def wrapped_index(git_dir):
+			index = read_index(git_dir)
+			mode, oid, size, flags = index["big.bin"]
+			index["big.bin"] = (mode, oid, size % MAX_STAGED_BYTES, flags)
+			return index
+
+		self.ap.read_index = wrapped_index
+		self.assertEqual(self.large_files(), ["big.bin"])
+
+	def test_works_from_a_subdirectory(self):
+		self.stage("big.bin", MAX_STAGED_BYTES + 5)
+		self.stage("small.txt", 10)
+		(self.repo / "sub").mkdir()
+		os.chdir(self.repo / "sub")
+		self.assertEqual(self.large_files(), ["big.bin"])
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Tests for precommit-hook.sh: the hook must block staged secrets whichever engine answers.
+
+Usage:
+    python3 -m unittest discover skills/gitignore/tests
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+
+
+HOOK = Path(__file__).resolve().parent.parent / "scripts" / "precommit-hook.sh"
+
+# PreToolUse input for a git commit
+COMMIT_INPUT = json.dumps({"tool_name": "Bash", "tool_input": {"command": "git commit -m wip"}})
+
+# Stand-in python3 executables: one that fails outright, one that prints garbage
+BROKEN_PYTHON = {
+	"crash": "#!/bin/sh\necho 'SyntaxError: invalid syntax' >&2\nexit 1\n",
+	"garbage": "#!/bin/sh\necho 'not json'\n",
+	"empty": "#!/bin/sh\nexit 0\n",
+}
+
+
+@unittest.skipUnless(shutil.which("git") and shutil.which("bash"), "needs git and bash")
+class PrecommitHookTest(unittest.TestCase):
+	def setUp(self):
+		self.repo = Path(tempfile.mkdtemp(prefix="precommit-hook-"))
+		self.addCleanup(shutil.rmtree, self.repo, ignore_errors=True)
+		subprocess.run(["git", "init", "-q", str(self.repo)], check=True)
+		(self.repo / ".gitignore").write_text("node_modules/\n")
+
+	def stage(self, relative: str) -> None:
+		path = self.repo / relative
+		path.parent.mkdir(parents=True, exist_ok=True)
+		path.write_text("SECRET=1\n")
+		subprocess.run(["git", "-C", str(self.repo), "add", "--", relative], check=True)
+
+	def run_hook(self, python: str = None) -> dict:
+		"""Run the hook in the repo, optionally with a fake python3 first on PATH; return its decision."""
+		env = dict(os.environ)
+		if python is not None:
+			bin_dir = self.repo / ".fake-bin"
+			bin_dir.mkdir(exist_ok=True)
+			(bin_dir / "python3").write_text(python)
+			(bin_dir / "python3").chmod(0o755)
+			env["PATH"] = f"{bin_dir}{os.pathsep}{env['PATH']}"
+		result = subprocess.run(
+			["bash", str(HOOK)], input=COMMIT_INPUT, capture_output=True, text=True, cwd=self.repo, env=env,
+		)
+		self.assertEqual(result.returncode, 0, result.stderr)
+		return json.loads(result.stdout)
+
+	def test_blocks_staged_secret(self):
+		self.stage("services/api/.env")
+		decision = self.run_hook()
+		self.assertEqual(decision["decision"], "block")
+		self.assertIn("services/api/.env", decision["message"])
+
+	def test_blocks_when_python_engine_fails(self):
+		self.stage("services/api/.env")
+		for name, script in BROKEN_PYTHON.items():
+			with self.subTest(engine=name):
+				self.assertEqual(self.run_hook(script)["decision"], "block")
+
+	def test_quoted_filename_yields_valid_json(self):
+		self.stage('services/api/we"ird.pem')
+		decision = self.run_hook()
+		self.assertEqual(decision["decision"], "block")
+		self.assertIn('we"ird.pem', decision["message"])
+		for name, script in BROKEN_PYTHON.items():
+			with self.subTest(engine=name):
+				self.assertEqual(self.run_hook(script)["decision"], "block")
+
+	def test_allows_clean_commit(self):
+		self.stage("src/index.ts")
+		self.assertEqual(self.run_hook()["decision"], "allow")
+
+
+if __name__ == "__main__":
+	unittest.main()